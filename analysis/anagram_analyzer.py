@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from analysis.pipeline.analyzer import Analyzer
+from storage.json_repository import JsonRepository
+from core.lexarithmos_calculator import LexarithmosCalculator
+from core.text_normalizer import TextNormalizer
+from config.paths import ANAGRAMS_FILE_PATH
+from core.models import StoreChange
+
+
+class AnagramAnalyzer(Analyzer):
+
+    """
+    Builds a JSON index of letter anagram families:
+    stored phrases made of the same multiset of letters.
+
+    Anagrams always share a value, so families are
+    grouped per stored key and can be rebuilt one
+    key at a time when the store changes.
+    """
+
+    @property
+    def name(self) -> str:
+
+        """
+        Returns the analyzer's unique name.
+        """
+
+        return "anagram_analyzer"
+
+    @property
+    def output_path(self) -> Path:
+
+        """
+        Returns the JSON file the analyzer writes.
+        """
+
+        return self.output_repository.file_path
+
+    @property
+    def cpu_bound(self) -> bool:
+
+        """
+        Normalizes every stored phrase on a full run.
+        """
+
+        return True
+
+    def __init__(self, output_path: str = ANAGRAMS_FILE_PATH) -> None:
+
+        self.output_repository = JsonRepository(output_path)
+        self.normalizer = TextNormalizer()
+
+        self.anagram_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self.index_ordered = True
+
+    def analyze(self, number_data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Groups the phrases of every key by letter signature.
+
+        :param number_data: The stored number dictionary.
+        :return: The anagram families of each key that has any.
+        """
+
+        anagram_index: Dict[str, Dict[str, Any]] = {}
+
+        for key in sorted(number_data, key=int):
+
+            entry = self._build_entry(number_data[key])
+
+            if entry is not None:
+                anagram_index[key] = entry
+
+        return anagram_index
+
+    def analyze_and_save(self, number_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+
+        anagram_index = self.analyze(number_data)
+        self.output_repository.save(anagram_index)
+
+        self.anagram_index = anagram_index
+        self.index_ordered = True
+
+        return anagram_index
+
+    def apply_changes(
+        self,
+        changes: List[StoreChange],
+        number_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+
+        """
+        Rebuilds only the entries of the changed keys.
+
+        :param changes: The store changes since the last run.
+        :param number_data: The stored number dictionary.
+        :return: The updated anagram index.
+        """
+
+        if self.anagram_index is None:
+            return self.analyze_and_save(number_data)
+
+        for key in {change.key for change in changes}:
+
+            entry = self._build_entry(number_data[key]) if key in number_data else None
+
+            if entry is None:
+
+                self.anagram_index.pop(key, None)
+                continue
+
+            if key not in self.anagram_index:
+
+                last_key = next(reversed(self.anagram_index), None)
+
+                if last_key is not None and int(key) < int(last_key):
+                    self.index_ordered = False
+
+            self.anagram_index[key] = entry
+
+        if not self.index_ordered:
+
+            self.anagram_index = dict(
+                sorted(self.anagram_index.items(), key=lambda item: int(item[0]))
+            )
+            self.index_ordered = True
+
+        self.output_repository.save(self.anagram_index)
+
+        return self.anagram_index
+
+    def _build_entry(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+        """
+        Builds one key's entry, or None if it has no families.
+
+        A family needs at least two phrases whose letters
+        are arranged differently, so accent or spacing
+        variants of one phrase do not count as anagrams.
+        """
+
+        families: Dict[str, List[str]] = {}
+        arrangements: Dict[str, Set[str]] = {}
+
+        for phrase in record.get("key-phrases", []):
+
+            letters = "".join(
+                char for char in "".join(self.normalizer.normalize(phrase))
+                if char in LexarithmosCalculator.LETTER_TO_VALUE
+            )
+
+            signature = "".join(sorted(letters))
+
+            families.setdefault(signature, []).append(phrase)
+            arrangements.setdefault(signature, set()).add(letters)
+
+        anagrams = {
+            signature: sorted(phrases)
+            for signature, phrases in sorted(families.items())
+            if len(arrangements[signature]) > 1
+        }
+
+        if not anagrams:
+            return None
+
+        return {
+            "sub-divisions": record.get("sub-divisions", []),
+            "anagrams": anagrams
+        }
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
-from itertools import permutations
-from typing import Any, Dict, List, Set
+from bisect import insort
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
 from analysis.pipeline.analyzer import Analyzer
 from storage.json_repository import JsonRepository
 from config.paths import PERMUTATIONS_FILE_PATH
+from core.models import StoreChange
 
 
 class PermutationAnalyzer(Analyzer):
@@ -12,6 +14,12 @@ class PermutationAnalyzer(Analyzer):
     """
     Builds a JSON index that groups stored
     numbers with their digit permutations.
+
+    Two numbers are digit permutations of each other
+    exactly when their sorted digits are equal, so the
+    stored keys are grouped by that digit signature in
+    one linear pass instead of enumerating every
+    permutation of every key.
     """
 
     @property
@@ -23,26 +31,51 @@ class PermutationAnalyzer(Analyzer):
 
         return "permutation_analyzer"
 
+    @property
+    def output_path(self) -> Path:
+
+        """
+        Returns the JSON file the analyzer writes.
+        """
+
+        return self.output_repository.file_path
+
+    @property
+    def cpu_bound(self) -> bool:
+
+        """
+        Groups and sorts every stored key on a full run.
+        """
+
+        return True
+
     def __init__(self, output_path: str = PERMUTATIONS_FILE_PATH) -> None:
 
         self.output_repository = JsonRepository(output_path)
 
+        self.permutation_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self.signature_groups: Dict[str, List[str]] = {}
+        self.irregular_keys: Set[str] = set()
+        self.index_ordered = True
+
     def analyze(self, number_data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
 
         preview_data: Dict[str, Dict[str, Any]] = {}
         processed_keys: Set[str] = set()
 
+        signature_groups = self._group_by_signature(number_data)
+
         for key, record in self._sort_number_data(number_data).items():
 
             if key in processed_keys:
                 continue
 
-            base_number = int(key)
             subdivisions = record.get("sub-divisions", [])
 
             permutation_map = self._find_existing_permutations(
-                base_number=base_number,
+                base_number=int(key),
                 number_data=number_data,
+                signature_groups=signature_groups,
                 processed_keys=processed_keys
             )
 
@@ -58,42 +91,197 @@ class PermutationAnalyzer(Analyzer):
         permutation_index = self.analyze(number_data)
         self.output_repository.save(permutation_index)
 
+        self.permutation_index = permutation_index
+        self.signature_groups = self._group_by_signature(number_data)
+        self.irregular_keys = {
+            key for key in number_data
+            if not self._is_canonical_key(key)
+        }
+        self.index_ordered = True
+
         return permutation_index
 
+    def apply_changes(
+        self,
+        changes: List[StoreChange],
+        number_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+
+        """
+        Updates only the permutation groups touched by the changes.
+
+        Every index entry is built from exactly one digit
+        signature group: it is stored under the group's
+        smallest key and lists the phrases of all keys in
+        the group. Recomputing the entry of each changed
+        key's group from the current number dictionary
+        therefore yields the same index as a full rebuild.
+        Keys that a permutation cannot produce (such as "0")
+        own a separate entry and force a full rebuild.
+
+        :param changes: The store changes since the last run.
+        :param number_data: The stored number dictionary.
+        :return: The updated permutation index.
+        """
+
+        if self.permutation_index is None or self.irregular_keys:
+            return self.analyze_and_save(number_data)
+
+        if any(not self._is_canonical_key(change.key) for change in changes):
+            return self.analyze_and_save(number_data)
+
+        for key in {change.key for change in changes}:
+            self._update_group(key, number_data)
+
+        if not self.index_ordered:
+
+            self.permutation_index = self._sort_number_data(self.permutation_index)
+            self.index_ordered = True
+
+        self.output_repository.save(self.permutation_index)
+
+        return self.permutation_index
+
+    def rebuild(self, number_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+
+        """
+        Rebuilds the whole index, repairing any drift.
+
+        :param number_data: The stored number dictionary.
+        :return: The rebuilt permutation index.
+        """
+
+        return self.analyze_and_save(number_data)
+
+    def verify(self, number_data: Dict[str, Dict[str, Any]]) -> bool:
+
+        """
+        Checks the maintained index against a full rebuild.
+
+        :param number_data: The stored number dictionary.
+        :return: True if both indexes are identical.
+        """
+
+        if self.permutation_index is None:
+            return False
+
+        expected = self.analyze(number_data)
+
+        return list(self.permutation_index.items()) == list(expected.items())
+
+    def _update_group(self, key: str, number_data: Dict[str, Dict[str, Any]]) -> None:
+
+        """
+        Recomputes the index entry of one key's signature group.
+        """
+
+        assert self.permutation_index is not None
+
+        signature = self._digit_signature(int(key))
+        group = self.signature_groups.setdefault(signature, [])
+        old_leader = group[0] if group else None
+
+        if key in number_data and key not in group:
+            insort(group, key, key=int)
+
+        elif key not in number_data and key in group:
+            group.remove(key)
+
+        leader = group[0] if group else None
+
+        if old_leader is not None and old_leader != leader:
+            del self.permutation_index[old_leader]
+
+        if leader is None:
+
+            del self.signature_groups[signature]
+            return
+
+        if leader not in self.permutation_index:
+
+            last_key = next(reversed(self.permutation_index), None)
+
+            if last_key is not None and int(leader) < int(last_key):
+                self.index_ordered = False
+
+        self.permutation_index[leader] = {
+            "sub-divisions": number_data[leader].get("sub-divisions", []),
+            "permutations": {
+                group_key: number_data[group_key].get("key-phrases", [])
+                for group_key in group
+            }
+        }
+
     def _find_existing_permutations(
         self,
         base_number: int,
         number_data: Dict[str, Dict[str, Any]],
+        signature_groups: Dict[str, List[str]],
         processed_keys: Set[str]
     ) -> Dict[str, List[str]]:
 
         permutation_map: Dict[str, List[str]] = {}
 
-        for permutation_number in self._generate_unique_permutations(base_number):
+        signature = self._digit_signature(base_number)
 
-            permutation_key = str(permutation_number)
-
-            if permutation_key not in number_data:
-                continue
+        for permutation_key in signature_groups.get(signature, []):
 
             phrases = number_data[permutation_key].get("key-phrases", [])
             permutation_map[permutation_key] = phrases
             processed_keys.add(permutation_key)
 
-        return dict(
-            sorted(permutation_map.items(), key=lambda item: int(item[0]))
-        )
+        return permutation_map
+
+    @classmethod
+    def _group_by_signature(
+        cls,
+        number_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
+
+        """
+        Groups the stored keys by their digit signature.
+
+        Only keys that a digit permutation can produce are
+        grouped: the canonical decimal form of a positive
+        number. Permutations with a leading zero are never
+        part of a group, which keeps key "0" without any.
+
+        :param number_data: The stored number dictionary.
+        :return: Signature to numerically sorted keys.
+        """
+
+        signature_groups: Dict[str, List[str]] = {}
+
+        for key in number_data:
+
+            if not cls._is_canonical_key(key):
+                continue
+
+            signature = cls._digit_signature(int(key))
+            signature_groups.setdefault(signature, []).append(key)
+
+        for keys in signature_groups.values():
+            keys.sort(key=int)
+
+        return signature_groups
 
     @staticmethod
-    def _generate_unique_permutations(number: int) -> List[int]:
+    def _is_canonical_key(key: str) -> bool:
 
-        unique_permutations = {
-            int("".join(digits))
-            for digits in permutations(str(number))
-            if digits[0] != "0"
-        }
+        """
+        Checks whether a digit permutation can produce the key.
+        """
+
+        return key == str(int(key)) and not key.startswith("0")
+
+    @staticmethod
+    def _digit_signature(number: int) -> str:
+
+        """
+        Returns the sorted digits of a number.
+        """
 
-        return sorted(unique_permutations)
+        return "".join(sorted(str(number)))
 
     @staticmethod
     def _sort_number_data(
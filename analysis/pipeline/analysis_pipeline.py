@@ -1,22 +1,84 @@
 # -*- coding: utf-8 -*-
-from typing import Any, Dict, List
+import time
+
+from concurrent.futures import (
+    Future, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+)
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from analysis.pipeline.analyzer import Analyzer
+from storage.json_repository import JsonRepository
+from core.exceptions import AnalysisError
+from core.instrumentation import METRICS
+from core.models import AnalyzerRun, StoreChange
+
+_WORKER_ANALYZER: Optional[Analyzer] = None
+_WORKER_STORE: Dict[str, Dict[str, Any]] = {}
 
 
 class AnalysisPipeline:
 
     """
     Runs registered research analyzers.
+
+    Analyzers run in dependency order on the calling
+    thread, since threads cannot speed up pure Python work.
+    Analyzers marked I/O-bound run in a thread pool, and
+    with use_processes each CPU-bound analyzer runs in a
+    worker process of its own, both alongside the others.
+    A worker process keeps its analyzer and a copy of the
+    store, so after its first run only the changed records
+    are sent to it. A failing analyzer does not stop the
+    others; its dependents are skipped and an AnalysisError
+    is raised once every other analyzer has finished.
+
+    Updating a named subset leaves the other analyzers
+    behind the store, so they are marked stale, as are
+    failed ones, and their next update is a full run.
+
+    With a manifest, each successful run records the
+    analyzer version, the digest of the store it saw and
+    the state of the file it wrote. A later run over the
+    same digest is skipped, along with its file write,
+    while the output file is left untouched.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+        manifest_path: Optional[str | Path] = None
+    ) -> None:
 
         """
         Initializes an empty analyzer pipeline.
+
+        :param max_workers: The maximum number of concurrent analyzers, 1 to run in sequence.
+        :param use_processes: Whether CPU-bound analyzers run in their own worker processes.
+        :param manifest_path: The file recording the input digest of each output, enabling caching.
         """
 
         self.analyzers: List[Analyzer] = []
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+        self.last_report: List[AnalyzerRun] = []
+
+        self.manifest_repository = (
+            JsonRepository(manifest_path) if manifest_path is not None else None
+        )
+        self.manifest: Dict[str, Any] = (
+            self.manifest_repository.load() if self.manifest_repository is not None else {}
+        )
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.stale: Set[str] = set()
+
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pools: Dict[str, ProcessPoolExecutor] = {}
+        self._synced: Set[str] = set()
 
     def register(self, analyzer: Analyzer) -> None:
 
@@ -26,21 +88,620 @@ class AnalysisPipeline:
         :param analyzer: The analyzer to register.
         """
 
+        if any(registered.name == analyzer.name for registered in self.analyzers):
+            raise AnalysisError(f"Analyzer '{analyzer.name}' is already registered.")
+
         self.analyzers.append(analyzer)
 
-    def run_all(self, number_data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    @property
+    def uses_cache(self) -> bool:
+
+        """
+        Returns whether runs are cached by input digest.
+        """
+
+        return self.manifest_repository is not None
+
+    def run_all(
+        self,
+        number_data: Mapping[str, Dict[str, Any]],
+        names: Optional[Iterable[str]] = None,
+        digest: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
 
         """
-        Runs all registered analyzers.
+        Runs all registered analyzers, or a named subset.
+
+        Analyzers skipped by the cache are reported in
+        last_report and left out of the results.
 
-        :param number_data: The stored number dictionary.
+        :param number_data: The stored records, e.g. a repository's record view.
+        :param names: The analyzers to run, together with their dependencies.
+        :param digest: The digest of the number dictionary, enabling caching.
+        :param use_cache: Whether current outputs are skipped; the runs are recorded either way.
         :return: A dictionary with analyzer names and their results.
         """
 
+        return self._run("analyze_and_save", (number_data,), names, digest, use_cache)
+
+    def apply_changes(
+        self,
+        changes: List[StoreChange],
+        number_data: Mapping[str, Dict[str, Any]],
+        names: Optional[Iterable[str]] = None,
+        digest: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Updates all registered analyzers, or a named
+        subset, after store mutations.
+
+        :param changes: The store changes since the last run.
+        :param number_data: The stored records, e.g. a repository's record view.
+        :param names: The analyzers to update, together with their dependencies.
+        :param digest: The digest of the number dictionary, enabling caching.
+        :return: A dictionary with analyzer names and their results.
+        """
+
+        return self._run("apply_changes", (changes, number_data), names, digest)
+
+    def close(self) -> None:
+
+        """
+        Shuts down the worker pools, if any were started.
+        """
+
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown()
+
+        for pool in self._process_pools.values():
+            pool.shutdown()
+
+        self._thread_pool = None
+        self._process_pools = {}
+        self._synced.clear()
+
+    def _run(
+        self,
+        method: str,
+        arguments: Tuple[Any, ...],
+        names: Optional[Iterable[str]],
+        digest: Optional[str],
+        use_cache: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Runs one analyzer method over the selected analyzers
+        and raises once all of them have finished if any failed.
+        """
+
+        analyzers = self._select(names)
+
         results: Dict[str, Dict[str, Any]] = {}
+        runs: Dict[str, AnalyzerRun] = {}
 
-        for analyzer in self.analyzers:
+        pending = [
+            analyzer for analyzer in analyzers
+            if not (use_cache and self._check_cache(analyzer, digest, runs))
+        ]
+
+        if (
+            len(pending) <= 1
+            or self.max_workers == 1
+            or not any(self._offloaded(analyzer) for analyzer in pending)
+        ):
+            self._run_sequential(pending, method, arguments, results, runs)
+
+        else:
+            self._run_concurrent(pending, method, arguments, results, runs)
+
+        self.last_report = [runs[analyzer.name] for analyzer in analyzers]
+
+        for analyzer in pending:
+
+            METRICS.record(f"analyzer.{analyzer.name}", runs[analyzer.name].duration)
+
+            if runs[analyzer.name].succeeded:
+                self.stale.discard(analyzer.name)
+
+            else:
+                self.stale.add(analyzer.name)
 
-            results[analyzer.name] = analyzer.analyze_and_save(number_data)
+        if method == "apply_changes" and names is not None:
+
+            selected = {analyzer.name for analyzer in analyzers}
+            self.stale.update(
+                analyzer.name for analyzer in self.analyzers
+                if analyzer.name not in selected
+            )
+
+        if digest is not None and self.manifest_repository is not None:
+            self._update_manifest(pending, runs, digest)
+
+        failures = [run for run in self.last_report if not run.succeeded]
+
+        if failures:
+            raise AnalysisError(
+                "Analyzers failed: " + "; ".join(
+                    f"{run.name}: {run.error}" for run in failures
+                )
+            )
 
         return results
+
+    def _run_sequential(
+        self,
+        analyzers: List[Analyzer],
+        method: str,
+        arguments: Tuple[Any, ...],
+        results: Dict[str, Dict[str, Any]],
+        runs: Dict[str, AnalyzerRun]
+    ) -> None:
+
+        """
+        Runs the analyzers one after another on the calling thread.
+        """
+
+        failed: Set[str] = set()
+
+        for analyzer in analyzers:
+
+            failed_dependency = next(
+                (name for name in analyzer.dependencies if name in failed), None
+            )
+
+            if failed_dependency is not None:
+
+                failed.add(analyzer.name)
+                runs[analyzer.name] = self._skipped_run(analyzer.name, failed_dependency)
+                continue
+
+            result, run = self._submit(analyzer, method, arguments).result()
+            runs[analyzer.name] = run
+
+            if run.succeeded:
+                results[analyzer.name] = result
+
+            else:
+                failed.add(analyzer.name)
+
+    def _run_concurrent(
+        self,
+        analyzers: List[Analyzer],
+        method: str,
+        arguments: Tuple[Any, ...],
+        results: Dict[str, Dict[str, Any]],
+        runs: Dict[str, AnalyzerRun]
+    ) -> None:
+
+        """
+        Runs every analyzer as soon as its dependencies
+        have finished, sharing the worker pools.
+        """
+
+        by_name = {analyzer.name: analyzer for analyzer in analyzers}
+        waiting = {
+            analyzer.name: set(analyzer.dependencies) & by_name.keys()
+            for analyzer in analyzers
+        }
+        running: Dict[Future, str] = {}
+
+        while waiting or running:
+
+            ready = [name for name, dependencies in waiting.items() if not dependencies]
+            ready.sort(key=lambda name: not self._offloaded(by_name[name]))
+
+            for name in ready:
+
+                del waiting[name]
+                running[self._submit(by_name[name], method, arguments)] = name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+
+                name = running.pop(future)
+                result, run = future.result()
+                runs[name] = run
+
+                if run.succeeded:
+
+                    results[name] = result
+
+                    for dependencies in waiting.values():
+                        dependencies.discard(name)
+
+                else:
+                    self._skip_dependents(name, waiting, runs)
+
+    def _submit(self, analyzer: Analyzer, method: str, arguments: Tuple[Any, ...]) -> Future:
+
+        """
+        Starts one analyzer in its worker process or the
+        thread pool, or runs it on the calling thread, and
+        returns the future of its result and report entry.
+
+        A stale analyzer is given a full run instead of
+        an update.
+        """
+
+        if method == "apply_changes" and analyzer.name in self.stale:
+            method, arguments = "analyze_and_save", (arguments[-1],)
+
+        if self.use_processes and analyzer.cpu_bound:
+            return self._submit_to_process(analyzer, method, arguments)
+
+        if analyzer.io_bound:
+
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers or len(self.analyzers),
+                    thread_name_prefix="analyzer"
+                )
+
+            return self._thread_pool.submit(_timed_call, analyzer, method, arguments)
+
+        future: Future = Future()
+        future.set_result(_timed_call(analyzer, method, arguments))
+
+        return future
+
+    def _submit_to_process(
+        self,
+        analyzer: Analyzer,
+        method: str,
+        arguments: Tuple[Any, ...]
+    ) -> Future:
+
+        """
+        Runs one analyzer in its own worker process.
+
+        The worker keeps the analyzer and its own copy of
+        the store between runs. Full runs send the whole
+        store, and so does the first update after a start
+        or failure, which becomes a full run. Other updates
+        send only the changes and the current records of
+        the changed keys. A store view is copied into a
+        plain dictionary before it is sent.
+        """
+
+        if analyzer.name not in self._synced:
+            method, arguments = "analyze_and_save", (arguments[-1],)
+
+        pool = self._process_pools.get(analyzer.name)
+
+        if pool is None:
+
+            pool = ProcessPoolExecutor(
+                max_workers=1, initializer=_start_worker, initargs=(analyzer,)
+            )
+            self._process_pools[analyzer.name] = pool
+
+        changes: Optional[List[StoreChange]] = None
+        number_data: Optional[Mapping[str, Dict[str, Any]]] = arguments[-1]
+        records: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+
+        if method == "apply_changes":
+
+            changes = arguments[0]
+            records = {change.key: number_data.get(change.key) for change in changes}
+            number_data = None
+
+        elif not isinstance(number_data, dict):
+            number_data = dict(number_data.items())
+
+        self._synced.discard(analyzer.name)
+
+        future = pool.submit(_call_in_worker, method, changes, number_data, records)
+
+        return self._track_sync(future, analyzer)
+
+    def _check_cache(
+        self,
+        analyzer: Analyzer,
+        digest: Optional[str],
+        runs: Dict[str, AnalyzerRun]
+    ) -> bool:
+
+        """
+        Returns whether an analyzer's output is current
+        for the digest, recording the hit or miss.
+        """
+
+        if digest is None or self.manifest_repository is None:
+            return False
+
+        entry = self._manifest_entry(analyzer, digest)
+
+        if entry is not None and self.manifest.get(analyzer.name) == entry:
+
+            self.cache_hits += 1
+            METRICS.count("analyzer.cache_hits")
+            runs[analyzer.name] = AnalyzerRun(analyzer.name, 0.0, cached=True)
+
+            return True
+
+        self.cache_misses += 1
+        METRICS.count("analyzer.cache_misses")
+
+        return False
+
+    def _update_manifest(
+        self,
+        analyzers: List[Analyzer],
+        runs: Dict[str, AnalyzerRun],
+        digest: str
+    ) -> None:
+
+        """
+        Records the digest of every successful run and
+        forgets the outputs of the failed ones.
+        """
+
+        assert self.manifest_repository is not None
+
+        if not analyzers:
+            return
+
+        for analyzer in analyzers:
+
+            entry = (
+                self._manifest_entry(analyzer, digest)
+                if runs[analyzer.name].succeeded else None
+            )
+
+            if entry is not None:
+                self.manifest[analyzer.name] = entry
+
+            else:
+                self.manifest.pop(analyzer.name, None)
+
+        self.manifest_repository.save(self.manifest)
+
+    @staticmethod
+    def _manifest_entry(analyzer: Analyzer, digest: str) -> Optional[Dict[str, Any]]:
+
+        """
+        Returns the manifest entry of an analyzer's current
+        output: its version, the input digest and the output
+        file's modification time and size, so that a file
+        rewritten or truncated since is never reported as
+        current. Returns None if the output file is missing.
+        """
+
+        entry: Dict[str, Any] = {"version": analyzer.version, "digest": digest}
+
+        if analyzer.output_path is not None:
+
+            try:
+                status = Path(analyzer.output_path).stat()
+
+            except OSError:
+                return None
+
+            entry["output"] = [status.st_mtime_ns, status.st_size]
+
+        return entry
+
+    def _select(self, names: Optional[Iterable[str]]) -> List[Analyzer]:
+
+        """
+        Returns the requested analyzers and their
+        dependencies, in a valid execution order.
+        """
+
+        by_name = {analyzer.name: analyzer for analyzer in self.analyzers}
+
+        for analyzer in self.analyzers:
+
+            for dependency in analyzer.dependencies:
+
+                if dependency not in by_name:
+                    raise AnalysisError(
+                        f"Analyzer '{analyzer.name}' depends on unknown analyzer '{dependency}'."
+                    )
+
+        if names is None:
+            selected = set(by_name)
+
+        else:
+
+            selected = set()
+            pending = list(names)
+
+            while pending:
+
+                name = pending.pop()
+
+                if name not in by_name:
+                    raise AnalysisError(f"Unknown analyzer '{name}'.")
+
+                if name not in selected:
+
+                    selected.add(name)
+                    pending.extend(by_name[name].dependencies)
+
+        ordered: List[Analyzer] = []
+        placed: Set[str] = set()
+
+        remaining = [analyzer for analyzer in self.analyzers if analyzer.name in selected]
+
+        while remaining:
+
+            ready = [
+                analyzer for analyzer in remaining
+                if all(dependency in placed for dependency in analyzer.dependencies)
+            ]
+
+            if not ready:
+                raise AnalysisError(
+                    "Analyzer dependencies form a cycle: "
+                    + ", ".join(analyzer.name for analyzer in remaining)
+                )
+
+            ordered.extend(ready)
+            placed.update(analyzer.name for analyzer in ready)
+            remaining = [analyzer for analyzer in remaining if analyzer.name not in placed]
+
+        return ordered
+
+    def _offloaded(self, analyzer: Analyzer) -> bool:
+
+        """
+        Returns whether an analyzer runs off the calling thread.
+        """
+
+        return analyzer.io_bound or (self.use_processes and analyzer.cpu_bound)
+
+    def _track_sync(self, future: Future, analyzer: Analyzer) -> Future:
+
+        """
+        Records whether a worker process holds the current
+        store after a run, so the next update knows whether
+        the changes alone are enough.
+        """
+
+        tracked: Future = Future()
+
+        def record_sync(done: Future) -> None:
+
+            try:
+
+                result, run = done.result()
+
+                if run.succeeded:
+                    self._synced.add(analyzer.name)
+
+                tracked.set_result((result, run))
+
+            except Exception as error:
+
+                pool = self._process_pools.pop(analyzer.name, None)
+
+                if pool is not None:
+                    pool.shutdown(wait=False)
+
+                tracked.set_result((None, AnalyzerRun(analyzer.name, 0.0, _describe(error))))
+
+        future.add_done_callback(record_sync)
+
+        return tracked
+
+    @staticmethod
+    def _skip_dependents(
+        failed_name: str,
+        waiting: Dict[str, Set[str]],
+        runs: Dict[str, AnalyzerRun]
+    ) -> None:
+
+        """
+        Removes every analyzer that depends, directly or
+        not, on a failed analyzer and records it as skipped.
+        """
+
+        failed = [failed_name]
+
+        while failed:
+
+            name = failed.pop()
+
+            for dependent in [dependent for dependent, deps in waiting.items() if name in deps]:
+
+                del waiting[dependent]
+                runs[dependent] = AnalysisPipeline._skipped_run(dependent, name)
+                failed.append(dependent)
+
+    @staticmethod
+    def _skipped_run(name: str, dependency: str) -> AnalyzerRun:
+
+        """
+        Builds the report entry of an analyzer skipped
+        because one of its dependencies failed.
+        """
+
+        return AnalyzerRun(name, 0.0, f"Skipped because '{dependency}' failed.")
+
+
+def _timed_call(
+    analyzer: Analyzer,
+    method: str,
+    arguments: Tuple[Any, ...]
+) -> Tuple[Optional[Dict[str, Any]], AnalyzerRun]:
+
+    """
+    Calls one analyzer method, recording its duration
+    and turning any exception into a failed run.
+    """
+
+    started = time.perf_counter()
+
+    try:
+
+        result = getattr(analyzer, method)(*arguments)
+        error = None
+
+    except Exception as exception:
+
+        result = None
+        error = _describe(exception)
+
+    return result, AnalyzerRun(analyzer.name, time.perf_counter() - started, error)
+
+
+def _start_worker(analyzer: Analyzer) -> None:
+
+    """
+    Installs the analyzer a worker process runs.
+    """
+
+    global _WORKER_ANALYZER, _WORKER_STORE
+
+    _WORKER_ANALYZER = analyzer
+    _WORKER_STORE = {}
+
+
+def _call_in_worker(
+    method: str,
+    changes: Optional[List[StoreChange]],
+    number_data: Optional[Dict[str, Dict[str, Any]]],
+    records: Optional[Dict[str, Optional[Dict[str, Any]]]]
+) -> Tuple[Optional[Dict[str, Any]], AnalyzerRun]:
+
+    """
+    Runs the worker's analyzer inside its process, after
+    replacing its store copy with the whole store or
+    updating the changed records, None for removed keys.
+    """
+
+    global _WORKER_STORE
+
+    assert _WORKER_ANALYZER is not None
+
+    if number_data is not None:
+        _WORKER_STORE = number_data
+
+    for key, record in (records or {}).items():
+
+        if record is None:
+            _WORKER_STORE.pop(key, None)
+
+        else:
+            _WORKER_STORE[key] = record
+
+    if method == "apply_changes":
+        return _timed_call(_WORKER_ANALYZER, method, (changes, _WORKER_STORE))
+
+    return _timed_call(_WORKER_ANALYZER, method, (_WORKER_STORE,))
+
+
+def _describe(error: BaseException) -> str:
+
+    """
+    Returns a short description of an exception.
+    """
+
+    return f"{type(error).__name__}: {error}"
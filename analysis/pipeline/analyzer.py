@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.models import StoreChange
 
 
 class Analyzer(ABC):
@@ -19,6 +22,62 @@ class Analyzer(ABC):
 
         pass
 
+    @property
+    def version(self) -> str:
+
+        """
+        Returns the version of the analyzer's output format.
+
+        Bumping it invalidates outputs cached by the pipeline.
+        """
+
+        return "1"
+
+    @property
+    def output_path(self) -> Optional[Path]:
+
+        """
+        Returns the file the analyzer writes, if any.
+
+        The pipeline only reuses a cached output
+        while this file still exists.
+        """
+
+        return None
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+
+        """
+        Returns the names of the analyzers that must
+        finish before this one runs.
+        """
+
+        return ()
+
+    @property
+    def io_bound(self) -> bool:
+
+        """
+        Returns whether the analyzer mostly waits on
+        input or output, such as a network service, so
+        it may run in a worker thread. Pure Python work
+        gains nothing from threads under the GIL.
+        """
+
+        return False
+
+    @property
+    def cpu_bound(self) -> bool:
+
+        """
+        Returns whether the analyzer is dominated by pure
+        Python computation rather than file output, so
+        it may be moved to a worker process.
+        """
+
+        return False
+
     @abstractmethod
     def analyze_and_save(self, number_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
 
@@ -30,3 +89,22 @@ class Analyzer(ABC):
         """
 
         pass
+
+    def apply_changes(
+        self,
+        changes: List[StoreChange],
+        number_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+
+        """
+        Updates the analyzer output after store mutations.
+
+        Analyzers that cannot update their output in place
+        fall back to a full run over the number dictionary.
+
+        :param changes: The store changes since the last run.
+        :param number_data: The stored number dictionary.
+        :return: The updated analysis result.
+        """
+
+        return self.analyze_and_save(number_data)
@@ -1,17 +1,35 @@
 # -*- coding: utf-8 -*-
 from analysis.pipeline.analysis_pipeline import AnalysisPipeline
-from analysis.permutation_analyzer import PermutationAnalyzer
+from config.paths import ANALYSIS_MANIFEST_PATH
 
 
-def build_default_pipeline() -> AnalysisPipeline:
+def build_default_pipeline(use_processes: bool = False) -> AnalysisPipeline:
 
     """
     Builds the default research analysis pipeline.
 
+    The analyzer modules are imported here, when a
+    pipeline is actually needed, rather than with
+    this module.
+
+    Both analyzers are CPU-bound, so they run in
+    sequence unless use_processes gives each one a
+    worker process. Starting the workers and sending
+    them the store costs more than small stores take
+    to analyze, hence the sequential default.
+
+    :param use_processes: Whether the analyzers run in worker processes.
     :return: The configured analysis pipeline.
     """
 
-    pipeline = AnalysisPipeline()
+    from analysis.permutation_analyzer import PermutationAnalyzer
+    from analysis.anagram_analyzer import AnagramAnalyzer
+
+    pipeline = AnalysisPipeline(
+        use_processes=use_processes,
+        manifest_path=ANALYSIS_MANIFEST_PATH
+    )
     pipeline.register(PermutationAnalyzer())
+    pipeline.register(AnagramAnalyzer())
 
     return pipeline
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import argparse
+import io
+import sys
+
+from typing import List, Optional, TextIO
+
+from app.commands import BACKENDS, repository_factory
+from services.phrase_service import PhraseService
+from core.exceptions import LexarithmosError
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Imports a phrase corpus, one phrase per line.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Stores every line of a file (or stdin) as a phrase."
+    )
+    parser.add_argument("source", nargs="?", default="-", help="The corpus file, or '-' for stdin.")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="json",
+        help="The number store: the journaled JSON file or the SQLite database."
+    )
+    parser.add_argument(
+        "--progress-interval", type=_progress_interval, default=10000,
+        help="The number of phrases between progress lines, 0 for only the last."
+    )
+    parser.add_argument(
+        "--processes", action="store_true",
+        help="Runs each analyzer in a worker process instead of in sequence."
+    )
+    parser.add_argument(
+        "--warm-cache", action="store_true",
+        help="Pre-loads the word cache with the words of every stored phrase."
+    )
+
+    arguments = parser.parse_args(argv)
+
+    phrase_service = PhraseService(
+        repository_factory=repository_factory(arguments.backend),
+        analysis_processes=arguments.processes
+    )
+
+    try:
+
+        if arguments.warm_cache:
+            phrase_service.warm_word_cache()
+
+        with _open_source(arguments.source, arguments.encoding) as source:
+
+            imported = phrase_service.bulk_insert(
+                source,
+                progress=_print_progress,
+                progress_interval=arguments.progress_interval
+            )
+
+        phrase_service.compact_storage()
+
+    except KeyboardInterrupt:
+
+        print("\nImport aborted by the user.", file=sys.stderr)
+        return 130
+
+    except (LexarithmosError, OSError, UnicodeDecodeError) as error:
+
+        print(f"\n[Lexarithmos Error]: {error}", file=sys.stderr)
+        return 1
+
+    print(f"\n[Message]: Imported {imported} phrases.", file=sys.stderr)
+    return 0
+
+
+def _progress_interval(text: str) -> int:
+
+    """
+    Parses a non-negative progress interval.
+    """
+
+    interval = int(text)
+
+    if interval < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more")
+
+    return interval
+
+
+def _open_source(source: str, encoding: str) -> TextIO:
+
+    """
+    Opens the corpus file, or wraps stdin with the given encoding.
+    """
+
+    if source == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding=encoding)
+
+    return open(source, "r", encoding=encoding)
+
+
+def _print_progress(count: int, elapsed: float) -> None:
+
+    """
+    Prints the processed phrase count and throughput.
+    """
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"\r[Progress]: {count} phrases, {rate:.0f} phrases/s", end="", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
-from typing import Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from core.actions import Action
+from core.refresh_policy import RefreshPolicy
+from core.instrumentation import METRICS
 from services.phrase_service import PhraseService
+from app.commands import repository_factory
 from core.models import PhraseResult
 
-from core.exceptions import LexarithmosError
+from core.exceptions import LexarithmosError, PhraseStorageError
 
 
 class LexarithmosCLI:
@@ -15,13 +18,44 @@ class LexarithmosCLI:
     of the Lexarithmos application.
     """
 
-    def __init__(self) -> None:
+    COMMAND_PREFIX = ":"
+
+    def __init__(
+        self,
+        backend: str = "json",
+        use_processes: bool = False,
+        warm_cache: bool = False
+    ) -> None:
 
         """
         Initializes the CLI dependencies.
+
+        :param backend: The number store backend, 'json' or 'sqlite'.
+        :param use_processes: Whether the analyzers run in worker processes.
+        :param warm_cache: Whether the word cache is warmed before the first input.
         """
 
-        self.phrase_service = PhraseService()
+        self.warm_cache = warm_cache
+
+        self.phrase_service = PhraseService(
+            repository_factory=repository_factory(backend),
+            refresh_policy=RefreshPolicy.DEBOUNCED,
+            analysis_processes=use_processes
+        )
+
+        self.commands: Dict[str, Callable[[List[str]], None]] = {
+            "help": self._print_command_menu,
+            "compact": self._compact_storage,
+            "flush": self._flush_analyzers,
+            "find": self._find_phrase,
+            "word": self._find_word,
+            "range": self._query_range,
+            "root": self._query_root,
+            "chain": self._query_subdivisions,
+            "nearest": self._query_nearest,
+            "compose": self._compose,
+            "stats": self._print_stats
+        }
 
     def run(self) -> int:
 
@@ -35,10 +69,21 @@ class LexarithmosCLI:
 
         try:
 
+            if self.warm_cache:
+
+                count = self.phrase_service.warm_word_cache()
+                print(f"\n[Message]: Word cache warmed with {count} words.")
+
             while True:
 
                 phrase, action = self._read_user_input()
 
+                self.phrase_service.flush_if_due()
+
+                if action is None:
+                    self._run_command(phrase)
+                    continue
+
                 if not phrase:
                     self._print_exit_message()
                     break
@@ -62,8 +107,223 @@ class LexarithmosCLI:
             print(f"\n[Unexpected Error]: {error}")
             return 1
 
+        finally:
+
+            self._close()
+
         return 0
 
+    def _close(self) -> None:
+
+        """
+        Refreshes the analyzers and compacts pending
+        storage changes before exiting.
+        """
+
+        try:
+
+            self.phrase_service.flush()
+            self.phrase_service.compact_storage()
+
+        except LexarithmosError as error:
+            print(f"\n[Lexarithmos Error]: {error}")
+
+    def _run_command(self, command_line: str) -> None:
+
+        """
+        Runs a CLI command such as ':compact'.
+
+        :param command_line: The command name followed by its arguments.
+        """
+
+        command, *arguments = command_line.split() or [""]
+        handler = self.commands.get(command.lower())
+
+        if handler is None:
+
+            print("\n!!! Warning !!!")
+            print(f"Unknown command ':{command}'. Type ':help' for the command list.")
+            return
+
+        try:
+            handler(arguments)
+
+        except (ValueError, IndexError):
+
+            print("\n!!! Warning !!!")
+            print(f"Invalid arguments for ':{command}'. Type ':help' for usage.")
+
+        except LexarithmosError as error:
+            print(f"\n[Lexarithmos Error]: {error}")
+
+    def _compact_storage(self, arguments: List[str]) -> None:
+
+        """
+        Compacts the storage journal into the number file.
+        """
+
+        self.phrase_service.compact_storage()
+        print("\n[Message]: Storage compacted successfully.")
+
+    def _flush_analyzers(self, arguments: List[str]) -> None:
+
+        """
+        Refreshes the analyzers with the pending store changes.
+        """
+
+        count = self.phrase_service.flush()
+        print(f"\n[Message]: Analyzers refreshed with {count} pending change(s).")
+
+    def _print_stats(self, arguments: List[str]) -> None:
+
+        """
+        Prints, toggles, resets or saves the hot-path metrics.
+        """
+
+        option = arguments[0].lower() if arguments else ""
+
+        if option == "on":
+
+            METRICS.enable()
+            print("\n[Message]: Metrics enabled.")
+            return
+
+        if option == "off":
+
+            METRICS.disable()
+            print("\n[Message]: Metrics disabled.")
+            return
+
+        if option == "reset":
+
+            METRICS.reset()
+            print("\n[Message]: Metrics reset.")
+            return
+
+        if option == "save":
+
+            try:
+                METRICS.dump(arguments[1])
+            except OSError as error:
+                raise PhraseStorageError(
+                    f"Failed to save metrics to '{arguments[1]}': {error}"
+                ) from error
+
+            print(f"\n[Message]: Metrics saved to '{arguments[1]}'.")
+            return
+
+        if option:
+            raise ValueError(f"Unknown stats option '{option}'.")
+
+        word_cache = self.phrase_service.transformer.word_values
+        pipeline = self.phrase_service.analysis_pipeline
+
+        print(f"\n[Metrics]: {'enabled' if METRICS.enabled else 'disabled'}")
+        print(METRICS.format_report())
+        print(
+            f"\n[Word cache]: {word_cache.hits} hits, {word_cache.misses} misses, "
+            f"{word_cache.evictions} evictions, {len(word_cache)} words"
+        )
+        print(f"[Analyzer cache]: {pipeline.cache_hits} hits, {pipeline.cache_misses} misses")
+
+    def _find_phrase(self, arguments: List[str]) -> None:
+
+        """
+        Prints where a phrase, or its accent variants, is stored.
+        """
+
+        phrase = " ".join(arguments)
+
+        print(f"\n[Phrase]: {phrase}")
+        print(f"[Stored Key]: {self.phrase_service.find_phrase(phrase)}")
+        print(f"[Equivalent Phrases]: {self.phrase_service.find_equivalent_phrases(phrase)}")
+
+    def _find_word(self, arguments: List[str]) -> None:
+
+        """
+        Prints the stored phrases containing a word.
+        """
+
+        word = " ".join(arguments)
+
+        print(f"\n[Word]: {word}")
+        print(f"[Phrases]: {self.phrase_service.find_phrases_with_word(word)}")
+
+    def _query_range(self, arguments: List[str]) -> None:
+
+        """
+        Prints the stored phrases with values in a range.
+        """
+
+        low, high = int(arguments[0]), int(arguments[1])
+
+        print(f"\n[Range]: {low} - {high}")
+
+        for key, record in self.phrase_service.query_range(low, high).items():
+            print(f"[{key}]: {record.get('key-phrases', [])}")
+
+    def _query_root(self, arguments: List[str]) -> None:
+
+        """
+        Prints the stored numbers with a digital root.
+        """
+
+        root = int(arguments[0])
+
+        print(f"\n[Root]: {root}")
+        print(f"[Keys]: {self.phrase_service.query_root(root)}")
+
+    def _query_subdivisions(self, arguments: List[str]) -> None:
+
+        """
+        Prints the stored numbers with a subdivision chain.
+        """
+
+        sub_divisions = [int(argument) for argument in arguments]
+
+        print(f"\n[Subdivisions]: {sub_divisions}")
+        print(f"[Keys]: {self.phrase_service.query_subdivisions(sub_divisions)}")
+
+    def _query_nearest(self, arguments: List[str]) -> None:
+
+        """
+        Prints the stored numbers closest to a number.
+        """
+
+        number = int(arguments[0])
+        count = int(arguments[1]) if len(arguments) > 1 else 5
+
+        print(f"\n[Number]: {number}")
+        print(f"[Nearest Keys]: {self.phrase_service.query_nearest(number, count)}")
+
+    def _compose(self, arguments: List[str]) -> None:
+
+        """
+        Prints stored word combinations that total a value.
+
+        Arguments are the target, an optional maximum word
+        count, and words prefixed with '+' (required) or
+        '-' (forbidden).
+        """
+
+        target = int(arguments[0])
+        numbers = [argument for argument in arguments[1:] if argument.isdigit()]
+        max_words = int(numbers[0]) if numbers else 3
+
+        required = [argument[1:] for argument in arguments if argument.startswith("+")]
+        forbidden = [argument[1:] for argument in arguments if argument.startswith("-")]
+
+        print(f"\n[Target]: {target}")
+
+        for words in self.phrase_service.compose(
+            target,
+            max_words=max_words,
+            required_words=required,
+            forbidden_words=forbidden,
+            max_results=50
+        ):
+            print(f"[Words]: {words}")
+
     @staticmethod
     def _parse_action(action: str) -> Action:
 
@@ -81,20 +341,27 @@ class LexarithmosCLI:
 
         return Action.COMPUTE_ONLY
 
-    def _read_user_input(self) -> Tuple[str, Action]:
+    def _read_user_input(self) -> Tuple[str, Optional[Action]]:
 
         """
         Reads phrase and action from the user.
 
-        :return: A tuple containing the phrase and selected action.
+        Commands start with ':', so a phrase that begins
+        with a command name is still read as a phrase.
+
+        :return: A tuple containing the phrase and selected action,
+                 or the command line and no action for commands.
         """
 
-        print("\nType your phrase (or 'quit' to exit): ")
+        print("\nType your phrase (or ':help' for commands, 'quit' to exit): ")
         phrase = input("--> ").strip()
 
         if phrase.lower() == "quit":
             return "", Action.COMPUTE_ONLY
 
+        if phrase.startswith(self.COMMAND_PREFIX):
+            return phrase[len(self.COMMAND_PREFIX):], None
+
         if not phrase:
 
             print("\n!!! Warning !!!")
@@ -163,6 +430,34 @@ class LexarithmosCLI:
         print("# => Enter: Computes only.                  #")
         print("#############################################\n")
 
+    @staticmethod
+    def _print_command_menu(arguments: List[str]) -> None:
+
+        """
+        Prints the available command menu.
+        """
+
+        print("\n##############################################")
+        print("# Command list                               #")
+        print("# ------------                               #")
+        print("#                                            #")
+        print("# => :help: Shows this list.                 #")
+        print("# => :compact: Compacts the storage journal. #")
+        print("# => :flush: Refreshes the analyzer files.   #")
+        print("# => :find <phrase>: Finds a stored phrase.  #")
+        print("# => :word <word>: Lists phrases with word.  #")
+        print("# => :range <a> <b>: Phrases valued a to b.  #")
+        print("# => :root <r>: Keys with digital root r.    #")
+        print("# => :chain <d1> ... <dN>: Keys by chain.    #")
+        print("# => :nearest <n> [k]: k keys closest to n.  #")
+        print("# => :compose <n> [k] [+w] [-w]: Finds up    #")
+        print("#    to k stored words totalling n, with (+) #")
+        print("#    or without (-) the given words.         #")
+        print("# => :stats [on|off|reset|save <file>]:      #")
+        print("#    Shows or manages timing metrics.        #")
+        print("# => quit: Exits the application.            #")
+        print("##############################################")
+
     @staticmethod
     def _print_exit_message() -> None:
 
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+import argparse
+import io
+import json
+import sys
+
+from itertools import islice
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterable, Iterator, List
+
+from core.transformer import Transformer
+from core.refresh_policy import RefreshPolicy
+from services.phrase_service import PhraseService
+from config.paths import NUMBER_JOURNAL_PATH
+from core.exceptions import AnalysisError, LexarithmosError
+
+if TYPE_CHECKING:
+    from storage.base_number_repository import BaseNumberRepository
+
+BACKENDS = ("json", "sqlite")
+
+
+class JsonLinesWriter:
+
+    """
+    Writes one JSON object per line, buffering
+    the lines into large binary writes.
+    """
+
+    def __init__(self, stream: BinaryIO, buffer_lines: int = 1000) -> None:
+
+        """
+        Initializes the writer.
+
+        :param stream: The binary output stream, e.g. sys.stdout.buffer.
+        :param buffer_lines: The number of lines gathered per write.
+        """
+
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self.lines: List[str] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+
+        """
+        Queues one record for output.
+
+        :param record: The JSON-serializable record.
+        """
+
+        self.lines.append(json.dumps(record, ensure_ascii=False))
+
+        if len(self.lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self) -> None:
+
+        """
+        Writes the queued lines.
+        """
+
+        if self.lines:
+
+            self.stream.write(("\n".join(self.lines) + "\n").encode("utf-8"))
+            self.lines = []
+
+        self.stream.flush()
+
+
+def add_subcommands(parser: argparse.ArgumentParser) -> None:
+
+    """
+    Registers the non-interactive subcommands.
+
+    :param parser: The main argument parser.
+    """
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    compute = subparsers.add_parser("compute", help="Computes phrases without storing them.")
+    _add_phrase_source(compute)
+    compute.set_defaults(handler=run_compute)
+
+    insert = subparsers.add_parser("insert", help="Stores phrases.")
+    _add_phrase_source(insert)
+    insert.set_defaults(handler=run_insert)
+
+    delete = subparsers.add_parser("delete", help="Deletes stored phrases.")
+    _add_phrase_source(delete)
+    delete.set_defaults(handler=run_delete)
+
+    query = subparsers.add_parser("query", help="Queries the stored phrases.")
+    queries = query.add_subparsers(dest="query", metavar="query", required=True)
+
+    query_range = queries.add_parser("range", help="Records with values from low to high.")
+    query_range.add_argument("low", type=int)
+    query_range.add_argument("high", type=int)
+
+    query_root = queries.add_parser("root", help="Values with a digital root.")
+    query_root.add_argument("root", type=int)
+
+    query_chain = queries.add_parser("chain", help="Values with a subdivision chain.")
+    query_chain.add_argument("subdivisions", type=int, nargs="+")
+
+    query_nearest = queries.add_parser("nearest", help="Stored values closest to a number.")
+    query_nearest.add_argument("number", type=int)
+    query_nearest.add_argument("--count", type=int, default=5)
+
+    query_word = queries.add_parser("word", help="Phrases containing a word.")
+    query_word.add_argument("word")
+
+    query_find = queries.add_parser("find", help="Where phrases, or their accent variants, are stored.")
+    _add_phrase_source(query_find)
+
+    query.set_defaults(handler=run_query)
+
+    analyze = subparsers.add_parser(
+        "analyze", help="Analyzes phrases against the store: values, permutations and anagrams."
+    )
+    _add_phrase_source(analyze)
+    analyze.set_defaults(handler=run_analyze)
+
+    rebuild = subparsers.add_parser("rebuild", help="Rebuilds the analyzer files.")
+    rebuild.add_argument("names", nargs="*", help="The analyzers to rebuild, all by default.")
+    rebuild.add_argument("--cached", action="store_true", help="Skips outputs recorded as current.")
+    rebuild.set_defaults(handler=run_rebuild)
+
+
+def run_compute(arguments: argparse.Namespace, output: JsonLinesWriter) -> int:
+
+    """
+    Writes the value of every phrase.
+    """
+
+    transformer = Transformer()
+
+    for value in transformer.analyze_stream(_read_phrases(arguments), batch_size=10000):
+        output.write({
+            "phrase": value.original_text,
+            "value": value.total_value,
+            "subdivisions": value.subdivisions
+        })
+
+    return 0
+
+
+def run_insert(arguments: argparse.Namespace, output: JsonLinesWriter) -> int:
+
+    """
+    Stores every phrase, writing each one's value.
+    """
+
+    phrase_service = _build_service(arguments)
+    values = phrase_service.analyze_stream(_read_phrases(arguments), batch_size=10000)
+
+    try:
+
+        while batch := list(islice(values, 10000)):
+
+            changes = phrase_service.insert_many(batch)
+
+            for value, change in zip(batch, changes):
+                output.write({
+                    "phrase": value.original_text,
+                    "value": value.total_value,
+                    "subdivisions": value.subdivisions,
+                    "kind": change.kind.value
+                })
+
+    finally:
+        _close_service(phrase_service)
+
+    return 0
+
+
+def run_delete(arguments: argparse.Namespace, output: JsonLinesWriter) -> int:
+
+    """
+    Deletes every phrase, writing each outcome.
+    """
+
+    phrase_service = _build_service(arguments)
+    failures = 0
+
+    try:
+
+        for phrase in _read_phrases(arguments):
+
+            try:
+
+                change = phrase_service.delete_phrase(phrase)
+                output.write({"phrase": phrase, "value": int(change.key), "kind": change.kind.value})
+
+            except LexarithmosError as error:
+
+                failures += 1
+                output.write({"phrase": phrase, "error": str(error)})
+
+    finally:
+        _close_service(phrase_service)
+
+    return 1 if failures else 0
+
+
+def run_query(arguments: argparse.Namespace, output: JsonLinesWriter) -> int:
+
+    """
+    Writes the results of a numeric, word or phrase query.
+    """
+
+    phrase_service = _build_service(arguments)
+
+    if arguments.query == "range":
+
+        for key, record in phrase_service.query_range(arguments.low, arguments.high).items():
+            output.write({"value": int(key), **record})
+
+        return 0
+
+    if arguments.query == "word":
+
+        for phrase in phrase_service.find_phrases_with_word(arguments.word):
+            output.write({"phrase": phrase, "value": phrase_service.find_phrase(phrase)})
+
+        return 0
+
+    if arguments.query == "find":
+
+        for phrase in _read_phrases(arguments):
+            output.write({
+                "phrase": phrase,
+                "value": phrase_service.find_phrase(phrase),
+                "equivalents": phrase_service.find_equivalent_phrases(phrase)
+            })
+
+        return 0
+
+    if arguments.query == "root":
+        keys = phrase_service.query_root(arguments.root)
+
+    elif arguments.query == "chain":
+        keys = phrase_service.query_subdivisions(arguments.subdivisions)
+
+    else:
+        keys = phrase_service.query_nearest(arguments.number, arguments.count)
+
+    for key in keys:
+        output.write({"value": key})
+
+    return 0
+
+
+def run_analyze(arguments: argparse.Namespace, output: JsonLinesWriter) -> int:
+
+    """
+    Writes the value of every phrase with the stored
+    numbers that permute its digits and the stored
+    phrases that are its anagrams.
+    """
+
+    phrase_service = _build_service(arguments)
+
+    for value in phrase_service.analyze_stream(_read_phrases(arguments), batch_size=10000):
+        output.write({
+            "phrase": value.original_text,
+            "value": value.total_value,
+            "subdivisions": value.subdivisions,
+            "permutations": phrase_service.query_permutations(value.total_value),
+            "anagrams": phrase_service.find_anagrams(value.original_text)
+        })
+
+    return 0
+
+
+def run_rebuild(arguments: argparse.Namespace, output: JsonLinesWriter) -> int:
+
+    """
+    Rebuilds the analyzer files, writing one line per analyzer.
+    """
+
+    phrase_service = _build_service(arguments)
+    status = 0
+
+    try:
+        phrase_service.rebuild_analyzers(names=arguments.names or None, use_cache=arguments.cached)
+
+    except AnalysisError as error:
+
+        status = 1
+        print(f"[Lexarithmos Error]: {error}", file=sys.stderr)
+
+    for run in phrase_service.analysis_pipeline.last_report:
+        output.write({
+            "name": run.name,
+            "seconds": round(run.duration, 6),
+            "cached": run.cached,
+            "error": run.error
+        })
+
+    return status
+
+
+def _add_phrase_source(parser: argparse.ArgumentParser) -> None:
+
+    """
+    Adds the phrase, file and encoding arguments.
+    """
+
+    parser.add_argument("phrases", nargs="*", help="The phrases; read one per line otherwise.")
+    parser.add_argument("--file", default="-", help="The phrase file, or '-' for stdin.")
+    parser.add_argument("--encoding", default="utf-8")
+
+
+def _read_phrases(arguments: argparse.Namespace) -> Iterator[str]:
+
+    """
+    Yields the stripped, non-blank phrases from the
+    arguments, or else from the file or stdin.
+    """
+
+    if arguments.phrases:
+
+        lines: Iterable[str] = arguments.phrases
+        yield from (phrase.strip() for phrase in lines if phrase.strip())
+        return
+
+    if arguments.file == "-":
+
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding=arguments.encoding)
+
+    else:
+        source = open(arguments.file, "r", encoding=arguments.encoding)
+
+    with source:
+
+        for line in source:
+
+            phrase = line.strip()
+
+            if phrase:
+                yield phrase
+
+
+def repository_factory(backend: str) -> Callable[[], "BaseNumberRepository"]:
+
+    """
+    Returns a factory for the store of a backend: the
+    journaled JSON file or the SQLite database. The
+    storage modules are imported here, so commands
+    that never build a service skip them.
+
+    :param backend: One of BACKENDS.
+    :return: A callable creating the repository.
+    """
+
+    if backend == "sqlite":
+
+        from storage.sqlite_number_repository import SqliteNumberRepository
+
+        return SqliteNumberRepository
+
+    from functools import partial
+    from storage.number_repository import NumberRepository
+
+    return partial(NumberRepository, journal_path=NUMBER_JOURNAL_PATH)
+
+
+def _build_service(arguments: argparse.Namespace) -> PhraseService:
+
+    """
+    Builds a service over the chosen backend's store
+    that refreshes the analyzers only when closed, with
+    its word cache warmed when asked for.
+    """
+
+    phrase_service = PhraseService(
+        repository_factory=repository_factory(arguments.backend),
+        refresh_policy=RefreshPolicy.DEFERRED,
+        analysis_processes=arguments.processes
+    )
+
+    if arguments.warm_cache:
+        phrase_service.warm_word_cache()
+
+    return phrase_service
+
+
+def _close_service(phrase_service: PhraseService) -> None:
+
+    """
+    Refreshes the analyzers and compacts the storage.
+    """
+
+    phrase_service.flush()
+    phrase_service.compact_storage()
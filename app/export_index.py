@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import argparse
+
+from typing import List, Optional
+
+from app.commands import BACKENDS, repository_factory
+from storage.number_repository import NumberRepository
+from storage.mapped_number_index import MappedNumberIndex
+from config.paths import NUMBER_FILE_PATH, NUMBER_INDEX_PATH, NUMBER_JOURNAL_PATH
+from core.exceptions import LexarithmosError
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Exports the number store as a memory-mapped index file.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Writes the number store as a compact, read-only index file."
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="json",
+        help="The number store: the journaled JSON file or the SQLite database."
+    )
+    parser.add_argument(
+        "--source", default=str(NUMBER_FILE_PATH), help="The number file of the json backend."
+    )
+    parser.add_argument(
+        "--journal", default=str(NUMBER_JOURNAL_PATH), help="The journal of the json backend."
+    )
+    parser.add_argument("--output", default=str(NUMBER_INDEX_PATH))
+
+    arguments = parser.parse_args(argv)
+
+    try:
+
+        if arguments.backend == "json":
+            repository = NumberRepository(arguments.source, journal_path=arguments.journal)
+        else:
+            repository = repository_factory(arguments.backend)()
+
+        exported = MappedNumberIndex.export(repository.iter_records(), arguments.output)
+
+    except LexarithmosError as error:
+
+        print(f"[Lexarithmos Error]: {error}")
+        return 1
+
+    print(f"[Message]: Exported {exported} numbers into '{arguments.output}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
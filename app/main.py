@@ -1,17 +1,126 @@
 # -*- coding: utf-8 -*-
-from app.cli import LexarithmosCLI
+import argparse
+import os
+import sys
 
+from typing import List, Optional
 
-def main() -> int:
+from app.commands import BACKENDS, JsonLinesWriter, add_subcommands
+from core.exceptions import LexarithmosError
+from core.instrumentation import METRICS
+
+
+def main(argv: Optional[List[str]] = None) -> int:
 
     """
-    Starts the Lexarithmos application.
+    Starts the Lexarithmos application, running a
+    single command when one is given and the
+    interactive interface otherwise.
 
+    :param argv: The command-line arguments.
     :return: The process exit code.
     """
 
-    cli = LexarithmosCLI()
-    return cli.run()
+    parser = argparse.ArgumentParser(description="The Lexarithmos application.")
+    parser.add_argument("--stats", action="store_true", help="Prints timing metrics on exit.")
+    parser.add_argument("--stats-json", metavar="FILE", help="Writes timing metrics to a JSON file on exit.")
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="json",
+        help="The number store: the journaled JSON file or the SQLite database."
+    )
+    parser.add_argument(
+        "--processes", action="store_true",
+        help="Runs each analyzer in a worker process instead of in sequence."
+    )
+    parser.add_argument(
+        "--warm-cache", action="store_true",
+        help="Pre-loads the word cache with the words of every stored phrase."
+    )
+
+    add_subcommands(parser)
+
+    arguments = parser.parse_args(argv)
+
+    if arguments.stats or arguments.stats_json:
+        METRICS.enable()
+
+    status = 1
+
+    try:
+
+        if arguments.command is None:
+
+            from app.cli import LexarithmosCLI
+
+            status = LexarithmosCLI(
+                arguments.backend, arguments.processes, arguments.warm_cache
+            ).run()
+
+        else:
+            status = _run_command(arguments)
+
+    finally:
+
+        if arguments.stats:
+            print(METRICS.format_report(), file=sys.stderr)
+
+        if arguments.stats_json and not _dump_metrics(arguments.stats_json) and status == 0:
+            status = 1
+
+    return status
+
+
+def _dump_metrics(file_path: str) -> bool:
+
+    """
+    Writes the metrics to a JSON file, reporting
+    a failure instead of raising it.
+
+    :param file_path: The output file path.
+    :return: True if the file was written.
+    """
+
+    try:
+        METRICS.dump(file_path)
+    except OSError as error:
+
+        print(
+            f"[Lexarithmos Error]: Failed to save metrics to '{file_path}': {error}",
+            file=sys.stderr
+        )
+        return False
+
+    return True
+
+
+def _run_command(arguments: argparse.Namespace) -> int:
+
+    """
+    Runs a non-interactive command, writing its
+    JSON lines to stdout.
+    """
+
+    output = JsonLinesWriter(sys.stdout.buffer)
+
+    try:
+
+        status = arguments.handler(arguments, output)
+        output.flush()
+
+        return status
+
+    except BrokenPipeError:
+
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+        return 0
+
+    except (LexarithmosError, OSError, UnicodeDecodeError) as error:
+
+        output.flush()
+        print(f"[Lexarithmos Error]: {error}", file=sys.stderr)
+
+        return 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import argparse
+
+from typing import List, Optional
+
+from storage.sqlite_number_repository import SqliteNumberRepository
+from config.paths import NUMBER_DATABASE_PATH, NUMBER_FILE_PATH
+from core.exceptions import LexarithmosError
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Migrates the JSON number file into the SQLite store.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Copies the JSON number file into an SQLite database."
+    )
+    parser.add_argument("--source", default=str(NUMBER_FILE_PATH))
+    parser.add_argument("--database", default=str(NUMBER_DATABASE_PATH))
+
+    arguments = parser.parse_args(argv)
+
+    try:
+
+        repository = SqliteNumberRepository(arguments.database)
+        imported = repository.migrate_from_json(arguments.source)
+        repository.close()
+
+    except LexarithmosError as error:
+
+        print(f"[Lexarithmos Error]: {error}")
+        return 1
+
+    print(f"[Message]: Imported {imported} phrases into '{arguments.database}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
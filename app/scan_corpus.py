@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import sys
+
+from typing import List, Optional
+
+from services.corpus_scanner import CorpusScanner
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Scans a text corpus and prints the value of every line.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Computes the values of every line of a corpus in parallel."
+    )
+    parser.add_argument("source", help="The corpus file.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=4 * 1024 * 1024, help="Chunk size in bytes.")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--target", type=int, action="append", help="Keep only this value (repeatable).")
+    parser.add_argument("--grouped", action="store_true", help="Print one value to phrases map.")
+
+    arguments = parser.parse_args(argv)
+
+    scanner = CorpusScanner(
+        workers=arguments.workers,
+        chunk_size=arguments.chunk_size,
+        encoding=arguments.encoding,
+        target_values=arguments.target
+    )
+
+    try:
+
+        if arguments.grouped:
+
+            grouped = scanner.scan_grouped(arguments.source)
+            json.dump(grouped, sys.stdout, ensure_ascii=False, indent=4)
+            sys.stdout.write("\n")
+
+        else:
+
+            for value, phrase in scanner.scan(arguments.source):
+                sys.stdout.write(json.dumps({"value": value, "phrase": phrase}, ensure_ascii=False) + "\n")
+
+    except KeyboardInterrupt:
+
+        print("\nScan aborted by the user.", file=sys.stderr)
+        return 130
+
+    except (OSError, UnicodeDecodeError) as error:
+
+        print(f"\n[Lexarithmos Error]: {error}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import argparse
+import asyncio
+import sys
+
+from typing import List, Optional
+
+from app.commands import BACKENDS, repository_factory
+from services.phrase_server import PhraseServer
+from services.phrase_service import PhraseService
+from core.refresh_policy import RefreshPolicy
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Serves the phrase store over newline-delimited JSON.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Serves compute, insert, delete and query requests as JSON lines."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="Serves on a Unix socket instead of TCP.")
+    parser.add_argument("--max-batch", type=int, default=1024, help="Mutations applied per batch.")
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="json",
+        help="The number store: the journaled JSON file or the SQLite database."
+    )
+
+    arguments = parser.parse_args(argv)
+
+    phrase_service = PhraseService(
+        repository_factory=repository_factory(arguments.backend),
+        refresh_policy=RefreshPolicy.DEFERRED
+    )
+
+    server = PhraseServer(phrase_service, max_batch=arguments.max_batch)
+
+    if arguments.unix:
+
+        serving = server.serve_unix(arguments.unix)
+        address = arguments.unix
+
+    else:
+
+        serving = server.serve_tcp(arguments.host, arguments.port)
+        address = f"{arguments.host}:{arguments.port}"
+
+    print(f"[Message]: Serving on {address}.", file=sys.stderr)
+
+    try:
+        asyncio.run(serving)
+
+    except KeyboardInterrupt:
+        print("\n[Message]: Server stopped.", file=sys.stderr)
+
+    except OSError as error:
+
+        print(f"\n[Lexarithmos Error]: {error}", file=sys.stderr)
+        return 1
+
+    finally:
+        server.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
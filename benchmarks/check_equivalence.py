@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import argparse
+import sys
+
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from benchmarks.corpus_generator import CorpusGenerator
+from core.text_normalizer import TextNormalizer
+from core.transformer import Transformer
+
+
+def edge_cases() -> List[str]:
+
+    """
+    Returns texts around every code point the translation
+    table covers, alone and between two Greek words, plus
+    a few uncovered characters that take the slow path.
+    """
+
+    texts: List[str] = []
+
+    for first, last in TextNormalizer.COVERED_RANGES:
+
+        for code_point in range(first, last + 1):
+
+            char = chr(code_point)
+            texts.extend((char, f"λόγος{char}ἀρχή", f"λόγος {char} ἀρχή"))
+
+    texts.extend(("Εν αρχή ην ο λόγος", "ΐ ΰ ᾷ ῗ", "λόγος — ἀρχή", "ⅰ λόγος", "𝛼 ω"))
+
+    return texts
+
+
+def check(
+    name: str,
+    texts: Iterable[str],
+    expected: Callable[[str], object],
+    actual: Callable[[str], object],
+    shown: int = 5
+) -> int:
+
+    """
+    Compares two implementations over the texts,
+    printing the first few mismatches.
+
+    :return: The number of mismatching texts.
+    """
+
+    mismatches: List[Tuple[str, object, object]] = []
+    checked = 0
+
+    for text in texts:
+
+        checked += 1
+        old, new = expected(text), actual(text)
+
+        if old != new:
+            mismatches.append((text, old, new))
+
+    print(f"{name:<28}{checked:>10} texts{len(mismatches):>8} mismatches", file=sys.stderr)
+
+    for text, old, new in mismatches[:shown]:
+        print(f"    {text!r}: expected {old!r}, got {new!r}", file=sys.stderr)
+
+    return len(mismatches)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Checks the translation table normalization, the
+    token cache and the word cache against the plain
+    paths over a generated corpus.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code, 1 if any output differs.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Checks that the optimized text paths match the original ones."
+    )
+    parser.add_argument("scale", nargs="?", default="100k", choices=sorted(CorpusGenerator.SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+
+    arguments = parser.parse_args(argv)
+
+    phrases = list(CorpusGenerator(arguments.seed).phrases(CorpusGenerator.SCALES[arguments.scale]))
+    texts = phrases + edge_cases()
+
+    normalizer = TextNormalizer()
+    cached = Transformer(cache_tokens=True)
+    uncached = Transformer(word_cache_capacity=0)
+
+    mismatches = check(
+        "translate vs NFD", texts,
+        lambda text: TextNormalizer._normalize_text(text).split(),
+        normalizer.normalize
+    )
+    mismatches += check(
+        "token cache vs whole text", texts + texts,
+        normalizer.normalize,
+        cached.normalize
+    )
+    mismatches += check(
+        "cached vs uncached value", texts + texts,
+        lambda text: uncached.analyze_message(text).total_value,
+        lambda text: cached.analyze_message(text).total_value
+    )
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
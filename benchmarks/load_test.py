@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from typing import Any, Dict, List, Optional
+
+from benchmarks.corpus_generator import CorpusGenerator
+from core.instrumentation import Metrics
+
+
+class LoadTestClient:
+
+    """
+    Drives a running phrase server with many concurrent
+    connections and measures throughput and latency.
+
+    Reads are a mix of computations, phrase lookups and
+    numeric queries. A share of the requests can be
+    inserts of synthetic phrases, which stay stored.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_path: Optional[str] = None,
+        connections: int = 16,
+        requests: int = 10_000,
+        write_ratio: float = 0.0,
+        seed: int = 0
+    ) -> None:
+
+        """
+        Initializes the load test.
+
+        :param host: The server host.
+        :param port: The server port.
+        :param unix_path: The server's Unix socket, used instead of TCP.
+        :param connections: The number of concurrent connections.
+        :param requests: The total number of requests.
+        :param write_ratio: The share of requests that are inserts.
+        :param seed: The seed of the phrases and the request mix.
+        """
+
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.connections = connections
+        self.requests = requests
+        self.write_ratio = write_ratio
+        self.seed = seed
+
+        self.metrics = Metrics(enabled=True, max_samples=requests)
+        self.errors = 0
+
+    async def run(self) -> Dict[str, Any]:
+
+        """
+        Sends every request and aggregates the results.
+
+        :return: The throughput, error count and latency percentiles.
+        """
+
+        phrases = list(CorpusGenerator(self.seed).phrases(self.requests))
+        randomizer = random.Random(self.seed)
+
+        requests = [
+            self._build_request(index, phrase, randomizer)
+            for index, phrase in enumerate(phrases)
+        ]
+
+        started = time.perf_counter()
+
+        await asyncio.gather(*(
+            self._run_connection(requests[offset::self.connections])
+            for offset in range(self.connections)
+        ))
+
+        seconds = time.perf_counter() - started
+        spans = self.metrics.report()["spans"]
+
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "write_ratio": self.write_ratio,
+            "errors": self.errors,
+            "seconds": round(seconds, 3),
+            "requests_per_second": round(self.requests / seconds, 1),
+            "latency": spans.pop("request"),
+            "operations": spans
+        }
+
+    async def _run_connection(self, requests: List[Dict[str, Any]]) -> None:
+
+        """
+        Sends requests one after another on one connection.
+        """
+
+        if self.unix_path:
+            reader, writer = await asyncio.open_unix_connection(self.unix_path)
+
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        try:
+
+            for request in requests:
+
+                started = time.perf_counter()
+
+                writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+
+                response = json.loads(await reader.readline())
+                latency = time.perf_counter() - started
+
+                self.metrics.record("request", latency)
+                self.metrics.record(request["op"], latency)
+
+                if not response.get("ok"):
+                    self.errors += 1
+
+        finally:
+
+            writer.close()
+            await writer.wait_closed()
+
+    def _build_request(self, index: int, phrase: str, randomizer: random.Random) -> Dict[str, Any]:
+
+        """
+        Builds one request of the mix.
+        """
+
+        if randomizer.random() < self.write_ratio:
+            return {"id": index, "op": "insert", "phrase": phrase}
+
+        kind = index % 4
+
+        if kind == 0:
+            return {"id": index, "op": "compute", "phrase": phrase}
+
+        if kind == 1:
+            return {"id": index, "op": "find", "phrase": phrase}
+
+        if kind == 2:
+            return {"id": index, "op": "query", "by": "nearest", "number": randomizer.randrange(10_000)}
+
+        return {"id": index, "op": "query", "by": "root", "root": randomizer.randrange(1, 10)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Load-tests a running phrase server.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code, 1 if any request failed.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Measures the throughput and latency of a running phrase server."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="Connects to a Unix socket instead of TCP.")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="Share of inserts, which stay stored.")
+    parser.add_argument("--seed", type=int, default=0)
+
+    arguments = parser.parse_args(argv)
+
+    client = LoadTestClient(
+        host=arguments.host,
+        port=arguments.port,
+        unix_path=arguments.unix,
+        connections=arguments.connections,
+        requests=arguments.requests,
+        write_ratio=arguments.write_ratio,
+        seed=arguments.seed
+    )
+
+    try:
+        results = asyncio.run(client.run())
+
+    except OSError as error:
+
+        print(f"[Lexarithmos Error]: {error}", file=sys.stderr)
+        return 1
+
+    json.dump(results, sys.stdout, indent=4)
+    sys.stdout.write("\n")
+
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from benchmarks.corpus_generator import CorpusGenerator
+from core.actions import Action
+from core.transformer import Transformer
+from storage.number_repository import NumberRepository
+from analysis.pipeline.analysis_pipeline import AnalysisPipeline
+from analysis.permutation_analyzer import PermutationAnalyzer
+from analysis.anagram_analyzer import AnagramAnalyzer
+from services.phrase_service import PhraseService
+from config.paths import PROJECT_ROOT
+
+T = TypeVar("T")
+
+STARTUP_SCRIPT = """
+import io, sys, time
+started = time.perf_counter()
+from app.main import main
+imported = time.perf_counter()
+stdout, sys.stdout = sys.stdout, io.TextIOWrapper(io.BytesIO())
+main(["compute", "Εν αρχή ην ο λόγος"])
+finished = time.perf_counter()
+sys.stdout = stdout
+print(imported - started, finished - started)
+"""
+
+
+class BenchmarkSuite:
+
+    """
+    Times each processing stage, and the end-to-end
+    insert and refresh path, over a synthetic corpus.
+
+    Storage and analyzer files are written to a
+    temporary directory, never to the data folder.
+
+    Cold start is timed in fresh interpreters: the
+    import of app.main plus one 'compute' command,
+    which must not load the store or the analyzers.
+    """
+
+    def __init__(
+        self,
+        scale: str = "1k",
+        seed: int = 0,
+        insert_sample: int = 10_000,
+        plain_insert_sample: int = 100,
+        refresh_sample: int = 50,
+        startup_runs: int = 10
+    ) -> None:
+
+        """
+        Initializes the benchmark suite.
+
+        :param scale: The corpus scale, one of CorpusGenerator.SCALES.
+        :param seed: The corpus seed.
+        :param insert_sample: The number of single inserts to time.
+        :param plain_insert_sample: The number of single inserts timed without a journal.
+        :param refresh_sample: The number of end-to-end inserts to time.
+        :param startup_runs: The number of fresh interpreters timed for cold start.
+        """
+
+        self.scale = scale
+        self.count = CorpusGenerator.SCALES[scale]
+        self.seed = seed
+        self.insert_sample = min(insert_sample, self.count)
+        self.plain_insert_sample = min(plain_insert_sample, self.insert_sample)
+        self.refresh_sample = min(refresh_sample, self.count)
+        self.startup_runs = startup_runs
+
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def run(self) -> Dict[str, Any]:
+
+        """
+        Runs every benchmark stage.
+
+        :return: The machine-readable benchmark results.
+        """
+
+        if self.startup_runs:
+            self._time_startup()
+
+        transformer = Transformer()
+        normalizer = transformer.normalizer
+        calculator = transformer.calculator
+        reducer = transformer.reducer
+
+        phrases = self._time(
+            "generate", self.count,
+            lambda: list(CorpusGenerator(self.seed).phrases(self.count))
+        )
+        words = self._time(
+            "normalize", self.count,
+            lambda: [normalizer.normalize(phrase) for phrase in phrases]
+        )
+        values = self._time(
+            "calculate", self.count,
+            lambda: [calculator.calculate_phrase_value(phrase_words) for phrase_words in words]
+        )
+
+        joined = ["".join(phrase_words) for phrase_words in words]
+
+        self._time("calculate_many", self.count, lambda: calculator.calculate_many(joined))
+        self._time("reduce", self.count, lambda: [reducer.reduce(value) for value in values])
+        self._time("reduce_many", self.count, lambda: reducer.reduce_many(values))
+        self._time(
+            "analyze_message", self.count,
+            lambda: [transformer.analyze_message(phrase) for phrase in phrases]
+        )
+
+        streamed = self._time(
+            "analyze_stream", self.count,
+            lambda: list(transformer.analyze_stream(phrases, batch_size=10_000))
+        )
+
+        with TemporaryDirectory() as directory:
+
+            self._run_storage_stages(Path(directory), transformer, streamed)
+
+        return {
+            "scale": self.scale,
+            "phrases": self.count,
+            "seed": self.seed,
+            "python": platform.python_version(),
+            "numpy": calculator.code_point_table is not None,
+            "stages": self.stages
+        }
+
+    def _run_storage_stages(
+        self,
+        directory: Path,
+        transformer: Transformer,
+        streamed: List[Any]
+    ) -> None:
+
+        """
+        Times the repository, analyzer and end-to-end stages.
+        """
+
+        repository = NumberRepository(directory / "number_file.json", use_snapshot=False)
+        self._time(
+            "repository_insert_many", len(streamed), lambda: repository.insert_many(streamed)
+        )
+
+        self._time(
+            "repository_load", len(streamed),
+            lambda: NumberRepository(directory / "number_file.json", use_snapshot=False)
+        )
+
+        NumberRepository(directory / "number_file.json")
+
+        self._time(
+            "repository_load_snapshot", len(streamed),
+            lambda: NumberRepository(directory / "number_file.json")
+        )
+
+        journaled = NumberRepository(
+            directory / "number_file.json",
+            journal_path=directory / "number_file.journal.jsonl",
+            compaction_threshold=sys.maxsize
+        )
+
+        analyses = [
+            transformer.analyze_message(phrase)
+            for phrase in CorpusGenerator(self.seed + 1).phrases(self.insert_sample)
+        ]
+
+        plain = NumberRepository(
+            directory / "number_file.plain.json", use_snapshot=False
+        )
+        plain.insert_many(streamed)
+
+        self._time(
+            "repository_insert_plain", self.plain_insert_sample,
+            lambda: [
+                plain.insert(analysis) for analysis in analyses[:self.plain_insert_sample]
+            ]
+        )
+
+        self._time(
+            "repository_insert", len(analyses),
+            lambda: [journaled.insert(analysis) for analysis in analyses]
+        )
+
+        number_data = journaled.get_all()
+
+        self._time(
+            "permutation_analyze", len(number_data),
+            lambda: PermutationAnalyzer(
+                directory / "permutations_file.json"
+            ).analyze(number_data)
+        )
+        self._time(
+            "anagram_analyze", len(number_data),
+            lambda: AnagramAnalyzer(directory / "anagrams_file.json").analyze(number_data)
+        )
+
+        pipeline = AnalysisPipeline()
+        pipeline.register(PermutationAnalyzer(directory / "permutations_file.json"))
+        pipeline.register(AnagramAnalyzer(directory / "anagrams_file.json"))
+
+        service = PhraseService(
+            transformer=transformer,
+            number_repository=journaled,
+            analysis_pipeline=pipeline
+        )
+
+        self._time("rebuild_analyzers", len(number_data), service.rebuild_analyzers)
+
+        sample = list(CorpusGenerator(self.seed + 2).phrases(self.refresh_sample))
+
+        self._time(
+            "insert_and_refresh", len(sample),
+            lambda: [service.process(phrase, Action.INSERT) for phrase in sample]
+        )
+
+        pipeline.close()
+
+    def _time_startup(self) -> None:
+
+        """
+        Times the import of app.main and one 'compute'
+        command in fresh interpreters, recording the
+        median over the runs.
+        """
+
+        imports: List[float] = []
+        startups: List[float] = []
+
+        for _ in range(self.startup_runs):
+
+            completed = subprocess.run(
+                [sys.executable, "-c", STARTUP_SCRIPT],
+                cwd=PROJECT_ROOT,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+
+            imported, started = map(float, completed.stdout.split())
+            imports.append(imported)
+            startups.append(started)
+
+        for name, durations in (("startup_import", imports), ("startup", startups)):
+
+            seconds = statistics.median(durations)
+
+            self.stages[name] = {
+                "items": 1,
+                "seconds": round(seconds, 6),
+                "per_item_us": round(seconds * 1_000_000, 3)
+            }
+
+            print(f"{name:<24}{seconds:>10.3f} s", file=sys.stderr)
+
+    def _time(self, name: str, items: int, stage: Callable[[], T]) -> T:
+
+        """
+        Runs and times one stage, recording its
+        duration and its cost per item.
+        """
+
+        started = time.perf_counter()
+        result = stage()
+        seconds = time.perf_counter() - started
+
+        self.stages[name] = {
+            "items": items,
+            "seconds": round(seconds, 6),
+            "per_item_us": round(seconds / max(items, 1) * 1_000_000, 3)
+        }
+
+        print(f"{name:<24}{seconds:>10.3f} s", file=sys.stderr)
+
+        return result
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> List[str]:
+
+    """
+    Compares results against a baseline, stage by stage.
+
+    Stages are compared by their cost per item, so a
+    baseline of another scale still gives a rough guide.
+
+    :param results: The current benchmark results.
+    :param baseline: The saved baseline results.
+    :param tolerance: The allowed slowdown, e.g. 0.25 for 25%.
+    :return: The names of the stages that regressed.
+    """
+
+    regressions: List[str] = []
+
+    if baseline.get("scale") != results.get("scale"):
+        print(
+            f"Warning: comparing scale {results.get('scale')} "
+            f"against a {baseline.get('scale')} baseline.",
+            file=sys.stderr
+        )
+
+    print(f"\n{'stage':<24}{'baseline us':>14}{'current us':>14}{'ratio':>9}", file=sys.stderr)
+
+    for name, stage in results["stages"].items():
+
+        reference = baseline.get("stages", {}).get(name)
+
+        if not reference or not reference.get("per_item_us"):
+            continue
+
+        ratio = stage["per_item_us"] / reference["per_item_us"]
+        marker = "  <- slower" if ratio > 1 + tolerance else ""
+
+        if marker:
+            regressions.append(name)
+
+        print(
+            f"{name:<24}{reference['per_item_us']:>14.3f}"
+            f"{stage['per_item_us']:>14.3f}{ratio:>9.2f}{marker}",
+            file=sys.stderr
+        )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    """
+    Runs the benchmark suite and optionally compares
+    it against a saved baseline.
+
+    :param argv: The command-line arguments.
+    :return: The process exit code, 1 if any stage regressed or startup is over a given budget.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks every processing stage over a synthetic Greek corpus."
+    )
+    parser.add_argument(
+        "scale", nargs="?", default="1k", choices=sorted(CorpusGenerator.SCALES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--insert-sample", type=int, default=10_000, help="Single inserts to time."
+    )
+    parser.add_argument(
+        "--plain-insert-sample", type=int, default=100,
+        help="Single inserts to time without a journal, each rewriting the number file."
+    )
+    parser.add_argument(
+        "--refresh-sample", type=int, default=50, help="End-to-end inserts to time."
+    )
+    parser.add_argument(
+        "--startup-runs", type=int, default=10, help="Fresh interpreters timed for cold start."
+    )
+    parser.add_argument(
+        "--startup-budget-ms", type=float,
+        help="Fails the run when the median import and first computation take longer."
+    )
+    parser.add_argument("--output", help="Writes the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compares the results with this JSON file.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed slowdown ratio."
+    )
+
+    arguments = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(
+        scale=arguments.scale,
+        seed=arguments.seed,
+        insert_sample=arguments.insert_sample,
+        plain_insert_sample=arguments.plain_insert_sample,
+        refresh_sample=arguments.refresh_sample,
+        startup_runs=arguments.startup_runs
+    )
+
+    results = suite.run()
+
+    if arguments.output:
+
+        with open(arguments.output, "w", encoding="utf-8") as file:
+
+            json.dump(results, file, indent=4)
+            file.write("\n")
+
+    else:
+
+        json.dump(results, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+
+    status = 0
+    startup = results["stages"].get("startup")
+
+    if (
+        startup and arguments.startup_budget_ms is not None
+        and startup["seconds"] * 1000 > arguments.startup_budget_ms
+    ):
+
+        print(
+            f"Startup took {startup['seconds'] * 1000:.1f} ms, "
+            f"over the {arguments.startup_budget_ms:.1f} ms budget.",
+            file=sys.stderr
+        )
+        status = 1
+
+    if not arguments.baseline:
+        return status
+
+    with open(arguments.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    regressions = compare(results, baseline, arguments.tolerance)
+
+    if regressions:
+
+        print(f"\nRegressed stages: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,4 +5,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
 
 NUMBER_FILE_PATH = DATA_DIR / "number_file.json"
+NUMBER_JOURNAL_PATH = DATA_DIR / "number_file.journal.jsonl"
+NUMBER_DATABASE_PATH = DATA_DIR / "number_store.sqlite3"
+NUMBER_INDEX_PATH = DATA_DIR / "number_store.index"
 PERMUTATIONS_FILE_PATH = DATA_DIR / "permutations_file.json"
+ANAGRAMS_FILE_PATH = DATA_DIR / "anagrams_file.json"
+ANALYSIS_MANIFEST_PATH = DATA_DIR / "analysis_manifest.json"
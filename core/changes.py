@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from enum import Enum
+
+
+class ChangeKind(Enum):
+
+    """
+    Represents the kinds of mutations that
+    the number store reports to its analyzers.
+
+    PHRASE_EXISTS reports an insert of a phrase
+    that was already stored, which changes nothing.
+    """
+
+    KEY_ADDED = "key_added"
+    KEY_EMPTIED = "key_emptied"
+    PHRASE_ADDED = "phrase_added"
+    PHRASE_REMOVED = "phrase_removed"
+    PHRASE_EXISTS = "phrase_exists"
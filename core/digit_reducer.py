@@ -1,15 +1,86 @@
 # -*- coding: utf-8 -*-
-from typing import List
+from typing import Iterable, List, Optional, Sequence
+
+from core.optional_imports import load_numpy
 
 
 class DigitReducer:
 
     """
     Produces digit-sum subdivisions for numbers.
+
+    Digit sums are computed arithmetically. An optional
+    table holds the digit sum of every value up to a
+    limit, such as the largest stored key, so chains of
+    values inside it are followed with one lookup per
+    step, and whole batches are reduced in vectorized
+    passes when numpy is available.
     """
 
-    @staticmethod
-    def reduce(number: int) -> List[int]:
+    MAX_BATCH_VALUE = 1 << 62
+    MAX_TABLE_VALUE = 1 << 20
+
+    def __init__(self, table_limit: int = 0) -> None:
+
+        """
+        Initializes the reducer.
+
+        :param table_limit: The largest value in the digit-sum table, 0 for no table.
+        """
+
+        self.sum_table: Optional[List[int]] = None
+        self.sum_array = None
+
+        if table_limit > 0:
+            self.build_table(table_limit)
+
+    def build_table(self, max_value: int) -> None:
+
+        """
+        Precomputes the digit sum of every value up to max_value.
+
+        Each decade is derived from the previous one, since
+        the digit sum of n is that of n // 10 plus n % 10.
+        The table stops at MAX_TABLE_VALUE, and a table that
+        already reaches the limit is kept.
+
+        :param max_value: The largest value in the table, e.g. the largest stored key.
+        """
+
+        size = min(max(max_value, 9), self.MAX_TABLE_VALUE) + 1
+
+        if self.sum_table is not None and len(self.sum_table) >= size:
+            return
+
+        numpy = load_numpy()
+
+        if numpy is None:
+
+            table = list(range(10)) + [0] * (size - 10)
+
+            for value in range(10, size):
+                table[value] = table[value // 10] + value % 10
+
+            self.sum_table = table
+            return
+
+        array = numpy.zeros(size, dtype=numpy.int64)
+        array[:10] = numpy.arange(10)
+
+        start = 10
+
+        while start < size:
+
+            end = min(start * 10, size)
+            values = numpy.arange(start, end)
+
+            array[start:end] = array[values // 10] + values % 10
+            start = end
+
+        self.sum_array = array
+        self.sum_table = array.tolist()
+
+    def reduce(self, number: int) -> List[int]:
 
         """
         Repeatedly sums the digits of a number
@@ -17,10 +88,114 @@ class DigitReducer:
         """
 
         subdivisions = [number]
+        table = self.sum_table
 
         while number >= 10:
 
-            number = sum(int(digit) for digit in str(number))
+            if table is not None and number < len(table):
+                number = table[number]
+
+            else:
+                number = self.digit_sum(number)
+
             subdivisions.append(number)
 
         return subdivisions
+
+    def reduce_many(self, values: Iterable[int]) -> List[List[int]]:
+
+        """
+        Reduces many numbers at once.
+
+        Batches inside the digit-sum table follow it value
+        by value. Otherwise, with numpy, each reduction step
+        runs over the whole batch in one vectorized pass.
+        The results are identical to calling reduce on
+        each value.
+
+        :param values: The numbers, e.g. a list or numpy array of values.
+        :return: The subdivisions of each number, in input order.
+        """
+
+        numpy = load_numpy()
+
+        if numpy is None:
+            return [self.reduce(int(value)) for value in values]
+
+        if not isinstance(values, (Sequence, numpy.ndarray)):
+            values = list(values)
+
+        current = numpy.asarray(values)
+
+        if current.size == 0:
+            return []
+
+        if current.dtype.kind not in "iu":
+            return [self.reduce(int(value)) for value in current.tolist()]
+
+        largest = int(current.max())
+
+        if largest >= self.MAX_BATCH_VALUE or (
+            self.sum_table is not None and largest < len(self.sum_table)
+        ):
+            return [self.reduce(value) for value in current.tolist()]
+
+        current = current.astype(numpy.int64)
+
+        steps = [current.tolist()]
+        lengths = numpy.ones(current.size, dtype=numpy.int64)
+
+        while True:
+
+            active = current >= 10
+
+            if not active.any():
+                break
+
+            lengths += active
+
+            current = current.copy()
+            current[active] = self._digit_sums(current[active])
+            steps.append(current.tolist())
+
+        return [
+            list(row[:length])
+            for row, length in zip(zip(*steps), lengths.tolist())
+        ]
+
+    @staticmethod
+    def digit_sum(number: int) -> int:
+
+        """
+        Returns the sum of the decimal digits of a non-negative number.
+        """
+
+        total = 0
+
+        while number:
+
+            number, digit = divmod(number, 10)
+            total += digit
+
+        return total
+
+    def _digit_sums(self, values):
+
+        """
+        Returns the digit sums of a numpy array of
+        non-negative values, through the table when
+        it covers them.
+        """
+
+        if self.sum_array is not None and int(values.max()) < self.sum_array.size:
+            return self.sum_array[values]
+
+        totals = load_numpy().zeros_like(values)
+        remaining = values.copy()
+
+        while remaining.any():
+
+            totals += remaining % 10
+            remaining //= 10
+
+        return totals
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+import functools
+import json
+import time
+
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Span:
+
+    """
+    Times the block it wraps and records the
+    duration under a span name.
+    """
+
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics: "Metrics", name: str) -> None:
+
+        self.metrics = metrics
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> "_Span":
+
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+
+        self.metrics.record(self.name, time.perf_counter() - self.started)
+
+
+class _NullSpan:
+
+    """
+    A span that does nothing, used while
+    instrumentation is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+
+    """
+    Collects timing spans and counters for the hot
+    paths of the application.
+
+    Instrumentation is disabled by default. While
+    disabled, spans are a shared no-op and counters
+    return at once, so instrumented code pays one
+    attribute check per call.
+
+    Each span keeps its call count and total time, and
+    the most recent durations for the percentiles.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, enabled: bool = False, max_samples: int = 10000) -> None:
+
+        """
+        Initializes empty metrics.
+
+        :param enabled: Whether spans and counters are recorded.
+        :param max_samples: The number of recent durations kept per span.
+        """
+
+        self.enabled = enabled
+        self.max_samples = max_samples
+
+        self.samples: Dict[str, Deque[float]] = {}
+        self.calls: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def enable(self) -> None:
+
+        """
+        Starts recording spans and counters.
+        """
+
+        self.enabled = True
+
+    def disable(self) -> None:
+
+        """
+        Stops recording spans and counters.
+        """
+
+        self.enabled = False
+
+    def reset(self) -> None:
+
+        """
+        Discards everything recorded so far.
+        """
+
+        self.samples.clear()
+        self.calls.clear()
+        self.totals.clear()
+        self.counters.clear()
+
+    def span(self, name: str) -> _Span | _NullSpan:
+
+        """
+        Returns a context manager timing a block.
+
+        :param name: The span name, e.g. 'repository.insert'.
+        :return: The span, or a no-op while disabled.
+        """
+
+        if not self.enabled:
+            return _NULL_SPAN
+
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+
+        """
+        Records one duration under a span name.
+
+        :param name: The span name.
+        :param seconds: The measured duration.
+        """
+
+        if not self.enabled:
+            return
+
+        samples = self.samples.get(name)
+
+        if samples is None:
+            samples = self.samples.setdefault(name, deque(maxlen=self.max_samples))
+
+        samples.append(seconds)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+
+        """
+        Adds to a counter.
+
+        :param name: The counter name, e.g. 'json.save.bytes'.
+        :param amount: The amount to add.
+        """
+
+        if not self.enabled:
+            return
+
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> Dict[str, Any]:
+
+        """
+        Aggregates the spans into call counts, totals
+        and percentiles, in milliseconds.
+
+        :return: The spans and counters, keyed by name.
+        """
+
+        spans: Dict[str, Dict[str, float]] = {}
+
+        for name in sorted(self.samples):
+
+            ordered = sorted(self.samples[name])
+            calls = self.calls[name]
+
+            entry = {
+                "calls": calls,
+                "total_ms": round(self.totals[name] * 1000, 3),
+                "mean_ms": round(self.totals[name] / calls * 1000, 3)
+            }
+
+            for percentile in self.PERCENTILES:
+                entry[f"p{percentile}_ms"] = round(
+                    self._percentile(ordered, percentile) * 1000, 3
+                )
+
+            entry["max_ms"] = round(ordered[-1] * 1000, 3)
+            spans[name] = entry
+
+        return {
+            "spans": spans,
+            "counters": dict(sorted(self.counters.items()))
+        }
+
+    def format_report(self) -> str:
+
+        """
+        Formats the report as a plain text table.
+
+        :return: The report, one span or counter per line.
+        """
+
+        report = self.report()
+
+        if not report["spans"] and not report["counters"]:
+            return "No metrics recorded."
+
+        columns = ["calls", "total_ms", "mean_ms"] + [
+            f"p{percentile}_ms" for percentile in self.PERCENTILES
+        ] + ["max_ms"]
+
+        lines: List[str] = [
+            f"{'span':<36}" + "".join(f"{column:>11}" for column in columns)
+        ]
+
+        for name, entry in report["spans"].items():
+            lines.append(
+                f"{name:<36}{entry['calls']:>11}"
+                + "".join(f"{entry[column]:>11.3f}" for column in columns[1:])
+            )
+
+        if report["counters"]:
+
+            lines.append("")
+            lines.append(f"{'counter':<36}{'value':>11}")
+
+            for name, value in report["counters"].items():
+                lines.append(f"{name:<36}{value:>11}")
+
+        return "\n".join(lines)
+
+    def dump(self, file_path: str | Path) -> None:
+
+        """
+        Writes the report to a JSON file.
+
+        :param file_path: The output file path.
+        """
+
+        with Path(file_path).open("w", encoding="utf-8") as file:
+
+            json.dump(self.report(), file, indent=4)
+            file.write("\n")
+
+    @staticmethod
+    def _percentile(ordered: List[float], percentile: int) -> float:
+
+        """
+        Returns a nearest-rank percentile of sorted values.
+        """
+
+        rank = max(0, -(-percentile * len(ordered) // 100) - 1)
+
+        return ordered[rank]
+
+
+METRICS = Metrics()
+
+
+def instrumented(name: str, metrics: Optional[Metrics] = None) -> Callable[[F], F]:
+
+    """
+    Decorates a function to record its duration as a span.
+
+    :param name: The span name.
+    :param metrics: The metrics to record into, the shared METRICS by default.
+    :return: The decorator.
+    """
+
+    target = metrics or METRICS
+
+    def decorator(function: F) -> F:
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+
+            if not target.enabled:
+                return function(*args, **kwargs)
+
+            started = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+
+            finally:
+                target.record(name, time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.optional_imports import load_numpy
 
 
 class LexarithmosCalculator:
@@ -20,6 +22,34 @@ class LexarithmosCalculator:
         "Χ": 600, "Ψ": 700, "Ω": 800
     }
 
+    TEXT_SEPARATOR = "\x00"
+
+    def __init__(self) -> None:
+
+        """
+        Initializes the calculator. The dense code point
+        lookup table of the batch calculation path is
+        built, and numpy imported, on first use.
+        """
+
+        self._code_point_table: Optional[Any] = None
+        self._table_built = False
+
+    @property
+    def code_point_table(self) -> Optional[Any]:
+
+        """
+        Returns the code point lookup table,
+        or None when numpy is not installed.
+        """
+
+        if not self._table_built:
+
+            self._code_point_table = self._build_code_point_table()
+            self._table_built = True
+
+        return self._code_point_table
+
     def calculate_phrase_value(self, words: List[str]) -> int:
 
         """
@@ -39,3 +69,72 @@ class LexarithmosCalculator:
             for char in word
             if char in self.LETTER_TO_VALUE
         )
+
+    def calculate_many(self, texts: Sequence[str]) -> Sequence[int]:
+
+        """
+        Calculates the values of many normalized words or phrases.
+
+        All texts are joined by a NUL separator into one code
+        point buffer, mapped through a dense lookup table
+        (non-Greek code points map to 0) and reduced with
+        segment sums starting at each separator. The results
+        equal calculate_word_value for every text. Without
+        NumPy, or for texts containing NUL, the scalar path
+        is used instead.
+
+        :param texts: The normalized words or phrases.
+        :return: An int array with one value per text.
+        """
+
+        table = self.code_point_table
+
+        if table is None:
+            return [self.calculate_word_value(text) for text in texts]
+
+        numpy = load_numpy()
+
+        if not texts:
+            return numpy.zeros(0, dtype=numpy.int64)
+
+        buffer = self.TEXT_SEPARATOR.join(texts).encode("utf-32-le")
+        code_points = numpy.frombuffer(buffer, dtype=numpy.uint32)
+
+        if not len(code_points):
+            return numpy.zeros(len(texts), dtype=numpy.int64)
+
+        letter_values = numpy.take(table, code_points, mode="clip")
+
+        separators = numpy.flatnonzero(code_points == ord(self.TEXT_SEPARATOR))
+
+        if len(separators) != len(texts) - 1:
+            return numpy.array(
+                [self.calculate_word_value(text) for text in texts], dtype=numpy.int64
+            )
+
+        starts = numpy.zeros(len(texts), dtype=numpy.int64)
+        starts[1:] = separators
+
+        return numpy.add.reduceat(letter_values, starts, dtype=numpy.int64)
+
+    @classmethod
+    def _build_code_point_table(cls):
+
+        """
+        Builds a code point to value array. Its trailing
+        zero slot absorbs the out-of-range code points,
+        which the lookup clips to the last index.
+        """
+
+        numpy = load_numpy()
+
+        if numpy is None:
+            return None
+
+        highest = max(ord(letter) for letter in cls.LETTER_TO_VALUE)
+        table = numpy.zeros(highest + 2, dtype=numpy.int32)
+
+        for letter, value in cls.LETTER_TO_VALUE.items():
+            table[ord(letter)] = value
+
+        return table
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+
+    """
+    A size-bounded least recently used cache
+    with hit, miss and eviction counters.
+    """
+
+    def __init__(self, capacity: int) -> None:
+
+        """
+        Initializes an empty cache.
+
+        :param capacity: The maximum number of entries, 0 to disable caching.
+        """
+
+        if capacity < 0:
+            raise ValueError("Cache capacity cannot be negative.")
+
+        self.capacity = capacity
+        self.entries: OrderedDict[K, V] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+
+        """
+        Returns a cached value and marks it as recently used.
+
+        :param key: The cache key.
+        :return: The cached value, or None on a miss.
+        """
+
+        value = self.entries.get(key)
+
+        if value is None:
+
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def put(self, key: K, value: V) -> None:
+
+        """
+        Stores a value, evicting the least recently
+        used entry once the cache is full.
+
+        :param key: The cache key.
+        :param value: The value to cache, never None.
+        """
+
+        if self.capacity == 0:
+            return
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        if len(self.entries) > self.capacity:
+
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+
+        """
+        Removes every entry and resets the counters.
+        """
+
+        self.entries.clear()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+
+        """
+        Returns the cache size and counters.
+        """
+
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def __len__(self) -> int:
+
+        return len(self.entries)
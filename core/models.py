@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from core.actions import Action
+from core.changes import ChangeKind
 
 
 @dataclass(frozen=True)
@@ -31,3 +32,52 @@ class PhraseResult:
     action: Action
     success: bool
     message: str
+
+
+@dataclass(frozen=True)
+class StoreChange:
+
+    """
+    Represents one mutation of the number
+    store, reported to the analyzers.
+    """
+
+    kind: ChangeKind
+    key: str
+    phrase: str
+
+
+@dataclass(frozen=True, slots=True)
+class PhraseValue:
+
+    """
+    Represents the lightweight lexarithmic
+    result of a streamed phrase.
+    """
+
+    original_text: str
+    total_value: int
+    subdivisions: List[int]
+
+
+@dataclass(frozen=True)
+class AnalyzerRun:
+
+    """
+    Represents the timing and outcome of one
+    analyzer during a pipeline run.
+    """
+
+    name: str
+    duration: float
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+
+        """
+        Returns whether the analyzer finished without errors.
+        """
+
+        return self.error is None
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+from typing import Any, Optional
+
+
+@lru_cache(maxsize=None)
+def load_numpy() -> Optional[Any]:
+
+    """
+    Imports numpy on first use.
+
+    Importing numpy costs tens of milliseconds, so it is
+    only imported once a vectorized path actually runs,
+    keeping one-shot commands and scripts fast to start.
+
+    :return: The numpy module, or None if it is not installed.
+    """
+
+    try:
+        import numpy
+
+    except ImportError:
+        return None
+
+    return numpy
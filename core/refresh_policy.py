@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+from enum import Enum
+
+
+class RefreshPolicy(Enum):
+
+    """
+    Represents when analyzers are refreshed
+    after the number store changes.
+
+    DEBOUNCED limits are checked at the next
+    mutation or command, not by a timer.
+    """
+
+    IMMEDIATE = "immediate"
+    DEFERRED = "deferred"
+    DEBOUNCED = "debounced"
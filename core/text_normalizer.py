@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
+import re
 import unicodedata
 
 from string import punctuation
-from typing import List
+from typing import List, Optional
 
 
 class TextNormalizer:
@@ -12,18 +13,80 @@ class TextNormalizer:
     lexarithmic processing.
     """
 
+    COVERED_RANGES = (
+        (0x0000, 0x00FF),
+        (0x0300, 0x03FF),
+        (0x1F00, 0x1FFF)
+    )
+
+    UNCOVERED_PATTERN = re.compile(
+        "[^" + "".join(
+            f"\\U{first:08x}-\\U{last:08x}" for first, last in COVERED_RANGES
+        ) + "]"
+    )
+
+    TRANSLATION_TABLE: List[Optional[str]] = []
+
     def normalize(self, text: str) -> List[str]:
 
         """
         Converts raw text into clean uppercase words.
 
+        Text made only of ASCII, Latin-1, combining marks,
+        Greek and Greek Extended characters is normalized in
+        one str.translate pass. Any other text goes through
+        Unicode decomposition, with identical results.
+
         :param text: The raw input text.
         :return: A list of cleaned uppercase words.
         """
 
-        without_accents = self._remove_accents(text)
-        without_symbols = self._remove_symbols(without_accents)
-        return without_symbols.upper().split()
+        if self.UNCOVERED_PATTERN.search(text) is None:
+            return text.translate(self.TRANSLATION_TABLE).split()
+
+        return self._normalize_text(text).split()
+
+    @classmethod
+    def _build_translation_table(cls) -> List[Optional[str]]:
+
+        """
+        Maps every covered code point to its normalized form.
+
+        Normalization acts on each covered character on its
+        own, so translating a text character by character
+        gives the same result as normalizing it as a whole.
+        Characters that normalize to nothing are deleted.
+
+        The table is a list indexed by code point, which
+        str.translate reads faster than a dict. Code points
+        between the covered ranges map to themselves and are
+        never looked up, as such text takes the slow path.
+        """
+
+        last_code_point = cls.COVERED_RANGES[-1][1]
+        translation_table: List[Optional[str]] = [
+            chr(code_point) for code_point in range(last_code_point + 1)
+        ]
+
+        for first, last in cls.COVERED_RANGES:
+
+            for code_point in range(first, last + 1):
+
+                normalized = cls._normalize_text(chr(code_point))
+                translation_table[code_point] = normalized or None
+
+        return translation_table
+
+    @classmethod
+    def _normalize_text(cls, text: str) -> str:
+
+        """
+        Removes accents and symbols, then uppercases text.
+        """
+
+        without_accents = cls._remove_accents(text)
+        without_symbols = cls._remove_symbols(without_accents)
+        return without_symbols.upper()
 
     @staticmethod
     def _remove_symbols(text: str) -> str:
@@ -49,3 +112,6 @@ class TextNormalizer:
         )
 
         return unicodedata.normalize("NFC", without_accents)
+
+
+TextNormalizer.TRANSLATION_TABLE = TextNormalizer._build_translation_table()
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
-from typing import List
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from core.text_normalizer import TextNormalizer
 from core.lexarithmos_calculator import LexarithmosCalculator
 from core.digit_reducer import DigitReducer
-from core.models import PhraseAnalysis
+from core.lru_cache import LRUCache
+from core.instrumentation import instrumented
+from core.models import PhraseAnalysis, PhraseValue
 
 
 class Transformer:
@@ -12,18 +15,33 @@ class Transformer:
     """
     Coordinates text normalization, lexarithmic
     calculation and digit reduction.
+
+    Word values are memoized in a bounded LRU cache,
+    since a few thousand common words make up most of
+    any real corpus. Raw tokens can also be memoized
+    with their normalized words.
     """
 
-    def __init__(self) -> None:
+    MIN_VECTOR_BATCH = 256
+
+    def __init__(self, word_cache_capacity: int = 65536, cache_tokens: bool = False) -> None:
 
         """
         Initializes the transformer components.
+
+        :param word_cache_capacity: The maximum number of cached words, 0 to disable.
+        :param cache_tokens: Whether raw tokens are cached with their normalized words.
         """
 
         self.normalizer = TextNormalizer()
         self.calculator = LexarithmosCalculator()
         self.reducer = DigitReducer()
 
+        self.word_values: LRUCache[str, int] = LRUCache(word_cache_capacity)
+        self.token_words: Optional[LRUCache[str, Tuple[str, ...]]] = (
+            LRUCache(word_cache_capacity) if cache_tokens else None
+        )
+
     def transform_message(self, text: str) -> List[int]:
 
         """
@@ -36,6 +54,7 @@ class Transformer:
         analysis = self.analyze_message(text)
         return analysis.subdivisions
 
+    @instrumented("transformer.analyze_message")
     def analyze_message(self, text: str) -> PhraseAnalysis:
 
         """
@@ -46,8 +65,8 @@ class Transformer:
         :return: A PhraseAnalysis object.
         """
 
-        normalized_words = self.normalizer.normalize(text)
-        total_value = self.calculator.calculate_phrase_value(normalized_words)
+        normalized_words = self.normalize(text)
+        total_value = self.phrase_value(normalized_words)
         subdivisions = self.reducer.reduce(total_value)
 
         return PhraseAnalysis(
@@ -56,3 +75,191 @@ class Transformer:
             total_value=total_value,
             subdivisions=subdivisions
         )
+
+    def analyze_stream(
+        self,
+        lines: Iterable[str],
+        batch_size: Optional[int] = None
+    ) -> Iterator[PhraseValue]:
+
+        """
+        Lazily analyzes an iterable of phrases, one per line.
+
+        Lines are stripped and blank lines are skipped, so
+        file objects and sys.stdin can be passed directly.
+        With a batch size, lines are gathered into batches
+        whose uncached words go through the calculator's
+        vectorized path together and are then cached;
+        otherwise, or without numpy, each line is calculated
+        on its own through the word cache. Batches smaller
+        than MIN_VECTOR_BATCH also take the per-line path,
+        since the vectorized one only pays for itself, and
+        for importing numpy, on larger batches.
+
+        :param lines: Any iterable of input lines.
+        :param batch_size: The number of lines per calculator batch.
+        :return: An iterator of PhraseValue objects.
+        """
+
+        phrases = (line.strip() for line in lines)
+        phrases = (phrase for phrase in phrases if phrase)
+
+        if not batch_size:
+
+            yield from self._analyze_each(phrases)
+            return
+
+        while batch := list(islice(phrases, batch_size)):
+
+            if len(batch) < self.MIN_VECTOR_BATCH or self.calculator.code_point_table is None:
+
+                yield from self._analyze_each(batch)
+                continue
+
+            values = self._batch_values([self.normalize(phrase) for phrase in batch])
+
+            for phrase, subdivisions in zip(batch, self.reducer.reduce_many(values)):
+
+                yield PhraseValue(
+                    original_text=phrase,
+                    total_value=subdivisions[0],
+                    subdivisions=subdivisions
+                )
+
+    def normalize(self, text: str) -> List[str]:
+
+        """
+        Normalizes a text into words, through the
+        token cache when it is enabled.
+
+        :param text: The original text.
+        :return: The normalized words.
+        """
+
+        if self.token_words is None:
+            return self.normalizer.normalize(text)
+
+        words: List[str] = []
+
+        for token in text.split():
+
+            normalized = self.token_words.get(token)
+
+            if normalized is None:
+
+                normalized = tuple(self.normalizer.normalize(token))
+                self.token_words.put(token, normalized)
+
+            words.extend(normalized)
+
+        return words
+
+    def word_value(self, word: str) -> int:
+
+        """
+        Returns the value of one normalized word,
+        computing it only on a cache miss.
+
+        :param word: The normalized word.
+        :return: The word's value.
+        """
+
+        value = self.word_values.get(word)
+
+        if value is None:
+
+            value = self.calculator.calculate_word_value(word)
+            self.word_values.put(word, value)
+
+        return value
+
+    def phrase_value(self, words: Iterable[str]) -> int:
+
+        """
+        Returns the total value of normalized words.
+
+        :param words: The normalized words.
+        :return: The total value.
+        """
+
+        return sum(self.word_value(word) for word in words)
+
+    def warm_cache(self, phrases: Iterable[str]) -> int:
+
+        """
+        Pre-loads the word cache with the words of known phrases.
+
+        Warming does not count towards the hit and miss counters.
+
+        :param phrases: The phrases whose words are cached.
+        :return: The number of cached words.
+        """
+
+        for phrase in phrases:
+
+            for word in self.normalizer.normalize(phrase):
+
+                if word not in self.word_values.entries:
+                    self.word_values.put(word, self.calculator.calculate_word_value(word))
+
+        return len(self.word_values)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Returns the size and counters of the transformer caches.
+        """
+
+        stats = {"words": self.word_values.stats()}
+
+        if self.token_words is not None:
+            stats["tokens"] = self.token_words.stats()
+
+        return stats
+
+    def _batch_values(self, word_lists: List[List[str]]) -> List[int]:
+
+        """
+        Returns the total value of each word list.
+
+        Each distinct word is looked up in the word cache
+        once per batch, and the missing ones are calculated
+        in one vectorized pass and then cached.
+        """
+
+        values: Dict[str, Optional[int]] = {}
+        missing: List[str] = []
+
+        for words in word_lists:
+
+            for word in words:
+
+                if word not in values:
+
+                    values[word] = self.word_values.get(word)
+
+                    if values[word] is None:
+                        missing.append(word)
+
+        for word, value in zip(missing, self.calculator.calculate_many(missing)):
+
+            values[word] = int(value)
+            self.word_values.put(word, values[word])
+
+        return [sum(values[word] for word in words) for words in word_lists]
+
+    def _analyze_each(self, phrases: Iterable[str]) -> Iterator[PhraseValue]:
+
+        """
+        Analyzes phrases one by one through the word cache.
+        """
+
+        for phrase in phrases:
+
+            total_value = self.phrase_value(self.normalize(phrase))
+
+            yield PhraseValue(
+                original_text=phrase,
+                total_value=total_value,
+                subdivisions=self.reducer.reduce(total_value)
+            )
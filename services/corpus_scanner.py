@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import os
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from core.transformer import Transformer
+
+
+class CorpusScanner:
+
+    """
+    Computes the values of every line of a large
+    text corpus, sharded across worker processes.
+
+    The file is split into byte ranges that end on line
+    boundaries, each range is analyzed in a separate
+    process and the results are streamed back in file
+    order, whatever order the workers finish in.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 4 * 1024 * 1024,
+        encoding: str = "utf-8",
+        target_values: Optional[Iterable[int]] = None
+    ) -> None:
+
+        """
+        Initializes the scanner settings.
+
+        :param workers: The worker process count, defaulting to the CPU count.
+        :param chunk_size: The approximate chunk size in bytes.
+        :param encoding: The corpus encoding, which must be ASCII-compatible.
+        :param target_values: Keep only lines with these values, if given.
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.encoding = encoding
+        self.target_values = frozenset(target_values) if target_values is not None else None
+
+    def split_chunks(self, file_path: str | Path) -> List[Tuple[int, int]]:
+
+        """
+        Splits a file into byte ranges on line boundaries.
+
+        :param file_path: The corpus file path.
+        :return: The (start, end) byte offsets of every chunk.
+        """
+
+        chunks: List[Tuple[int, int]] = []
+
+        with open(file_path, "rb") as file:
+
+            file_size = os.fstat(file.fileno()).st_size
+            start = 0
+
+            while start < file_size:
+
+                file.seek(min(start + self.chunk_size, file_size))
+                file.readline()
+
+                end = min(file.tell(), file_size)
+                chunks.append((start, end))
+                start = end
+
+        return chunks
+
+    def scan(self, file_path: str | Path) -> Iterator[Tuple[int, str]]:
+
+        """
+        Streams the (value, phrase) pairs of a corpus in file order.
+
+        At most two chunks per worker are in flight, so
+        results are yielded while later chunks still run.
+
+        :param file_path: The corpus file path.
+        :return: An iterator of value and phrase pairs.
+        """
+
+        chunks = self.split_chunks(file_path)
+
+        if self.workers == 1:
+
+            for start, end in chunks:
+                yield from _scan_chunk(str(file_path), start, end, self.encoding, self.target_values)
+
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+
+            pending: Deque[Future] = deque()
+            remaining = iter(chunks)
+
+            for start, end in remaining:
+
+                pending.append(executor.submit(
+                    _scan_chunk, str(file_path), start, end, self.encoding, self.target_values
+                ))
+
+                if len(pending) >= 2 * self.workers:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def scan_grouped(self, file_path: str | Path) -> Dict[int, List[str]]:
+
+        """
+        Merges a corpus scan into a value to phrases map.
+
+        Values are sorted and each value's phrases keep
+        their file order, so the result is deterministic.
+
+        :param file_path: The corpus file path.
+        :return: The phrases of the corpus grouped by value.
+        """
+
+        grouped: Dict[int, List[str]] = {}
+
+        for value, phrase in self.scan(file_path):
+            grouped.setdefault(value, []).append(phrase)
+
+        return dict(sorted(grouped.items()))
+
+
+def _scan_chunk(
+    file_path: str,
+    start: int,
+    end: int,
+    encoding: str,
+    target_values: Optional[FrozenSet[int]]
+) -> List[Tuple[int, str]]:
+
+    """
+    Computes the values of the lines in one byte range.
+
+    This runs inside the worker processes, so it is a
+    module-level function that the pool can pickle.
+    """
+
+    with open(file_path, "rb") as file:
+
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+
+    values = Transformer().analyze_stream(text.splitlines(), batch_size=10000)
+
+    return [
+        (value.total_value, value.original_text)
+        for value in values
+        if target_values is None or value.total_value in target_values
+    ]
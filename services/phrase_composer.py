@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+import time
+
+from itertools import combinations, combinations_with_replacement, product
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from core.text_normalizer import TextNormalizer
+
+
+class PhraseComposer:
+
+    """
+    Finds combinations of stored single-word phrases
+    whose values add up to a target number.
+
+    Value combinations are enumerated in non-decreasing
+    order, fewest words first. The last value of each
+    combination is a table lookup, the last two are
+    matched as a pair sum, and deeper levels are pruned
+    with precomputed reachable-sum bitsets. Word
+    combinations are then expanded lazily per value.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Tuple[str, Dict[str, Any]]],
+        normalizer: Optional[TextNormalizer] = None
+    ) -> None:
+
+        """
+        Builds the value to words table.
+
+        :param records: The stored key and record pairs, e.g. a streamed repository.
+        :param normalizer: The normalizer used to detect single words.
+        """
+
+        self.normalizer = normalizer or TextNormalizer()
+        self.value_words: Dict[int, List[Tuple[str, str]]] = {}
+
+        for key, record in records:
+            self._add_record(key, record)
+
+    def update(self, keys: Iterable[str], number_store: Mapping[str, Dict[str, Any]]) -> None:
+
+        """
+        Rebuilds the table entries of changed numbers.
+
+        :param keys: The primary numbers that changed.
+        :param number_store: The stored records, only read for the changed keys.
+        """
+
+        for key in set(keys):
+
+            self.value_words.pop(int(key), None)
+
+            if key in number_store:
+                self._add_record(key, number_store[key])
+
+    def _add_record(self, key: str, record: Dict[str, Any]) -> None:
+
+        """
+        Adds the single-word phrases of one record to the table.
+        """
+
+        value = int(key)
+
+        if value <= 0:
+            return
+
+        for phrase in record.get("key-phrases", []):
+
+            words = self.normalizer.normalize(phrase)
+
+            if len(words) == 1:
+                self.value_words.setdefault(value, []).append((phrase, words[0]))
+
+    def compose(
+        self,
+        target: int,
+        max_words: int = 3,
+        required_values: Iterable[Tuple[str, int]] = (),
+        forbidden_words: Iterable[str] = (),
+        allow_repeats: bool = False,
+        time_limit: Optional[float] = 2.0,
+        max_results: Optional[int] = 100
+    ) -> Iterator[List[str]]:
+
+        """
+        Lazily yields word combinations that total the target.
+
+        :param target: The target value.
+        :param max_words: The maximum number of words, required ones included.
+        :param required_values: (word, value) pairs every combination must contain.
+        :param forbidden_words: Words that must not appear, in any accent or case form.
+        :param allow_repeats: Whether a stored word may appear more than once.
+        :param time_limit: The search budget in seconds, or None for no limit.
+        :param max_results: The maximum number of results, or None for no limit.
+        :return: An iterator of word lists, required words first.
+        """
+
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+        required = list(required_values)
+        remaining = target - sum(value for _, value in required)
+        slots = max_words - len(required)
+
+        if remaining < 0 or slots < 0:
+            return
+
+        required_words = [word for word, _ in required]
+
+        if remaining == 0:
+            yield required_words
+            return
+
+        forbidden = {"".join(self.normalizer.normalize(word)) for word in forbidden_words}
+
+        table = {
+            value: [phrase for phrase, word in entries if word not in forbidden]
+            for value, entries in self.value_words.items()
+            if value <= remaining
+        }
+        table = {value: phrases for value, phrases in table.items() if phrases}
+
+        values = sorted(table)
+        reachable = self._build_reachable_sums(values, remaining, slots - 2)
+        results = 0
+
+        for count in range(1, slots + 1):
+
+            for value_combination in self._value_combinations(
+                values, table, remaining, count, 0, reachable, allow_repeats, deadline
+            ):
+
+                for words in self._expand_words(value_combination, table, allow_repeats):
+
+                    yield required_words + words
+                    results += 1
+
+                    if max_results is not None and results >= max_results:
+                        return
+
+                    if deadline is not None and time.perf_counter() > deadline:
+                        return
+
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+
+    def _value_combinations(
+        self,
+        values: List[int],
+        table: Dict[int, List[str]],
+        remaining: int,
+        count: int,
+        start: int,
+        reachable: List[int],
+        allow_repeats: bool,
+        deadline: Optional[float]
+    ) -> Iterator[List[int]]:
+
+        """
+        Yields non-decreasing value lists of a given length
+        that sum to the remaining value, starting at values[start].
+        """
+
+        if start >= len(values) or values[start] * count > remaining:
+            return
+
+        if count == 1:
+
+            if remaining in table and remaining >= values[start]:
+                yield [remaining]
+
+            return
+
+        if count == 2:
+
+            for index in range(start, len(values)):
+
+                value = values[index]
+
+                if 2 * value > remaining:
+                    return
+
+                other = remaining - value
+
+                if other in table and (other != value or allow_repeats or len(table[value]) > 1):
+                    yield [value, other]
+
+            return
+
+        for index in range(start, len(values)):
+
+            value = values[index]
+
+            if value * count > remaining:
+                return
+
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+
+            rest = remaining - value
+
+            if not (reachable[count - 1] >> rest) & 1:
+                continue
+
+            next_start = index if allow_repeats or len(table[value]) > 1 else index + 1
+
+            for tail in self._value_combinations(
+                values, table, rest, count - 1, next_start, reachable, allow_repeats, deadline
+            ):
+
+                if not allow_repeats and tail.count(value) + 1 > len(table[value]):
+                    continue
+
+                yield [value] + tail
+
+    @staticmethod
+    def _expand_words(
+        value_combination: List[int],
+        table: Dict[int, List[str]],
+        allow_repeats: bool
+    ) -> Iterator[List[str]]:
+
+        """
+        Yields the word lists for one value combination.
+        """
+
+        groups = []
+
+        for value in sorted(set(value_combination)):
+
+            multiplicity = value_combination.count(value)
+            choose = combinations_with_replacement if allow_repeats else combinations
+            groups.append(choose(table[value], multiplicity))
+
+        for selection in product(*groups):
+            yield [word for group in selection for word in group]
+
+    @staticmethod
+    def _build_reachable_sums(values: List[int], limit: int, depth: int) -> List[int]:
+
+        """
+        Builds bitsets of the sums reachable with exactly k values.
+
+        Bit s of reachable[k] is set when s is the sum of k
+        values (repeats allowed), for k up to depth + 1.
+        The bitsets only prune, so they ignore the repeat rules.
+        """
+
+        mask = (1 << (limit + 1)) - 1
+        reachable = [1]
+
+        for _ in range(max(depth, 0) + 1):
+
+            previous = reachable[-1]
+            current = 0
+
+            for value in values:
+                current |= previous << value
+
+            reachable.append(current & mask)
+
+        return reachable
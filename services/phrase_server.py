@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import signal
+import sys
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.exceptions import LexarithmosError
+from core.models import PhraseAnalysis
+from services.phrase_service import PhraseService
+
+
+class PhraseServer:
+
+    """
+    Serves phrase computations, storage actions and
+    queries as newline-delimited JSON over TCP or a
+    Unix socket.
+
+    Every request is one JSON object with an 'op' field
+    and every response is one JSON object with 'ok' and
+    either 'result' or 'error', echoing the request 'id'.
+
+    Reads are answered straight from the in-memory store.
+    Inserts and deletes are queued to a single writer
+    task, which applies everything queued so far as one
+    batch with one journal write per run of inserts. The
+    writer then refreshes the analyzers once, in a worker
+    thread, while reads continue. A request gets its
+    response once its mutation is in the store.
+    """
+
+    def __init__(self, phrase_service: PhraseService, max_batch: int = 1024) -> None:
+
+        """
+        Initializes the server.
+
+        :param phrase_service: The service to serve, ideally with a deferred refresh policy.
+        :param max_batch: The maximum number of mutations applied per batch.
+        """
+
+        self.phrase_service = phrase_service
+        self.max_batch = max_batch
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.writer_task: Optional[asyncio.Task] = None
+
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            "compute": self._compute,
+            "find": self._find,
+            "query": self._query,
+            "insert": self._insert,
+            "delete": self._delete
+        }
+
+        self.queries: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "range": lambda request: self.phrase_service.query_range(
+                int(request["low"]), int(request["high"])
+            ),
+            "root": lambda request: self.phrase_service.query_root(int(request["root"])),
+            "chain": lambda request: self.phrase_service.query_subdivisions(
+                [int(number) for number in request["subdivisions"]]
+            ),
+            "nearest": lambda request: self.phrase_service.query_nearest(
+                int(request["number"]), int(request.get("count", 5))
+            ),
+            "word": lambda request: self.phrase_service.find_phrases_with_word(request["word"])
+        }
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+
+        """
+        Serves requests on a TCP socket until cancelled.
+
+        :param host: The host to bind.
+        :param port: The port to bind.
+        """
+
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        await self._serve(server)
+
+    async def serve_unix(self, path: str) -> None:
+
+        """
+        Serves requests on a Unix socket until cancelled.
+
+        :param path: The socket file path.
+        """
+
+        server = await asyncio.start_unix_server(self._handle_connection, path)
+        await self._serve(server)
+
+    async def handle_request(self, line: bytes) -> Dict[str, Any]:
+
+        """
+        Handles one request line.
+
+        :param line: The raw JSON request line.
+        :return: The response object.
+        """
+
+        try:
+            request = json.loads(line)
+
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {"ok": False, "error": "Invalid JSON request."}
+
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "The request must be a JSON object."}
+
+        response: Dict[str, Any] = {"id": request.get("id")}
+        handler = self.handlers.get(request.get("op"))
+
+        if handler is None:
+
+            response.update(ok=False, error=f"Unknown operation '{request.get('op')}'.")
+            return response
+
+        try:
+            response.update(ok=True, result=await handler(request))
+
+        except LexarithmosError as error:
+            response.update(ok=False, error=str(error))
+
+        except (KeyError, ValueError, TypeError) as error:
+            response.update(ok=False, error=f"Invalid arguments: {error}")
+
+        return response
+
+    def close(self) -> None:
+
+        """
+        Refreshes the analyzers and compacts the storage.
+        """
+
+        try:
+
+            self.phrase_service.flush()
+            self.phrase_service.compact_storage()
+
+        except LexarithmosError as error:
+            print(f"[Lexarithmos Error]: {error}", file=sys.stderr)
+
+    async def _serve(self, server: asyncio.AbstractServer) -> None:
+
+        """
+        Runs the writer task alongside the server
+        until cancelled or sent SIGTERM.
+        """
+
+        self.queue = asyncio.Queue()
+        self._start_writer()
+
+        stopped = asyncio.Event()
+
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        try:
+
+            async with server:
+                await stopped.wait()
+
+        finally:
+
+            writer_task = self.writer_task
+            self.writer_task = None
+
+            if writer_task is not None:
+
+                writer_task.cancel()
+
+                try:
+                    await writer_task
+
+                except asyncio.CancelledError:
+                    pass
+
+    def _start_writer(self) -> None:
+
+        """
+        Starts the writer task, restarting it if it ever
+        stops other than by being cancelled, so queued
+        mutations are never left without a writer.
+        """
+
+        self.writer_task = asyncio.create_task(self._run_writer())
+        self.writer_task.add_done_callback(self._writer_stopped)
+
+    def _writer_stopped(self, task: asyncio.Task) -> None:
+
+        """
+        Logs and restarts a writer task that stopped unexpectedly.
+        """
+
+        if task.cancelled() or task is not self.writer_task:
+            return
+
+        error = task.exception()
+        print(f"[Lexarithmos Error]: The writer stopped unexpectedly: {error!r}", file=sys.stderr)
+
+        self._start_writer()
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+
+        """
+        Answers the requests of one connection in order.
+        """
+
+        try:
+
+            while line := await reader.readline():
+
+                if not line.strip():
+                    continue
+
+                response = await self.handle_request(line)
+
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+
+    async def _compute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+
+        """
+        Computes a phrase without storing it.
+        """
+
+        return self._describe(self.phrase_service.analyze(request["phrase"]))
+
+    async def _find(self, request: Dict[str, Any]) -> Dict[str, Any]:
+
+        """
+        Finds where a phrase, or its accent variants, is stored.
+        """
+
+        return {
+            "value": self.phrase_service.find_phrase(request["phrase"]),
+            "equivalents": self.phrase_service.find_equivalent_phrases(request["phrase"])
+        }
+
+    async def _query(self, request: Dict[str, Any]) -> Any:
+
+        """
+        Runs a numeric or word query.
+        """
+
+        query = self.queries.get(request.get("by"))
+
+        if query is None:
+            raise ValueError(f"unknown query '{request.get('by')}'")
+
+        return query(request)
+
+    async def _insert(self, request: Dict[str, Any]) -> Dict[str, Any]:
+
+        """
+        Queues an insert and waits until it is stored.
+        """
+
+        analysis = self.phrase_service.analyze(request["phrase"])
+
+        return await self._enqueue("insert", analysis)
+
+    async def _delete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+
+        """
+        Queues a delete and waits until it is applied.
+        """
+
+        return await self._enqueue("delete", request["phrase"])
+
+    async def _enqueue(self, operation: str, payload: Any) -> Dict[str, Any]:
+
+        """
+        Hands a mutation to the writer task.
+        """
+
+        assert self.queue is not None
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((operation, payload, future))
+
+        return await future
+
+    async def _run_writer(self) -> None:
+
+        """
+        Applies queued mutations in batches, refreshing
+        the analyzers once after every batch.
+        """
+
+        assert self.queue is not None
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+
+            batch = [await self.queue.get()]
+
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            try:
+                self._apply_batch(batch)
+
+            except Exception as error:
+
+                print(f"[Lexarithmos Error]: Failed to apply a batch: {error!r}", file=sys.stderr)
+
+                for _, _, future in batch:
+                    self._reject(future, LexarithmosError(f"Failed to apply the mutation: {error}"))
+
+            if not self.phrase_service.dirty:
+                continue
+
+            try:
+                await loop.run_in_executor(None, self.phrase_service.flush)
+
+            except Exception as error:
+                print(f"[Lexarithmos Error]: Failed to refresh the analyzers: {error}", file=sys.stderr)
+
+    def _apply_batch(self, batch: List[Tuple[str, Any, asyncio.Future]]) -> None:
+
+        """
+        Applies a batch of mutations in queue order,
+        storing each run of inserts with one write.
+        """
+
+        inserts: List[Tuple[PhraseAnalysis, asyncio.Future]] = []
+
+        for operation, payload, future in batch:
+
+            if operation == "insert":
+
+                inserts.append((payload, future))
+                continue
+
+            self._apply_inserts(inserts)
+            inserts = []
+
+            try:
+
+                change = self.phrase_service.delete_phrase(payload)
+                self._resolve(future, {"value": int(change.key), "kind": change.kind.value})
+
+            except LexarithmosError as error:
+                self._reject(future, error)
+
+        self._apply_inserts(inserts)
+
+    def _apply_inserts(self, inserts: List[Tuple[PhraseAnalysis, asyncio.Future]]) -> None:
+
+        """
+        Stores a run of inserts with a single write.
+        """
+
+        if not inserts:
+            return
+
+        try:
+            changes = self.phrase_service.insert_many([analysis for analysis, _ in inserts])
+
+        except LexarithmosError as error:
+
+            for _, future in inserts:
+                self._reject(future, error)
+
+            return
+
+        for (analysis, future), change in zip(inserts, changes):
+
+            result = self._describe(analysis)
+            result["kind"] = change.kind.value
+
+            self._resolve(future, result)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any) -> None:
+
+        """
+        Completes a mutation future unless its client is gone.
+        """
+
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _reject(future: asyncio.Future, error: Exception) -> None:
+
+        """
+        Fails a mutation future unless its client is gone.
+        """
+
+        if not future.done():
+            future.set_exception(error)
+
+    @staticmethod
+    def _describe(analysis: PhraseAnalysis) -> Dict[str, Any]:
+
+        """
+        Converts a phrase analysis into a response result.
+        """
+
+        return {
+            "phrase": analysis.original_text,
+            "words": analysis.normalized_words,
+            "value": analysis.total_value,
+            "subdivisions": analysis.subdivisions
+        }
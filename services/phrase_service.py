@@ -1,13 +1,21 @@
 # -*- coding: utf-8 -*-
-from typing import Optional
+import time
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 from core.actions import Action
+from core.changes import ChangeKind
+from core.refresh_policy import RefreshPolicy
+from core.instrumentation import instrumented
 from core.exceptions import InvalidPhraseError
-from core.models import PhraseAnalysis, PhraseResult
+from core.models import PhraseAnalysis, PhraseResult, PhraseValue, StoreChange
 from core.transformer import Transformer
-from storage.number_repository import NumberRepository
-from analysis.pipeline.analysis_pipeline import AnalysisPipeline
-from analysis.pipeline.default_pipeline import build_default_pipeline
+from core.lexarithmos_calculator import LexarithmosCalculator
+
+if TYPE_CHECKING:
+    from storage.base_number_repository import BaseNumberRepository
+    from analysis.pipeline.analysis_pipeline import AnalysisPipeline
+    from services.phrase_composer import PhraseComposer
 
 
 class PhraseService:
@@ -15,13 +23,31 @@ class PhraseService:
     """
     Handles phrase analysis, storage actions
     and analyzer refresh operations.
+
+    Analyzers are refreshed after every mutation by
+    default. A deferred policy collects the changes
+    until flush() is called, and a debounced policy
+    flushes once enough mutations have piled up or
+    the oldest pending one is old enough. No timer
+    runs in the background: the age is checked at
+    the next mutation or flush_if_due() call, such
+    as the CLI makes before every command.
+
+    The repository and the analysis pipeline are
+    created on first use, so computing values never
+    loads the store or imports the analyzers.
     """
 
     def __init__(
         self,
         transformer: Optional[Transformer] = None,
-        number_repository: Optional[NumberRepository] = None,
-        analysis_pipeline: Optional[AnalysisPipeline] = None
+        number_repository: Optional["BaseNumberRepository"] = None,
+        analysis_pipeline: Optional["AnalysisPipeline"] = None,
+        refresh_policy: RefreshPolicy = RefreshPolicy.IMMEDIATE,
+        debounce_mutations: int = 20,
+        debounce_seconds: float = 5.0,
+        repository_factory: Optional[Callable[[], "BaseNumberRepository"]] = None,
+        analysis_processes: bool = False
     ) -> None:
 
         """
@@ -29,12 +55,106 @@ class PhraseService:
 
         External dependencies can be injected
         for testing or custom research workflows.
+
+        :param refresh_policy: When analyzers are refreshed after mutations.
+        :param debounce_mutations: Pending mutations that trigger a debounced flush.
+        :param debounce_seconds: Age of the oldest pending mutation that triggers one.
+        :param repository_factory: Creates the repository on first use, if none is given.
+        :param analysis_processes: Whether the default pipeline runs analyzers in worker processes.
         """
 
         self.transformer = transformer or Transformer()
-        self.number_repository = number_repository or NumberRepository()
-        self.analysis_pipeline = analysis_pipeline or build_default_pipeline()
 
+        self._number_repository = number_repository
+        self._analysis_pipeline = analysis_pipeline
+        self.repository_factory = repository_factory
+        self.analysis_processes = analysis_processes
+
+        self.refresh_policy = refresh_policy
+        self.debounce_mutations = debounce_mutations
+        self.debounce_seconds = debounce_seconds
+
+        self.pending_changes: List[StoreChange] = []
+        self.pending_since: Optional[float] = None
+
+        self.composer: Optional["PhraseComposer"] = None
+
+        if number_repository is not None:
+            self._size_digit_table()
+
+    @property
+    def number_repository(self) -> "BaseNumberRepository":
+
+        """
+        Returns the repository, loading it on first use.
+        """
+
+        if self._number_repository is None:
+
+            if self.repository_factory is None:
+
+                from storage.number_repository import NumberRepository
+
+                self.repository_factory = NumberRepository
+
+            self._number_repository = self.repository_factory()
+            self._size_digit_table()
+
+        return self._number_repository
+
+    @number_repository.setter
+    def number_repository(self, number_repository: "BaseNumberRepository") -> None:
+
+        """
+        Replaces the repository, dropping the composer
+        table built from the previous one.
+
+        :param number_repository: The repository to use.
+        """
+
+        self._number_repository = number_repository
+        self.composer = None
+
+        self._size_digit_table()
+
+    @property
+    def analysis_pipeline(self) -> "AnalysisPipeline":
+
+        """
+        Returns the analysis pipeline, building the
+        default one, and importing its analyzers, on
+        first use.
+        """
+
+        if self._analysis_pipeline is None:
+
+            from analysis.pipeline.default_pipeline import build_default_pipeline
+
+            self._analysis_pipeline = build_default_pipeline(use_processes=self.analysis_processes)
+
+        return self._analysis_pipeline
+
+    @analysis_pipeline.setter
+    def analysis_pipeline(self, analysis_pipeline: "AnalysisPipeline") -> None:
+
+        """
+        Replaces the analysis pipeline.
+
+        :param analysis_pipeline: The pipeline to use.
+        """
+
+        self._analysis_pipeline = analysis_pipeline
+
+    @property
+    def loaded(self) -> bool:
+
+        """
+        Returns whether the repository has been loaded.
+        """
+
+        return self._number_repository is not None
+
+    @instrumented("service.process")
     def process(self, input_phrase: str, action: Action) -> PhraseResult:
 
         """
@@ -89,8 +209,92 @@ class PhraseService:
         Stores a phrase analysis and refreshes analyzers.
         """
 
-        self.number_repository.insert(analysis)
-        self._refresh_analyzers()
+        change = self.number_repository.insert(analysis)
+
+        if change.kind != ChangeKind.PHRASE_EXISTS:
+            self._refresh_analyzers([change])
+
+    def insert_many(
+        self,
+        analyses: Iterable[PhraseAnalysis | PhraseValue]
+    ) -> List[StoreChange]:
+
+        """
+        Stores many phrase analyses or values, such as
+        those from analyze_stream, with a single storage
+        write and a single analyzer refresh.
+        """
+
+        changes = self.number_repository.insert_many(analyses)
+        applied = self._applied(changes)
+
+        if applied:
+            self._refresh_analyzers(applied)
+
+        return changes
+
+    def analyze_stream(
+        self,
+        lines: Iterable[str],
+        batch_size: Optional[int] = None
+    ) -> Iterator[PhraseValue]:
+
+        """
+        Lazily analyzes an iterable of phrases, one per line.
+
+        :param lines: Any iterable of input lines, e.g. a file or sys.stdin.
+        :param batch_size: The number of lines per calculator batch.
+        :return: An iterator of PhraseValue objects.
+        """
+
+        return self.transformer.analyze_stream(lines, batch_size=batch_size)
+
+    def bulk_insert(
+        self,
+        phrases: Iterable[str],
+        progress: Optional[Callable[[int, float], None]] = None,
+        progress_interval: int = 1000,
+        batch_size: Optional[int] = 10000
+    ) -> int:
+
+        """
+        Stores many phrases with a single storage write
+        and a single analyzer refresh at the end.
+
+        Phrases are streamed into the repository, so the
+        input is never read as a whole, but the repository
+        keeps one small change record per phrase until the
+        write. Blank phrases are skipped.
+
+        :param phrases: The phrases to store, e.g. the lines of a file.
+        :param progress: Called with the processed count and elapsed seconds.
+        :param progress_interval: The number of phrases between progress calls, 0 for only the last.
+        :param batch_size: The number of phrases per calculator batch.
+        :return: The number of phrases newly stored, without those already stored.
+        """
+
+        started = time.perf_counter()
+
+        values = self.analyze_stream(phrases, batch_size=batch_size)
+
+        if progress and progress_interval > 0:
+            values = self._report_progress(values, progress, progress_interval, started)
+
+        changes = self.number_repository.insert_many(values)
+        added = len(self._applied(changes))
+
+        if not added:
+            return 0
+
+        self.composer = None
+        self._size_digit_table()
+
+        self.rebuild_analyzers(use_cache=True)
+
+        if progress:
+            progress(len(changes), time.perf_counter() - started)
+
+        return added
 
     def delete(self, analysis: PhraseAnalysis) -> None:
 
@@ -98,19 +302,384 @@ class PhraseService:
         Deletes a phrase analysis and refreshes analyzers.
         """
 
-        self.number_repository.delete(analysis)
-        self._refresh_analyzers()
+        change = self.number_repository.delete(analysis)
+        self._refresh_analyzers([change])
 
-    def _refresh_analyzers(self) -> None:
+    def delete_phrase(self, input_phrase: str) -> StoreChange:
 
         """
-        Refreshes derived research files.
+        Deletes a stored phrase by its text and refreshes analyzers.
+        """
+
+        self._validate_phrase(input_phrase)
+
+        change = self.number_repository.delete_phrase(input_phrase.strip())
+        self._refresh_analyzers([change])
+
+        return change
+
+    def find_phrase(self, input_phrase: str) -> Optional[int]:
+
+        """
+        Returns the number a phrase is stored under, if any.
+        """
+
+        self._validate_phrase(input_phrase)
+
+        return self.number_repository.find_phrase_key(input_phrase.strip())
+
+    def find_equivalent_phrases(self, input_phrase: str) -> List[str]:
+
+        """
+        Returns the stored phrases that normalize like the phrase.
+        """
+
+        self._validate_phrase(input_phrase)
+
+        return self.number_repository.find_equivalent_phrases(input_phrase)
+
+    def find_phrases_with_word(self, word: str) -> List[str]:
+
+        """
+        Returns the stored phrases containing a word.
+        """
+
+        self._validate_phrase(word)
+
+        return self.number_repository.find_phrases_with_word(word)
+
+    def query_range(self, low: int, high: int) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Returns the stored records with values between low and high.
+        """
+
+        return {
+            str(key): self.number_repository.get_record(key)
+            for key in self.number_repository.find_keys_in_range(low, high)
+        }
+
+    def query_root(self, root: int) -> List[int]:
+
+        """
+        Returns the stored numbers with the given digital root.
+        """
+
+        return self.number_repository.find_keys_by_root(root)
+
+    def query_subdivisions(self, sub_divisions: List[int]) -> List[int]:
+
+        """
+        Returns the stored numbers with the given subdivision chain.
+        """
+
+        return self.number_repository.find_keys_by_subdivisions(sub_divisions)
+
+    def query_nearest(self, number: int, count: int = 5) -> List[int]:
+
+        """
+        Returns the stored numbers closest to a number.
+        """
+
+        return self.number_repository.find_nearest_keys(number, count)
+
+    def query_permutations(self, number: int) -> List[int]:
+
         """
+        Returns the other stored numbers whose digits
+        are a permutation of the number's digits.
+
+        :param number: The non-negative number.
+        :return: The matching numbers in ascending order.
+        """
+
+        digits = sorted(str(number))
+        leading = next((digit for digit in digits if digit != "0"), "0")
+
+        remaining = list(digits)
+        remaining.remove(leading)
+
+        low = int(leading + "".join(remaining))
+        high = int("".join(reversed(digits)))
+
+        return [
+            key for key in self.number_repository.find_keys_in_range(low, high)
+            if key != number and sorted(str(key)) == digits
+        ]
+
+    def find_anagrams(self, input_phrase: str) -> List[str]:
+
+        """
+        Returns the stored phrases made of the same letters
+        as the phrase in a different order. Anagrams share
+        a value, so only the phrases stored under it are
+        compared, and accent or spacing variants, whose
+        letters come in the same order, are left out.
+
+        :param input_phrase: The phrase to match.
+        :return: The anagram phrases in stored order.
+        """
+
+        self._validate_phrase(input_phrase)
+
+        analysis = self.transformer.analyze_message(input_phrase)
+        record = self.number_repository.get_record(analysis.total_value) or {}
+
+        letters = self._letters(analysis.normalized_words)
+        signature = sorted(letters)
+
+        anagrams: List[str] = []
+
+        for phrase in record.get("key-phrases", []):
+
+            candidate = self._letters(self.transformer.normalize(phrase))
+
+            if candidate != letters and sorted(candidate) == signature:
+                anagrams.append(phrase)
+
+        return anagrams
+
+    def compose(
+        self,
+        target: int,
+        max_words: int = 3,
+        required_words: Iterable[str] = (),
+        forbidden_words: Iterable[str] = (),
+        allow_repeats: bool = False,
+        time_limit: Optional[float] = 2.0,
+        max_results: Optional[int] = 100
+    ) -> Iterator[List[str]]:
+
+        """
+        Lazily yields stored single words that total a target value.
+
+        Required words do not have to be stored; their values
+        are computed and subtracted from the target. The word
+        table is built on first use and then kept in step
+        with the store changes.
+        """
+
+        from services.phrase_composer import PhraseComposer
+
+        required_values = [
+            (word, self.transformer.analyze_message(word).total_value)
+            for word in required_words
+        ]
+
+        if self.composer is None:
+            self.composer = PhraseComposer(
+                self.number_repository.iter_records(), self.transformer.normalizer
+            )
+
+        return self.composer.compose(
+            target,
+            max_words=max_words,
+            required_values=required_values,
+            forbidden_words=forbidden_words,
+            allow_repeats=allow_repeats,
+            time_limit=time_limit,
+            max_results=max_results
+        )
+
+    def warm_word_cache(self) -> int:
+
+        """
+        Pre-loads the transformer's word cache with
+        the words of every stored phrase.
+
+        :return: The number of cached words.
+        """
+
+        return self.transformer.warm_cache(
+            phrase
+            for _, record in self.number_repository.iter_records()
+            for phrase in record.get("key-phrases", [])
+        )
+
+    def compact_storage(self) -> None:
+
+        """
+        Compacts the number store journal into the JSON
+        file. A repository never loaded has nothing to
+        compact.
+        """
+
+        if self.loaded:
+            self.number_repository.compact()
+
+    @property
+    def dirty(self) -> bool:
+
+        """
+        Returns whether analyzer outputs lag behind the store.
+        """
+
+        return bool(self.pending_changes)
+
+    @instrumented("service.flush")
+    def flush(self) -> int:
+
+        """
+        Refreshes analyzers with all pending store changes.
+
+        The changes stay pending if the refresh fails, so
+        a later flush retries them.
+
+        :return: The number of changes applied.
+        """
+
+        changes = list(self.pending_changes)
+
+        if not changes:
+            return 0
+
+        self.analysis_pipeline.apply_changes(
+            changes, self.number_repository.record_view(), digest=self._content_digest()
+        )
+
+        self.pending_changes = self.pending_changes[len(changes):]
+
+        if not self.pending_changes:
+            self.pending_since = None
+
+        return len(changes)
+
+    def flush_if_due(self) -> int:
+
+        """
+        Flushes pending changes once the debounce limits
+        are reached. Callers poll it, e.g. before each
+        command, since the age limit has no timer.
+
+        :return: The number of changes applied.
+        """
+
+        if self.refresh_policy == RefreshPolicy.IMMEDIATE:
+            return self.flush()
+
+        if self.refresh_policy != RefreshPolicy.DEBOUNCED or self.pending_since is None:
+            return 0
+
+        if (
+            len(self.pending_changes) >= self.debounce_mutations
+            or time.monotonic() - self.pending_since >= self.debounce_seconds
+        ):
+            return self.flush()
+
+        return 0
+
+    def rebuild_analyzers(
+        self,
+        names: Optional[Iterable[str]] = None,
+        use_cache: bool = False
+    ) -> None:
+
+        """
+        Rebuilds derived research files from scratch,
+        which also settles any pending changes.
+
+        An explicit rebuild repairs the outputs, so it
+        ignores the manifest unless asked to use it.
+
+        :param names: The analyzers to rebuild, all of them by default.
+        :param use_cache: Whether outputs recorded as current are skipped.
+        """
+
+        if names is None:
+
+            self.pending_changes = []
+            self.pending_since = None
 
         self.analysis_pipeline.run_all(
-            self.number_repository.get_all()
+            self.number_repository.record_view(),
+            names=names,
+            digest=self._content_digest(),
+            use_cache=use_cache
+        )
+
+    def _refresh_analyzers(self, changes: List[StoreChange]) -> None:
+
+        """
+        Refreshes derived research files after store
+        changes, according to the refresh policy, and
+        updates the composer table right away.
+        """
+
+        if self.composer is not None:
+            self.composer.update(
+                (change.key for change in changes), self.number_repository.record_view()
+            )
+
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+
+        self.pending_changes.extend(changes)
+        self.flush_if_due()
+
+    def _content_digest(self) -> Optional[str]:
+
+        """
+        Returns the store digest when the pipeline caches runs.
+        """
+
+        if not self.analysis_pipeline.uses_cache:
+            return None
+
+        return self.number_repository.content_digest()
+
+    def _size_digit_table(self) -> None:
+
+        """
+        Extends the digit-sum table of the transformer
+        to the largest stored key, since new phrases
+        mostly have values in the same range.
+        """
+
+        largest = self._number_repository.largest_key()
+
+        if largest is not None:
+            self.transformer.reducer.build_table(largest)
+
+    @staticmethod
+    def _letters(words: Iterable[str]) -> str:
+
+        """
+        Returns the lettered characters of normalized words.
+        """
+
+        return "".join(
+            char for char in "".join(words)
+            if char in LexarithmosCalculator.LETTER_TO_VALUE
         )
 
+    @staticmethod
+    def _applied(changes: List[StoreChange]) -> List[StoreChange]:
+
+        """
+        Returns the changes that actually modified the store.
+        """
+
+        return [change for change in changes if change.kind != ChangeKind.PHRASE_EXISTS]
+
+    @staticmethod
+    def _report_progress(
+        values: Iterable[PhraseValue],
+        progress: Callable[[int, float], None],
+        progress_interval: int,
+        started: float
+    ) -> Iterator[PhraseValue]:
+
+        """
+        Passes values through, reporting progress periodically.
+        """
+
+        for count, value in enumerate(values, start=1):
+
+            yield value
+
+            if count % progress_interval == 0:
+                progress(count, time.perf_counter() - started)
+
     @staticmethod
     def _validate_phrase(input_phrase: str) -> None:
 
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+import hashlib
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from core.models import PhraseAnalysis, PhraseValue, StoreChange
+from core.exceptions import InvalidPhraseError
+
+
+class BaseNumberRepository(ABC):
+
+    """
+    Base interface for the storage backends
+    of the phrase number store.
+    """
+
+    @abstractmethod
+    def insert(self, analysis: PhraseAnalysis) -> StoreChange:
+
+        """
+        Inserts a phrase analysis record.
+
+        :param analysis: The phrase analysis to store.
+        :return: The change applied to the store.
+        """
+
+        pass
+
+    def insert_many(
+        self,
+        analyses: Iterable[PhraseAnalysis | PhraseValue]
+    ) -> List[StoreChange]:
+
+        """
+        Inserts many phrase analysis records.
+
+        Backends override this to write all the
+        records at once instead of one at a time.
+
+        :param analyses: The phrase analyses or streamed values to store.
+        :return: The changes applied to the store.
+        """
+
+        return [self.insert(analysis) for analysis in analyses]
+
+    @abstractmethod
+    def delete(self, analysis: PhraseAnalysis) -> StoreChange:
+
+        """
+        Deletes a phrase analysis record.
+
+        :param analysis: The phrase analysis to remove.
+        :return: The change applied to the store.
+        """
+
+        pass
+
+    @abstractmethod
+    def delete_phrase(self, phrase: str) -> StoreChange:
+
+        """
+        Deletes a stored phrase without recomputing its value.
+
+        :param phrase: The original phrase text.
+        :return: The change applied to the store.
+        """
+
+        pass
+
+    @abstractmethod
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Returns all stored number data.
+
+        :return: The number store keyed by the primary number.
+        """
+
+        pass
+
+    @abstractmethod
+    def get_record(self, key: int) -> Optional[Dict[str, Any]]:
+
+        """
+        Returns the record stored under one number.
+
+        :param key: The primary number.
+        :return: The stored record, or None if the key is missing.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_phrase_key(self, phrase: str) -> Optional[int]:
+
+        """
+        Returns the number a phrase is stored under.
+
+        :param phrase: The original phrase text.
+        :return: The primary number, or None if the phrase is missing.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_equivalent_phrases(self, text: str) -> List[str]:
+
+        """
+        Returns the stored phrases that normalize like the text.
+
+        :param text: The phrase text, in any accent or case form.
+        :return: The matching stored phrases, sorted.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_phrases_with_word(self, word: str) -> List[str]:
+
+        """
+        Returns the stored phrases containing a normalized word.
+
+        :param word: The word, in any accent or case form.
+        :return: The matching stored phrases, sorted.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_keys_with_word(self, word: str) -> List[int]:
+
+        """
+        Returns the numbers with a phrase containing a word.
+
+        :param word: The word, in any accent or case form.
+        :return: The matching numbers in ascending order.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_keys_in_range(self, low: int, high: int) -> List[int]:
+
+        """
+        Returns the numbers between low and high, inclusive.
+
+        :param low: The lowest number.
+        :param high: The highest number.
+        :return: The matching numbers in ascending order.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_keys_by_root(self, root: int) -> List[int]:
+
+        """
+        Returns the numbers whose digital root matches.
+
+        :param root: The single-digit root.
+        :return: The matching numbers in ascending order.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_keys_by_subdivisions(self, sub_divisions: List[int]) -> List[int]:
+
+        """
+        Returns the numbers with the given subdivision chain.
+
+        :param sub_divisions: The subdivisions following the key.
+        :return: The matching numbers in ascending order.
+        """
+
+        pass
+
+    @abstractmethod
+    def find_nearest_keys(self, number: int, count: int) -> List[int]:
+
+        """
+        Returns the stored numbers closest to a number.
+
+        Ties are broken in favour of the smaller number.
+
+        :param number: The target number.
+        :param count: The maximum number of results.
+        :return: The closest numbers, nearest first.
+        """
+
+        pass
+
+    def compact(self) -> None:
+
+        """
+        Flushes pending writes into the canonical storage.
+
+        Backends that write through on every mutation
+        have nothing to compact.
+        """
+
+        pass
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+
+        """
+        Yields every stored key with its record.
+
+        Backends that do not keep the store in memory
+        override this to stream the records instead.
+
+        :return: An iterator of key and record pairs.
+        """
+
+        yield from self.get_all().items()
+
+    def record_view(self) -> Mapping[str, Dict[str, Any]]:
+
+        """
+        Returns the stored number data for reading.
+
+        Backends that keep the store in memory return it
+        as is. Others return a RecordView, which loads the
+        whole store only once something iterates it.
+
+        :return: A mapping of the stored keys to their records.
+        """
+
+        return self.get_all()
+
+    def content_digest(self) -> str:
+
+        """
+        Returns a digest of the stored key and phrase set.
+
+        The digest is the sum of one hash per stored phrase,
+        so it does not depend on insertion order and can be
+        maintained incrementally. Backends that keep it up
+        to date on every mutation override this full scan.
+
+        :return: The digest as a hexadecimal string.
+        """
+
+        digest = 0
+
+        for key, record in self.get_all().items():
+
+            for phrase in record.get("key-phrases", []):
+                digest += self._phrase_hash(key, phrase)
+
+        return self._format_digest(digest)
+
+    def largest_key(self) -> Optional[int]:
+
+        """
+        Returns the largest stored number.
+
+        Backends with a sorted view of their keys
+        override this full scan.
+
+        :return: The largest number, or None for an empty store.
+        """
+
+        return max(map(int, self.get_all()), default=None)
+
+    @staticmethod
+    def _phrase_hash(key: str, phrase: str) -> int:
+
+        """
+        Returns the 64-bit hash of one stored phrase.
+        """
+
+        return int.from_bytes(
+            hashlib.blake2b(f"{key}\x00{phrase}".encode("utf-8"), digest_size=8).digest(),
+            "big"
+        )
+
+    @staticmethod
+    def _format_digest(digest: int) -> str:
+
+        """
+        Formats a rolling digest as a fixed-width hex string.
+        """
+
+        return f"{digest % (1 << 64):016x}"
+
+    @staticmethod
+    def _validate_analysis(analysis: PhraseAnalysis | PhraseValue) -> None:
+
+        """
+        Validates the phrase analysis object.
+        """
+
+        if not isinstance(analysis.original_text, str) or not analysis.original_text.strip():
+            raise InvalidPhraseError("Phrase must be a non-empty string.")
+
+        BaseNumberRepository._validate_numbers(analysis.subdivisions)
+
+    @staticmethod
+    def _validate_numbers(numbers: Iterable[int]) -> None:
+
+        """
+        Validates that all subdivision values are integers.
+        """
+
+        sequence = list(numbers)
+
+        if not sequence:
+            raise InvalidPhraseError("Subdivision list cannot be empty.")
+
+        if any(not isinstance(number, int) for number in sequence):
+            raise TypeError("All subdivision values must be integers.")
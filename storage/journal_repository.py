@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import json
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+from core.exceptions import PhraseStorageError
+from core.instrumentation import METRICS, instrumented
+
+
+class JournalRepository:
+
+    """
+    Handles low-level append-only JSON-lines
+    journal file operations.
+    """
+
+    def __init__(self, file_path: str | Path) -> None:
+
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+
+        """
+        Appends one entry as a single JSON line.
+
+        :param entry: The journal entry to append.
+        """
+
+        self.append_many([entry])
+
+    @instrumented("journal.append")
+    def append_many(self, entries: Iterable[Dict[str, Any]]) -> None:
+
+        """
+        Appends many entries with a single file write.
+
+        :param entries: The journal entries to append.
+        """
+
+        lines = "".join(
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for entry in entries
+        )
+
+        try:
+
+            with self.file_path.open("a", encoding="utf-8") as file:
+                file.write(lines)
+
+            if METRICS.enabled:
+                METRICS.count("journal.bytes", len(lines.encode("utf-8")))
+
+        except OSError as exc:
+            raise PhraseStorageError(
+                f"Failed to append to journal '{self.file_path}': {exc}"
+            ) from exc
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+
+        """
+        Yields the journal entries in write order.
+
+        Lines that cannot be decoded, such as a line cut
+        short by an interrupted write, are skipped.
+        """
+
+        if not self.file_path.exists():
+            return
+
+        try:
+
+            with self.file_path.open("r", encoding="utf-8") as file:
+
+                for line in file:
+
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                    if isinstance(entry, dict):
+                        yield entry
+
+        except OSError as exc:
+            raise PhraseStorageError(
+                f"Failed to read journal '{self.file_path}': {exc}"
+            ) from exc
+
+    def clear(self) -> None:
+
+        """
+        Removes all journal entries.
+        """
+
+        try:
+            self.file_path.unlink(missing_ok=True)
+
+        except OSError as exc:
+            raise PhraseStorageError(
+                f"Failed to clear journal '{self.file_path}': {exc}"
+            ) from exc
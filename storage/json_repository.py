@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 from core.exceptions import PhraseStorageError
+from core.instrumentation import METRICS, instrumented
 
 
 class JsonRepository:
@@ -17,6 +18,7 @@ class JsonRepository:
         self.file_path = Path(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
 
+    @instrumented("json.load")
     def load(self) -> Dict[str, Any]:
 
         if not self.file_path.exists():
@@ -30,6 +32,7 @@ class JsonRepository:
         except (OSError, json.JSONDecodeError):
             return {}
 
+    @instrumented("json.save")
     def save(self, data: Dict[str, Any]) -> None:
 
         temporary_path = self.file_path.with_suffix(
@@ -41,6 +44,9 @@ class JsonRepository:
             with temporary_path.open("w", encoding="utf-8") as file:
                 json.dump(data, file, ensure_ascii=False, indent=4)
 
+                if METRICS.enabled:
+                    METRICS.count("json.save.bytes", file.tell())
+
             temporary_path.replace(self.file_path)
 
         except OSError as exc:
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+import mmap
+import struct
+
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from storage.number_index import NumberIndex
+from core.digit_reducer import DigitReducer
+from core.exceptions import PhraseStorageError
+
+
+class _Column(Sequence):
+
+    """
+    Exposes one fixed-width field of a table in the
+    mapped file as a read-only sequence, decoding only
+    the entries that are actually accessed.
+    """
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        offset: int,
+        stride: int,
+        field: struct.Struct,
+        count: int
+    ) -> None:
+
+        self.buffer = buffer
+        self.offset = offset
+        self.stride = stride
+        self.field = field
+        self.count = count
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __getitem__(self, position: int) -> int:
+
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+
+        return self.field.unpack_from(self.buffer, self.offset + position * self.stride)[0]
+
+
+class MappedNumberIndex:
+
+    """
+    Reads a compact, read-only binary export of the
+    number store through mmap.
+
+    The file holds a header, a table of fixed-width
+    (value, root, phrase count, phrase offset, phrase
+    length) entries sorted by value, a table of entry
+    positions sorted by root and value, and a UTF-8 blob
+    of the phrases, NUL-separated per value. Key, range
+    and root lookups binary search the tables in place,
+    so nothing is deserialized up front and processes
+    opening the same file share one page-cached copy.
+    """
+
+    MAGIC = b"LXNI"
+    VERSION = 1
+
+    HEADER = struct.Struct("<4sIQQQ")
+    ENTRY = struct.Struct("<qiIQI")
+    ROOT_ENTRY = struct.Struct("<iI")
+
+    VALUE_FIELD = struct.Struct("<q")
+    ROOT_FIELD = struct.Struct("<i")
+    POSITION_FIELD = struct.Struct("<I")
+
+    PHRASE_SEPARATOR = "\x00"
+
+    def __init__(self, file_path: str | Path) -> None:
+
+        """
+        Opens and maps an exported index file.
+
+        :param file_path: The index file path.
+        """
+
+        self.file_path = Path(file_path)
+        self.reducer = DigitReducer()
+
+        try:
+
+            with self.file_path.open("rb") as file:
+                self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, version, count, root_offset, blob_offset = self.HEADER.unpack_from(self.buffer)
+
+        except (OSError, ValueError, struct.error) as exc:
+            raise PhraseStorageError(
+                f"Failed to open index file '{self.file_path}': {exc}"
+            ) from exc
+
+        if magic != self.MAGIC or version != self.VERSION:
+
+            self.buffer.close()
+            raise PhraseStorageError(
+                f"'{self.file_path}' is not a version {self.VERSION} number index."
+            )
+
+        self.count = count
+        self.blob_offset = blob_offset
+
+        self.values = _Column(
+            self.buffer, self.HEADER.size, self.ENTRY.size, self.VALUE_FIELD, count
+        )
+        self.roots = _Column(
+            self.buffer, root_offset, self.ROOT_ENTRY.size, self.ROOT_FIELD, count
+        )
+        self.root_positions = _Column(
+            self.buffer, root_offset + self.ROOT_FIELD.size,
+            self.ROOT_ENTRY.size, self.POSITION_FIELD, count
+        )
+
+    @classmethod
+    def export(
+        cls,
+        records: Iterable[Tuple[str, Dict[str, Any]]],
+        file_path: str | Path
+    ) -> int:
+
+        """
+        Writes a number store as an index file.
+
+        Values without phrases are left out. The file is
+        written beside the target and then moved over it,
+        so readers never map a partial file.
+
+        :param records: The stored key and record pairs, e.g. a streamed repository.
+        :param file_path: The index file path.
+        :return: The number of exported values.
+        """
+
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        records = sorted(
+            (int(key), record)
+            for key, record in records
+            if record.get("key-phrases")
+        )
+
+        entries: List[bytes] = []
+        roots: List[Tuple[int, int]] = []
+        blob: List[bytes] = []
+        blob_size = 0
+
+        try:
+
+            for position, (value, record) in enumerate(records):
+
+                phrases = record["key-phrases"]
+
+                if any(cls.PHRASE_SEPARATOR in phrase for phrase in phrases):
+                    raise ValueError(f"a phrase of value {value} contains a NUL character")
+
+                encoded = cls.PHRASE_SEPARATOR.join(phrases).encode("utf-8")
+                root = NumberIndex.digital_root(value, record.get("sub-divisions", []))
+
+                entries.append(cls.ENTRY.pack(value, root, len(phrases), blob_size, len(encoded)))
+                roots.append((root, position))
+                blob.append(encoded)
+
+                blob_size += len(encoded)
+
+        except (ValueError, struct.error) as exc:
+            raise PhraseStorageError(f"Failed to export the number index: {exc}") from exc
+
+        root_offset = cls.HEADER.size + len(entries) * cls.ENTRY.size
+        blob_offset = root_offset + len(roots) * cls.ROOT_ENTRY.size
+
+        temporary_path = file_path.with_suffix(file_path.suffix + ".tmp")
+
+        try:
+
+            with temporary_path.open("wb") as file:
+
+                file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(entries), root_offset, blob_offset))
+                file.write(b"".join(entries))
+                file.write(b"".join(cls.ROOT_ENTRY.pack(*entry) for entry in sorted(roots)))
+                file.write(b"".join(blob))
+
+            temporary_path.replace(file_path)
+
+        except OSError as exc:
+            raise PhraseStorageError(
+                f"Failed to write index file '{file_path}': {exc}"
+            ) from exc
+
+        return len(entries)
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __contains__(self, key: int) -> bool:
+
+        return self._position(key) is not None
+
+    def __iter__(self) -> Iterator[int]:
+
+        return iter(self.values)
+
+    def __enter__(self) -> "MappedNumberIndex":
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+
+        self.close()
+
+    def get_phrases(self, key: int) -> List[str]:
+
+        """
+        Returns the phrases stored under a number.
+        """
+
+        position = self._position(key)
+
+        if position is None:
+            return []
+
+        return self._phrases(position)
+
+    def get_record(self, key: int) -> Optional[Dict[str, Any]]:
+
+        """
+        Returns the record stored under a number, with
+        its subdivisions recomputed from the number.
+        """
+
+        position = self._position(key)
+
+        if position is None:
+            return None
+
+        return {
+            "sub-divisions": self.reducer.reduce(key)[1:],
+            "key-phrases": self._phrases(position)
+        }
+
+    def find_keys_in_range(self, low: int, high: int) -> List[int]:
+
+        """
+        Returns the stored numbers from low to high, inclusive.
+        """
+
+        start = bisect_left(self.values, low)
+        end = bisect_right(self.values, high)
+
+        return [self.values[position] for position in range(start, end)]
+
+    def find_keys_by_root(self, root: int) -> List[int]:
+
+        """
+        Returns the stored numbers with the given digital root.
+        """
+
+        start = bisect_left(self.roots, root)
+        end = bisect_right(self.roots, root)
+
+        return [
+            self.values[self.root_positions[position]]
+            for position in range(start, end)
+        ]
+
+    def close(self) -> None:
+
+        """
+        Unmaps the index file.
+        """
+
+        self.buffer.close()
+
+    def _position(self, key: int) -> Optional[int]:
+
+        """
+        Returns the table position of a number, if stored.
+        """
+
+        position = bisect_left(self.values, key)
+
+        if position < self.count and self.values[position] == key:
+            return position
+
+        return None
+
+    def _phrases(self, position: int) -> List[str]:
+
+        """
+        Decodes the phrases of one table entry.
+        """
+
+        _, _, _, offset, length = self.ENTRY.unpack_from(
+            self.buffer, self.HEADER.size + position * self.ENTRY.size
+        )
+
+        start = self.blob_offset + offset
+        text = self.buffer[start:start + length].decode("utf-8")
+
+        return text.split(self.PHRASE_SEPARATOR)
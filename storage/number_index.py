@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+class NumberIndex:
+
+    """
+    Keeps the stored numbers in a sorted array, plus
+    buckets by digital root and by subdivision chain,
+    for range, root, chain and nearest-value queries.
+    """
+
+    def __init__(self) -> None:
+
+        """
+        Initializes empty indexes.
+        """
+
+        self.sorted_keys: List[int] = []
+        self.root_buckets: Dict[int, List[int]] = {}
+        self.chain_buckets: Dict[Tuple[int, ...], List[int]] = {}
+
+    def rebuild(self, number_store: Dict[str, Dict[str, Any]]) -> None:
+
+        """
+        Rebuilds all indexes from the number store.
+
+        :param number_store: The stored number dictionary.
+        """
+
+        self.sorted_keys = sorted(int(key) for key in number_store)
+        self.root_buckets = {}
+        self.chain_buckets = {}
+
+        for key in self.sorted_keys:
+
+            sub_divisions = number_store[str(key)].get("sub-divisions", [])
+
+            self.root_buckets.setdefault(self.digital_root(key, sub_divisions), []).append(key)
+            self.chain_buckets.setdefault(tuple(sub_divisions), []).append(key)
+
+    def add(self, key: int, sub_divisions: Sequence[int]) -> None:
+
+        """
+        Indexes a newly stored number.
+        """
+
+        position = bisect_left(self.sorted_keys, key)
+
+        if position < len(self.sorted_keys) and self.sorted_keys[position] == key:
+            return
+
+        self.sorted_keys.insert(position, key)
+
+        insort(self.root_buckets.setdefault(self.digital_root(key, sub_divisions), []), key)
+        insort(self.chain_buckets.setdefault(tuple(sub_divisions), []), key)
+
+    def remove(self, key: int, sub_divisions: Sequence[int]) -> None:
+
+        """
+        Removes a number that no longer has phrases.
+        """
+
+        if not self._discard(self.sorted_keys, key):
+            return
+
+        root = self.digital_root(key, sub_divisions)
+
+        if self._discard(self.root_buckets.get(root, []), key) and not self.root_buckets[root]:
+            del self.root_buckets[root]
+
+        chain = tuple(sub_divisions)
+
+        if self._discard(self.chain_buckets.get(chain, []), key) and not self.chain_buckets[chain]:
+            del self.chain_buckets[chain]
+
+    def keys_in_range(self, low: int, high: int) -> List[int]:
+
+        """
+        Returns the numbers between low and high, inclusive.
+        """
+
+        start = bisect_left(self.sorted_keys, low)
+        end = bisect_right(self.sorted_keys, high)
+
+        return self.sorted_keys[start:end]
+
+    def keys_by_root(self, root: int) -> List[int]:
+
+        """
+        Returns the numbers with the given digital root.
+        """
+
+        return list(self.root_buckets.get(root, []))
+
+    def keys_by_subdivisions(self, sub_divisions: Sequence[int]) -> List[int]:
+
+        """
+        Returns the numbers with the given subdivision chain.
+        """
+
+        return list(self.chain_buckets.get(tuple(sub_divisions), []))
+
+    def nearest_keys(self, number: int, count: int) -> List[int]:
+
+        """
+        Returns the count numbers closest to a number.
+
+        Ties are broken in favour of the smaller number,
+        and the result is ordered by distance.
+        """
+
+        right = bisect_left(self.sorted_keys, number)
+        left = right - 1
+        nearest: List[int] = []
+
+        while len(nearest) < count and (left >= 0 or right < len(self.sorted_keys)):
+
+            if right >= len(self.sorted_keys) or (
+                left >= 0 and number - self.sorted_keys[left] <= self.sorted_keys[right] - number
+            ):
+                nearest.append(self.sorted_keys[left])
+                left -= 1
+
+            else:
+                nearest.append(self.sorted_keys[right])
+                right += 1
+
+        return nearest
+
+    @staticmethod
+    def digital_root(key: int, sub_divisions: Sequence[int]) -> int:
+
+        """
+        Returns the last subdivision, or the key itself.
+        """
+
+        return sub_divisions[-1] if sub_divisions else key
+
+    @staticmethod
+    def _discard(sorted_keys: List[int], key: int) -> bool:
+
+        """
+        Removes a key from a sorted list, if present.
+        """
+
+        position = bisect_left(sorted_keys, key)
+
+        if position < len(sorted_keys) and sorted_keys[position] == key:
+
+            del sorted_keys[position]
+            return True
+
+        return False
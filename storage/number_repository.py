@@ -1,40 +1,96 @@
 # -*- coding: utf-8 -*-
-from typing import Any, Dict, Iterable
+import sys
 
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from storage.base_number_repository import BaseNumberRepository
 from storage.json_repository import JsonRepository
-from core.models import PhraseAnalysis
+from storage.journal_repository import JournalRepository
+from storage.snapshot_repository import SnapshotRepository
+from storage.phrase_index import PhraseIndex
+from storage.number_index import NumberIndex
+from core.changes import ChangeKind
+from core.models import PhraseAnalysis, PhraseValue, StoreChange
+from core.instrumentation import METRICS, instrumented
 from config.paths import NUMBER_FILE_PATH
 
-from core.exceptions import (
-    InvalidPhraseError,
-    PhraseNotFoundError
-)
+from core.exceptions import PhraseNotFoundError
 
 
-class NumberRepository:
+class NumberRepository(BaseNumberRepository):
 
     """
     Stores, updates and deletes phrase analysis
     records grouped by their primary number.
+
+    In journaled mode every mutation is appended as one
+    line to a journal instead of rewriting the whole JSON
+    file. The journal is replayed over the JSON snapshot
+    on startup and compacted back into it once it grows
+    past a threshold or when compaction is requested.
+
+    A PhraseIndex and a NumberIndex are rebuilt on load
+    and kept in sync on every mutation, for phrase, word
+    and numeric lookups, along with a rolling digest of
+    the stored phrases.
+
+    The decoded store, its indexes and digest are also
+    kept in a binary snapshot beside the JSON file, e.g.
+    number_file.snapshot, and restored from it instead
+    of parsing and indexing the JSON again while the
+    JSON file is unchanged. The snapshot is retaken when
+    the JSON file is found changed and on compaction.
     """
 
-    def __init__(self, file_path: str = NUMBER_FILE_PATH) -> None:
+    SNAPSHOT_VERSION = 1
+
+    def __init__(
+        self,
+        file_path: str | Path = NUMBER_FILE_PATH,
+        journal_path: Optional[str | Path] = None,
+        compaction_threshold: int = 1000,
+        use_snapshot: bool = True
+    ) -> None:
 
         """
         Initializes the number repository.
 
         :param file_path: The main number storage file path.
+        :param journal_path: The journal file path, enabling journaled mode.
+        :param compaction_threshold: Journal entries that trigger a compaction.
+        :param use_snapshot: Whether the binary snapshot is used and maintained.
         """
 
         self.json_repository = JsonRepository(file_path)
-        self.number_store: Dict[str, Any] = self.json_repository.load()
+        self.snapshot_repository = (
+            SnapshotRepository(Path(file_path).with_suffix(".snapshot")) if use_snapshot else None
+        )
+
+        self.number_store: Dict[str, Any] = {}
+        self.phrase_index = PhraseIndex()
+        self.number_index = NumberIndex()
+        self.digest = 0
+
+        self._load()
+
+        self.journal_repository = (
+            JournalRepository(journal_path) if journal_path is not None else None
+        )
+        self.compaction_threshold = compaction_threshold
+        self.journal_size = 0
+
+        if self.journal_repository is not None:
+            self._replay_journal()
 
-    def insert(self, analysis: PhraseAnalysis) -> None:
+    @instrumented("repository.insert")
+    def insert(self, analysis: PhraseAnalysis) -> StoreChange:
 
         """
         Inserts a phrase analysis record.
 
         :param analysis: The phrase analysis to store.
+        :return: The change applied to the store.
         """
 
         self._validate_analysis(analysis)
@@ -42,28 +98,121 @@ class NumberRepository:
         key = str(analysis.total_value)
         sub_divisions = analysis.subdivisions[1:]
 
-        if key not in self.number_store:
+        kind = self._apply_insert(key, sub_divisions, analysis.original_text)
 
-            self.number_store[key] = {
+        if kind != ChangeKind.PHRASE_EXISTS:
+            self._persist({
+                "op": "insert",
+                "key": key,
                 "sub-divisions": sub_divisions,
-                "key-phrases": [analysis.original_text]
-            }
+                "phrase": analysis.original_text
+            })
+
+        return StoreChange(kind=kind, key=key, phrase=analysis.original_text)
 
-        else:
+    @instrumented("repository.insert_many")
+    def insert_many(
+        self,
+        analyses: Iterable[PhraseAnalysis | PhraseValue]
+    ) -> List[StoreChange]:
+
+        """
+        Inserts many phrase analysis records with a single write.
+
+        Phrases are merged into the store key by key, so each
+        key's phrase list is sorted once however many phrases
+        it receives. Journal entries are only gathered while
+        the batch could still be appended without reaching the
+        compaction threshold; larger batches are written by a
+        full rewrite instead, so memory beyond the new phrases
+        themselves is one small change record per phrase.
+
+        :param analyses: The phrase analyses or streamed values to store.
+        :return: The changes applied to the store.
+        """
+
+        changes: List[StoreChange] = []
+        entries: List[Dict[str, Any]] = []
+        pending: Dict[str, Tuple[List[int], Set[str]]] = {}
+
+        journal_room = (
+            self.compaction_threshold - self.journal_size
+            if self.journal_repository is not None else 0
+        )
+        added = 0
+
+        for analysis in analyses:
+
+            self._validate_analysis(analysis)
+
+            key = str(analysis.total_value)
+            sub_divisions = analysis.subdivisions[1:]
+
+            is_new_key = key not in self.number_store and key not in pending
+            phrases = pending.setdefault(key, (sub_divisions, set()))[1]
+
+            if (
+                analysis.original_text in phrases
+                or self.phrase_index.find_key(analysis.original_text) == key
+            ):
+
+                changes.append(
+                    StoreChange(kind=ChangeKind.PHRASE_EXISTS, key=key, phrase=analysis.original_text)
+                )
+                continue
 
-            phrases = set(self.number_store[key].get("key-phrases", []))
             phrases.add(analysis.original_text)
+
+            kind = ChangeKind.KEY_ADDED if is_new_key else ChangeKind.PHRASE_ADDED
+            changes.append(StoreChange(kind=kind, key=key, phrase=analysis.original_text))
+
+            added += 1
+
+            if added < journal_room:
+                entries.append({
+                    "op": "insert",
+                    "key": key,
+                    "sub-divisions": sub_divisions,
+                    "phrase": analysis.original_text
+                })
+
+        for key, (sub_divisions, phrases) in pending.items():
+
+            existing = set(self.number_store.get(key, {}).get("key-phrases", []))
+
+            for phrase in phrases:
+
+                self.phrase_index.add(key, phrase)
+
+                if phrase not in existing:
+                    self.digest += self._phrase_hash(key, phrase)
+
+            if key not in self.number_store:
+
+                self.number_store[key] = {
+                    "sub-divisions": sub_divisions,
+                    "key-phrases": sorted(phrases)
+                }
+
+                self.number_index.add(int(key), sub_divisions)
+                continue
+
+            phrases.update(existing)
             self.number_store[key]["key-phrases"] = sorted(phrases)
 
-        self._cleanup_store()
-        self.json_repository.save(self.number_store)
+        if added:
+            self._persist_many(entries, count=added)
+
+        return changes
 
-    def delete(self, analysis: PhraseAnalysis) -> None:
+    @instrumented("repository.delete")
+    def delete(self, analysis: PhraseAnalysis) -> StoreChange:
 
         """
         Deletes a phrase analysis record.
 
         :param analysis: The phrase analysis to remove.
+        :return: The change applied to the store.
         """
 
         self._validate_analysis(analysis)
@@ -73,54 +222,418 @@ class NumberRepository:
         if key not in self.number_store:
             raise PhraseNotFoundError(f"Key {key} does not exist.")
 
-        try:
+        if self.phrase_index.find_key(analysis.original_text) != key:
+            raise PhraseNotFoundError(
+                f"Phrase '{analysis.original_text}' does not exist under key {key}."
+            )
 
-            self.number_store[key]["key-phrases"].remove(analysis.original_text)
+        return self._delete_stored_phrase(key, analysis.original_text)
 
-        except InvalidPhraseError as exc:
-            raise InvalidPhraseError(
-                f"Phrase '{analysis.original_text}' does not exist under key {key}."
-            ) from exc
+    @instrumented("repository.delete_phrase")
+    def delete_phrase(self, phrase: str) -> StoreChange:
+
+        """
+        Deletes a stored phrase without recomputing its value.
+
+        :param phrase: The original phrase text.
+        :return: The change applied to the store.
+        """
+
+        key = self.phrase_index.find_key(phrase)
+
+        if key is None:
+            raise PhraseNotFoundError(f"Phrase '{phrase}' does not exist.")
+
+        return self._delete_stored_phrase(key, phrase)
+
+    @instrumented("repository.compact")
+    def compact(self) -> None:
+
+        """
+        Writes the store back into the JSON file
+        and empties the journal.
+
+        Without pending journal entries the JSON
+        file is already current and is left as is.
+        """
+
+        if self.journal_size == 0:
+            return
 
         self._cleanup_store()
         self.json_repository.save(self.number_store)
+        self._save_snapshot(SnapshotRepository.fingerprint(self.json_repository.file_path))
+
+        assert self.journal_repository is not None
+
+        self.journal_repository.clear()
+        self.journal_size = 0
+
+    def content_digest(self) -> str:
+
+        """
+        Returns the rolling digest of the stored phrases.
+
+        :return: The digest as a hexadecimal string.
+        """
+
+        return self._format_digest(self.digest)
 
     def get_all(self) -> Dict[str, Dict[str, Any]]:
 
         """
         Returns all stored number data.
 
+        In journaled mode, keys inserted since the last
+        compaction may not be in numeric order.
+
         :return: The current number store.
         """
 
         return self.number_store
 
-    @staticmethod
-    def _validate_analysis(analysis: PhraseAnalysis) -> None:
+    def get_record(self, key: int) -> Optional[Dict[str, Any]]:
 
         """
-        Validates the phrase analysis object.
+        Returns the record stored under one number.
+
+        :param key: The primary number.
+        :return: The stored record, or None if the key is missing.
         """
 
-        if not isinstance(analysis.original_text, str) or not analysis.original_text.strip():
-            raise InvalidPhraseError("Phrase must be a non-empty string.")
+        return self.number_store.get(str(key))
 
-        NumberRepository._validate_numbers(analysis.subdivisions)
+    def find_phrase_key(self, phrase: str) -> Optional[int]:
 
-    @staticmethod
-    def _validate_numbers(numbers: Iterable[int]) -> None:
+        """
+        Returns the number a phrase is stored under.
 
+        :param phrase: The original phrase text.
+        :return: The primary number, or None if the phrase is missing.
         """
-        Validates that all subdivision values are integers.
+
+        key = self.phrase_index.find_key(phrase)
+
+        return int(key) if key is not None else None
+
+    def find_equivalent_phrases(self, text: str) -> List[str]:
+
         """
+        Returns the stored phrases that normalize like the text.
 
-        sequence = list(numbers)
+        :param text: The phrase text, in any accent or case form.
+        :return: The matching stored phrases, sorted.
+        """
+
+        return self.phrase_index.find_equivalent_phrases(text)
 
-        if not sequence:
-            raise InvalidPhraseError("Subdivision list cannot be empty.")
+    def find_phrases_with_word(self, word: str) -> List[str]:
 
-        if any(not isinstance(number, int) for number in sequence):
-            raise TypeError("All subdivision values must be integers.")
+        """
+        Returns the stored phrases containing a normalized word.
+
+        :param word: The word, in any accent or case form.
+        :return: The matching stored phrases, sorted.
+        """
+
+        return self.phrase_index.find_phrases_with_word(word)
+
+    def find_keys_with_word(self, word: str) -> List[int]:
+
+        """
+        Returns the numbers with a phrase containing a word.
+
+        :param word: The word, in any accent or case form.
+        :return: The matching numbers in ascending order.
+        """
+
+        return self.phrase_index.find_keys_with_word(word)
+
+    def largest_key(self) -> Optional[int]:
+
+        """
+        Returns the largest stored number from the sorted index.
+        """
+
+        sorted_keys = self.number_index.sorted_keys
+
+        return sorted_keys[-1] if sorted_keys else None
+
+    def find_keys_in_range(self, low: int, high: int) -> List[int]:
+
+        """
+        Returns the numbers between low and high, inclusive.
+
+        :param low: The lowest number.
+        :param high: The highest number.
+        :return: The matching numbers in ascending order.
+        """
+
+        return self.number_index.keys_in_range(low, high)
+
+    def find_keys_by_root(self, root: int) -> List[int]:
+
+        """
+        Returns the numbers whose digital root matches.
+
+        :param root: The single-digit root.
+        :return: The matching numbers in ascending order.
+        """
+
+        return self.number_index.keys_by_root(root)
+
+    def find_keys_by_subdivisions(self, sub_divisions: List[int]) -> List[int]:
+
+        """
+        Returns the numbers with the given subdivision chain.
+
+        :param sub_divisions: The subdivisions following the key.
+        :return: The matching numbers in ascending order.
+        """
+
+        return self.number_index.keys_by_subdivisions(sub_divisions)
+
+    def find_nearest_keys(self, number: int, count: int) -> List[int]:
+
+        """
+        Returns the stored numbers closest to a number.
+
+        :param number: The target number.
+        :param count: The maximum number of results.
+        :return: The closest numbers, nearest first.
+        """
+
+        return self.number_index.nearest_keys(number, count)
+
+    def _delete_stored_phrase(self, key: str, phrase: str) -> StoreChange:
+
+        """
+        Deletes a phrase known to be stored under a key.
+        """
+
+        kind = self._apply_delete(key, phrase)
+
+        self._persist({
+            "op": "delete",
+            "key": key,
+            "phrase": phrase
+        })
+
+        return StoreChange(kind=kind, key=key, phrase=phrase)
+
+    def _apply_insert(self, key: str, sub_divisions: List[int], phrase: str) -> ChangeKind:
+
+        """
+        Adds a phrase to the in-memory store.
+        """
+
+        self.phrase_index.add(key, phrase)
+
+        if key not in self.number_store:
+
+            self.number_store[key] = {
+                "sub-divisions": sub_divisions,
+                "key-phrases": [phrase]
+            }
+
+            self.digest += self._phrase_hash(key, phrase)
+
+            self.number_index.add(int(key), sub_divisions)
+
+            return ChangeKind.KEY_ADDED
+
+        phrases = set(self.number_store[key].get("key-phrases", []))
+
+        if phrase in phrases:
+            return ChangeKind.PHRASE_EXISTS
+
+        phrases.add(phrase)
+        self.number_store[key]["key-phrases"] = sorted(phrases)
+        self.digest += self._phrase_hash(key, phrase)
+
+        return ChangeKind.PHRASE_ADDED
+
+    def _apply_delete(self, key: str, phrase: str) -> ChangeKind:
+
+        """
+        Removes a phrase from the in-memory store.
+        """
+
+        phrases = self.number_store[key]["key-phrases"]
+        phrases.remove(phrase)
+
+        self.phrase_index.remove(phrase)
+        self.digest -= self._phrase_hash(key, phrase)
+
+        if phrases:
+            return ChangeKind.PHRASE_REMOVED
+
+        record = self.number_store.pop(key)
+        self.number_index.remove(int(key), record.get("sub-divisions", []))
+
+        return ChangeKind.KEY_EMPTIED
+
+    def _persist(self, entry: Dict[str, Any]) -> None:
+
+        """
+        Persists one mutation, either as a journal
+        entry or as a full JSON file rewrite.
+        """
+
+        self._persist_many([entry])
+
+    def _persist_many(self, entries: List[Dict[str, Any]], count: Optional[int] = None) -> None:
+
+        """
+        Persists many mutations with a single write.
+
+        In journaled mode a batch that would reach the
+        compaction threshold is compacted straight away
+        instead of being appended to the journal first,
+        so its entries may be left out and only counted.
+        """
+
+        if self.journal_repository is None:
+
+            self._cleanup_store()
+            self.json_repository.save(self.number_store)
+            return
+
+        self.journal_size += len(entries) if count is None else count
+
+        if self.journal_size >= self.compaction_threshold:
+
+            self.compact()
+            return
+
+        self.journal_repository.append_many(entries)
+
+    def _load(self) -> None:
+
+        """
+        Loads the store, its indexes and digest, from the
+        snapshot when it matches the JSON file and from
+        the JSON file otherwise, retaking the snapshot.
+        """
+
+        fingerprint = (
+            SnapshotRepository.fingerprint(self.json_repository.file_path)
+            if self.snapshot_repository is not None else None
+        )
+
+        if fingerprint is not None and self._restore_snapshot(fingerprint):
+            return
+
+        self.number_store = self.json_repository.load()
+        self.phrase_index.rebuild(self.number_store)
+        self.number_index.rebuild(self.number_store)
+
+        for key, record in self.number_store.items():
+
+            for phrase in record.get("key-phrases", []):
+                self.digest += self._phrase_hash(key, phrase)
+
+        self._save_snapshot(fingerprint)
+
+    def _restore_snapshot(self, fingerprint: Tuple[int, int, str]) -> bool:
+
+        """
+        Restores the store, indexes and digest from the snapshot.
+
+        A snapshot missing any part is ignored as a whole.
+
+        :return: Whether the snapshot matched the JSON file.
+        """
+
+        assert self.snapshot_repository is not None
+
+        state = self.snapshot_repository.load(fingerprint)
+
+        if not isinstance(state, dict) or state.get("version") != self.SNAPSHOT_VERSION:
+            return False
+
+        try:
+
+            parts = (
+                state["number_store"], state["digest"],
+                state["phrase_keys"], state["normalized_phrases"], state["word_phrases"],
+                state["sorted_keys"], state["root_buckets"], state["chain_buckets"]
+            )
+
+        except (KeyError, TypeError):
+            return False
+
+        (
+            self.number_store, self.digest,
+            self.phrase_index.phrase_keys,
+            self.phrase_index.normalized_phrases,
+            self.phrase_index.word_phrases,
+            self.number_index.sorted_keys,
+            self.number_index.root_buckets,
+            self.number_index.chain_buckets
+        ) = parts
+
+        return True
+
+    def _save_snapshot(self, fingerprint: Optional[Tuple[int, int, str]]) -> None:
+
+        """
+        Snapshots the store, indexes and digest as they
+        stand for the JSON file with the given fingerprint.
+
+        Store keys and record fields are interned, and are
+        interned again when the snapshot is restored.
+        """
+
+        if self.snapshot_repository is None or fingerprint is None:
+            return
+
+        self.snapshot_repository.save({
+            "version": self.SNAPSHOT_VERSION,
+            "number_store": {
+                sys.intern(key): {sys.intern(field): value for field, value in record.items()}
+                for key, record in self.number_store.items()
+            },
+            "digest": self.digest,
+            "phrase_keys": self.phrase_index.phrase_keys,
+            "normalized_phrases": self.phrase_index.normalized_phrases,
+            "word_phrases": self.phrase_index.word_phrases,
+            "sorted_keys": self.number_index.sorted_keys,
+            "root_buckets": self.number_index.root_buckets,
+            "chain_buckets": self.number_index.chain_buckets
+        }, fingerprint)
+
+    def _replay_journal(self) -> None:
+
+        """
+        Applies the journal entries over the loaded snapshot.
+
+        Entries are idempotent, so a journal that survived
+        an interrupted compaction replays safely.
+        """
+
+        assert self.journal_repository is not None
+
+        for entry in self.journal_repository.read():
+
+            key = str(entry.get("key", ""))
+            phrase = entry.get("phrase")
+
+            if not key or not isinstance(phrase, str):
+                continue
+
+            if entry.get("op") == "insert":
+                self._apply_insert(key, entry.get("sub-divisions", []), phrase)
+
+            elif entry.get("op") == "delete":
+
+                if self.phrase_index.find_key(phrase) == key:
+                    self._apply_delete(key, phrase)
+
+            self.journal_size += 1
+
+        if self.journal_size >= self.compaction_threshold:
+            self.compact()
 
     def _cleanup_store(self) -> None:
 
@@ -128,12 +641,14 @@ class NumberRepository:
         Removes empty entries and sorts keys numerically.
         """
 
-        self.number_store = {
-            key: value
-            for key, value in self.number_store.items()
-            if value.get("key-phrases")
-        }
+        with METRICS.span("repository.cleanup_store"):
 
-        self.number_store = dict(
-            sorted(self.number_store.items(), key=lambda item: int(item[0]))
-        )
+            self.number_store = {
+                key: value
+                for key, value in self.number_store.items()
+                if value.get("key-phrases")
+            }
+
+            self.number_store = dict(
+                sorted(self.number_store.items(), key=lambda item: int(item[0]))
+            )
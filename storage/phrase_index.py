@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Dict, List, Optional, Set
+
+from core.text_normalizer import TextNormalizer
+
+
+class PhraseIndex:
+
+    """
+    Maintains reverse lookups over the number store:
+    phrase text to key, normalized form to phrases and
+    normalized word to the phrases containing it.
+    """
+
+    def __init__(self, normalizer: Optional[TextNormalizer] = None) -> None:
+
+        """
+        Initializes empty indexes.
+
+        :param normalizer: The normalizer used for phrase forms and words.
+        """
+
+        self.normalizer = normalizer or TextNormalizer()
+
+        self.phrase_keys: Dict[str, str] = {}
+        self.normalized_phrases: Dict[str, Set[str]] = {}
+        self.word_phrases: Dict[str, Set[str]] = {}
+
+    def rebuild(self, number_store: Dict[str, Dict[str, Any]]) -> None:
+
+        """
+        Rebuilds all indexes from the number store.
+
+        :param number_store: The stored number dictionary.
+        """
+
+        self.phrase_keys.clear()
+        self.normalized_phrases.clear()
+        self.word_phrases.clear()
+
+        for key, record in number_store.items():
+
+            for phrase in record.get("key-phrases", []):
+                self.add(key, phrase)
+
+    def add(self, key: str, phrase: str) -> None:
+
+        """
+        Indexes a phrase stored under a key.
+        """
+
+        if phrase in self.phrase_keys:
+            return
+
+        self.phrase_keys[phrase] = key
+
+        words = self.normalizer.normalize(phrase)
+        self.normalized_phrases.setdefault(" ".join(words), set()).add(phrase)
+
+        for word in set(words):
+            self.word_phrases.setdefault(word, set()).add(phrase)
+
+    def remove(self, phrase: str) -> None:
+
+        """
+        Removes a phrase from the indexes.
+        """
+
+        if self.phrase_keys.pop(phrase, None) is None:
+            return
+
+        words = self.normalizer.normalize(phrase)
+        self._discard(self.normalized_phrases, " ".join(words), phrase)
+
+        for word in set(words):
+            self._discard(self.word_phrases, word, phrase)
+
+    def find_key(self, phrase: str) -> Optional[str]:
+
+        """
+        Returns the key a phrase is stored under.
+        """
+
+        return self.phrase_keys.get(phrase)
+
+    def find_equivalent_phrases(self, text: str) -> List[str]:
+
+        """
+        Returns the stored phrases with the same normalized form.
+        """
+
+        normalized = " ".join(self.normalizer.normalize(text))
+
+        return sorted(self.normalized_phrases.get(normalized, ()))
+
+    def find_phrases_with_word(self, word: str) -> List[str]:
+
+        """
+        Returns the stored phrases containing a word.
+        """
+
+        normalized = "".join(self.normalizer.normalize(word))
+
+        return sorted(self.word_phrases.get(normalized, ()))
+
+    def find_keys_with_word(self, word: str) -> List[int]:
+
+        """
+        Returns the keys with at least one phrase containing a word.
+        """
+
+        phrases = self.find_phrases_with_word(word)
+
+        return sorted({int(self.phrase_keys[phrase]) for phrase in phrases})
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], entry: str, phrase: str) -> None:
+
+        """
+        Removes a phrase from one index entry, dropping empty entries.
+        """
+
+        phrases = index.get(entry)
+
+        if phrases is None:
+            return
+
+        phrases.discard(phrase)
+
+        if not phrases:
+            del index[entry]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, ItemsView, Iterator, Optional
+
+if TYPE_CHECKING:
+    from storage.base_number_repository import BaseNumberRepository
+
+
+class RecordView(Mapping):
+
+    """
+    A read-only mapping of a repository's records.
+
+    Single-key lookups query the repository, so the
+    analyzer updates and composer table updates that
+    only touch changed keys never load the store. The
+    first iteration loads the whole store once, and
+    later reads use that copy. The view reflects the
+    store at the time it is read, so each refresh
+    takes a new one, on the thread that uses it.
+    """
+
+    def __init__(self, repository: "BaseNumberRepository") -> None:
+
+        """
+        Creates a view of a repository.
+
+        :param repository: The repository to read.
+        """
+
+        self.repository = repository
+
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lookups: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+
+        record = self._lookup(key)
+
+        if record is None:
+            raise KeyError(key)
+
+        return record
+
+    def __contains__(self, key: object) -> bool:
+
+        return isinstance(key, str) and self._lookup(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self._load())
+
+    def __len__(self) -> int:
+
+        return len(self._load())
+
+    def items(self) -> ItemsView[str, Dict[str, Any]]:
+
+        return self._load().items()
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+
+        """
+        Returns one record, from the loaded store if
+        there is one, or else from the repository.
+        """
+
+        if self._records is not None:
+            return self._records.get(key)
+
+        if key not in self._lookups:
+            self._lookups[key] = self.repository.get_record(int(key))
+
+        return self._lookups[key]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Loads the whole store on first use.
+        """
+
+        if self._records is None:
+            self._records = self.repository.get_all()
+
+        return self._records
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+import gc
+import hashlib
+import marshal
+import struct
+import sys
+
+from pathlib import Path
+from typing import Any, Optional, Tuple
+from core.instrumentation import METRICS, instrumented
+
+Fingerprint = Tuple[int, int, str]
+
+
+class SnapshotRepository:
+
+    """
+    Handles a binary sidecar snapshot derived from a
+    source file, such as the decoded number store and
+    its indexes derived from the JSON number file.
+
+    The snapshot is written with marshal, which restores
+    shared strings once and loads far faster than the
+    source can be parsed and indexed again. Its header
+    records the modification time, size and hash of the
+    source file it was derived from, and the snapshot is
+    only used while the source still matches all three,
+    and only by the Python version that wrote it. The
+    source file stays the canonical copy.
+    """
+
+    FORMAT_VERSION = 1
+    HEADER_SIZE = struct.Struct("<I")
+
+    def __init__(self, file_path: str | Path) -> None:
+
+        """
+        Initializes the snapshot repository.
+
+        :param file_path: The snapshot file path.
+        """
+
+        self.file_path = Path(file_path)
+
+    @staticmethod
+    def fingerprint(source_path: str | Path) -> Optional[Fingerprint]:
+
+        """
+        Identifies the exact contents of a source file.
+
+        :param source_path: The source file path.
+        :return: The modification time in nanoseconds, size and hash, or None if it is missing.
+        """
+
+        source_path = Path(source_path)
+
+        try:
+
+            status = source_path.stat()
+            content = source_path.read_bytes()
+
+        except OSError:
+            return None
+
+        return (
+            status.st_mtime_ns,
+            status.st_size,
+            hashlib.sha256(content).hexdigest()
+        )
+
+    @instrumented("snapshot.load")
+    def load(self, fingerprint: Fingerprint) -> Optional[Any]:
+
+        """
+        Loads the snapshot if it was derived from the
+        source contents with the given fingerprint.
+
+        :param fingerprint: The current fingerprint of the source file.
+        :return: The snapshot state, or None if it is missing or stale.
+        """
+
+        try:
+
+            content = memoryview(self.file_path.read_bytes())
+
+            (header_size,) = self.HEADER_SIZE.unpack_from(content)
+            header_end = self.HEADER_SIZE.size + header_size
+
+            if marshal.loads(content[self.HEADER_SIZE.size:header_end]) != self._header(fingerprint):
+
+                METRICS.count("snapshot.stale")
+                return None
+
+            state = self._decode(content[header_end:])
+
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+
+            METRICS.count("snapshot.stale")
+            return None
+
+        METRICS.count("snapshot.hits")
+
+        return state
+
+    @instrumented("snapshot.save")
+    def save(self, state: Any, fingerprint: Fingerprint) -> None:
+
+        """
+        Replaces the snapshot with state derived from the
+        source contents with the given fingerprint.
+
+        Failures are ignored, since the source stays
+        readable and the snapshot is retaken on next load.
+
+        :param state: The marshallable state.
+        :param fingerprint: The fingerprint of the source file.
+        """
+
+        temporary_path = self.file_path.with_suffix(
+            self.file_path.suffix + ".tmp"
+        )
+
+        try:
+
+            header = marshal.dumps(self._header(fingerprint))
+
+            with temporary_path.open("wb") as file:
+
+                file.write(self.HEADER_SIZE.pack(len(header)))
+                file.write(header)
+                file.write(marshal.dumps(state))
+
+            temporary_path.replace(self.file_path)
+
+        except (OSError, ValueError):
+            temporary_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _decode(content: memoryview) -> Any:
+
+        """
+        Decodes the snapshot state with the garbage collector
+        paused, since none of the many new containers can be
+        garbage yet and collections would only slow loading.
+        """
+
+        enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            return marshal.loads(content)
+
+        finally:
+
+            if enabled:
+                gc.enable()
+
+    def _header(self, fingerprint: Fingerprint) -> Tuple[Any, ...]:
+
+        """
+        Returns the header identifying the snapshot format,
+        the Python version and the source contents.
+        """
+
+        return (self.FORMAT_VERSION, tuple(sys.version_info[:2]), *fingerprint)
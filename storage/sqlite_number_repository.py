@@ -0,0 +1,734 @@
+# -*- coding: utf-8 -*-
+import json
+import sqlite3
+
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from storage.base_number_repository import BaseNumberRepository
+from storage.record_view import RecordView
+from storage.json_repository import JsonRepository
+from core.text_normalizer import TextNormalizer
+from core.changes import ChangeKind
+from core.models import PhraseAnalysis, PhraseValue, StoreChange
+from config.paths import NUMBER_DATABASE_PATH, NUMBER_FILE_PATH
+
+from core.exceptions import PhraseNotFoundError, PhraseStorageError
+
+
+class SqliteNumberRepository(BaseNumberRepository):
+
+    """
+    Stores phrase analysis records in an SQLite
+    database with indexed value, digital root,
+    subdivision chain, phrase and normalized
+    phrase columns, plus a normalized word table.
+
+    Records stay on disk, so lookups do not need
+    the whole store in memory. The content digest
+    is kept in the meta table and adjusted in the
+    transaction of every phrase insert and delete.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS numbers (
+            value INTEGER PRIMARY KEY,
+            root INTEGER NOT NULL,
+            subdivisions TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS numbers_root ON numbers (root);
+        CREATE INDEX IF NOT EXISTS numbers_subdivisions ON numbers (subdivisions);
+
+        CREATE TABLE IF NOT EXISTS phrases (
+            id INTEGER PRIMARY KEY,
+            value INTEGER NOT NULL REFERENCES numbers (value) ON DELETE CASCADE,
+            phrase TEXT NOT NULL,
+            normalized TEXT NOT NULL DEFAULT '',
+            UNIQUE (value, phrase)
+        );
+
+        CREATE TABLE IF NOT EXISTS phrase_words (
+            word TEXT NOT NULL,
+            phrase_id INTEGER NOT NULL REFERENCES phrases (id) ON DELETE CASCADE,
+            PRIMARY KEY (word, phrase_id)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS phrase_words_phrase_id ON phrase_words (phrase_id);
+
+        CREATE TABLE IF NOT EXISTS meta (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS phrases_phrase ON phrases (phrase);
+        CREATE INDEX IF NOT EXISTS phrases_normalized ON phrases (normalized);
+    """
+
+    def __init__(self, database_path: str | Path = NUMBER_DATABASE_PATH) -> None:
+
+        """
+        Opens the database, creating the schema if needed.
+
+        When the SQLite library serializes calls on a
+        connection, the connection may also be used from
+        other threads, such as the one the phrase server
+        refreshes the analyzers in.
+
+        :param database_path: The SQLite database file path.
+        """
+
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.normalizer = TextNormalizer()
+
+        try:
+
+            self.connection = sqlite3.connect(
+                self.database_path, check_same_thread=sqlite3.threadsafety != 3
+            )
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            self.connection.executescript(self.SCHEMA)
+            self._upgrade_schema()
+            self.connection.executescript(self.INDEXES)
+            self._initialize_digest()
+
+        except sqlite3.Error as exc:
+            raise PhraseStorageError(
+                f"Failed to open database '{self.database_path}': {exc}"
+            ) from exc
+
+    def insert(self, analysis: PhraseAnalysis) -> StoreChange:
+
+        """
+        Inserts a phrase analysis record in one transaction.
+
+        :param analysis: The phrase analysis to store.
+        :return: The change applied to the store.
+        """
+
+        self._validate_analysis(analysis)
+
+        value = analysis.total_value
+        sub_divisions = analysis.subdivisions[1:]
+
+        try:
+
+            with self.connection:
+
+                key_exists = self._key_exists(value)
+
+                if not key_exists:
+                    self._insert_number(value, sub_divisions)
+
+                inserted = self._insert_phrase(value, analysis.original_text)
+
+                if inserted:
+                    self._adjust_digest(self._phrase_hash(str(value), analysis.original_text))
+
+        except sqlite3.Error as exc:
+            raise PhraseStorageError(
+                f"Failed to insert phrase '{analysis.original_text}': {exc}"
+            ) from exc
+
+        kind = self._insert_kind(key_exists, inserted)
+
+        return StoreChange(kind=kind, key=str(value), phrase=analysis.original_text)
+
+    def insert_many(
+        self,
+        analyses: Iterable[PhraseAnalysis | PhraseValue]
+    ) -> List[StoreChange]:
+
+        """
+        Inserts many phrase analysis records in one transaction.
+
+        :param analyses: The phrase analyses or streamed values to store.
+        :return: The changes applied to the store.
+        """
+
+        changes: List[StoreChange] = []
+        known_values: Set[int] = set()
+        digest_change = 0
+
+        try:
+
+            with self.connection:
+
+                for analysis in analyses:
+
+                    self._validate_analysis(analysis)
+
+                    value = analysis.total_value
+                    key_exists = value in known_values or self._key_exists(value)
+
+                    if not key_exists:
+                        self._insert_number(value, analysis.subdivisions[1:])
+
+                    known_values.add(value)
+                    inserted = self._insert_phrase(value, analysis.original_text)
+
+                    if inserted:
+                        digest_change += self._phrase_hash(str(value), analysis.original_text)
+
+                    kind = self._insert_kind(key_exists, inserted)
+                    changes.append(
+                        StoreChange(kind=kind, key=str(value), phrase=analysis.original_text)
+                    )
+
+                self._adjust_digest(digest_change)
+
+        except sqlite3.Error as exc:
+            raise PhraseStorageError(f"Failed to insert phrases: {exc}") from exc
+
+        return changes
+
+    def delete(self, analysis: PhraseAnalysis) -> StoreChange:
+
+        """
+        Deletes a phrase analysis record in one transaction.
+
+        :param analysis: The phrase analysis to remove.
+        :return: The change applied to the store.
+        """
+
+        self._validate_analysis(analysis)
+
+        if not self._key_exists(analysis.total_value):
+            raise PhraseNotFoundError(f"Key {analysis.total_value} does not exist.")
+
+        return self._delete_stored_phrase(analysis.total_value, analysis.original_text)
+
+    def delete_phrase(self, phrase: str) -> StoreChange:
+
+        """
+        Deletes a stored phrase without recomputing its value.
+
+        :param phrase: The original phrase text.
+        :return: The change applied to the store.
+        """
+
+        value = self.find_phrase_key(phrase)
+
+        if value is None:
+            raise PhraseNotFoundError(f"Phrase '{phrase}' does not exist.")
+
+        return self._delete_stored_phrase(value, phrase)
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Returns all stored number data in numeric key order.
+
+        :return: The number store keyed by the primary number.
+        """
+
+        return dict(self.iter_records())
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+
+        """
+        Streams the stored records in numeric key order
+        from one cursor, holding one record at a time.
+
+        :return: An iterator of key and record pairs.
+        """
+
+        rows = self.connection.execute(
+            """
+            SELECT numbers.value, numbers.subdivisions, phrases.phrase
+            FROM numbers JOIN phrases ON phrases.value = numbers.value
+            ORDER BY numbers.value, phrases.phrase
+            """
+        )
+
+        for (value, subdivisions), group in groupby(rows, key=itemgetter(0, 1)):
+
+            yield str(value), {
+                "sub-divisions": json.loads(subdivisions),
+                "key-phrases": [phrase for _, _, phrase in group]
+            }
+
+    def record_view(self) -> Mapping[str, Dict[str, Any]]:
+
+        """
+        Returns a view that queries single records and
+        loads the whole store only when iterated.
+
+        :return: A RecordView of the database.
+        """
+
+        return RecordView(self)
+
+    def content_digest(self) -> str:
+
+        """
+        Returns a digest of the stored key and phrase set,
+        read from the meta table.
+
+        :return: The digest as a hexadecimal string.
+        """
+
+        return self._format_digest(self._stored_digest())
+
+    def get_record(self, key: int) -> Optional[Dict[str, Any]]:
+
+        """
+        Returns the record stored under one number.
+
+        :param key: The primary number.
+        :return: The stored record, or None if the key is missing.
+        """
+
+        row = self.connection.execute(
+            "SELECT subdivisions FROM numbers WHERE value = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "sub-divisions": json.loads(row[0]),
+            "key-phrases": self._get_phrases(key)
+        }
+
+    def largest_key(self) -> Optional[int]:
+
+        """
+        Returns the largest stored number from the primary key index.
+        """
+
+        return self.connection.execute("SELECT MAX(value) FROM numbers").fetchone()[0]
+
+    def find_keys_in_range(self, low: int, high: int) -> List[int]:
+
+        """
+        Returns the numbers between low and high, inclusive.
+
+        :param low: The lowest number.
+        :param high: The highest number.
+        :return: The matching numbers in ascending order.
+        """
+
+        rows = self.connection.execute(
+            "SELECT value FROM numbers WHERE value BETWEEN ? AND ? ORDER BY value",
+            (low, high)
+        )
+
+        return [value for (value,) in rows]
+
+    def find_keys_by_root(self, root: int) -> List[int]:
+
+        """
+        Returns the numbers whose digital root matches.
+
+        :param root: The single-digit root.
+        :return: The matching numbers in ascending order.
+        """
+
+        rows = self.connection.execute(
+            "SELECT value FROM numbers WHERE root = ? ORDER BY value", (root,)
+        )
+
+        return [value for (value,) in rows]
+
+    def find_keys_by_subdivisions(self, sub_divisions: List[int]) -> List[int]:
+
+        """
+        Returns the numbers with the given subdivision chain.
+
+        :param sub_divisions: The subdivisions following the key.
+        :return: The matching numbers in ascending order.
+        """
+
+        rows = self.connection.execute(
+            "SELECT value FROM numbers WHERE subdivisions = ? ORDER BY value",
+            (self._encode_subdivisions(sub_divisions),)
+        )
+
+        return [value for (value,) in rows]
+
+    def find_nearest_keys(self, number: int, count: int) -> List[int]:
+
+        """
+        Returns the stored numbers closest to a number.
+
+        :param number: The target number.
+        :param count: The maximum number of results.
+        :return: The closest numbers, nearest first.
+        """
+
+        below = self.connection.execute(
+            "SELECT value FROM numbers WHERE value < ? ORDER BY value DESC LIMIT ?",
+            (number, count)
+        ).fetchall()
+
+        above = self.connection.execute(
+            "SELECT value FROM numbers WHERE value >= ? ORDER BY value LIMIT ?",
+            (number, count)
+        ).fetchall()
+
+        candidates = [value for (value,) in below + above]
+
+        return sorted(candidates, key=lambda value: (abs(value - number), value))[:count]
+
+    def find_phrase_key(self, phrase: str) -> Optional[int]:
+
+        """
+        Returns the number a phrase is stored under.
+
+        :param phrase: The original phrase text.
+        :return: The primary number, or None if the phrase is missing.
+        """
+
+        row = self.connection.execute(
+            "SELECT value FROM phrases WHERE phrase = ? LIMIT 1", (phrase,)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def find_equivalent_phrases(self, text: str) -> List[str]:
+
+        """
+        Returns the stored phrases that normalize like the text.
+
+        :param text: The phrase text, in any accent or case form.
+        :return: The matching stored phrases, sorted.
+        """
+
+        rows = self.connection.execute(
+            "SELECT phrase FROM phrases WHERE normalized = ? ORDER BY phrase",
+            (" ".join(self.normalizer.normalize(text)),)
+        )
+
+        return [phrase for (phrase,) in rows]
+
+    def find_phrases_with_word(self, word: str) -> List[str]:
+
+        """
+        Returns the stored phrases containing a normalized word.
+
+        :param word: The word, in any accent or case form.
+        :return: The matching stored phrases, sorted.
+        """
+
+        rows = self.connection.execute(
+            """
+            SELECT phrases.phrase
+            FROM phrase_words JOIN phrases ON phrases.id = phrase_words.phrase_id
+            WHERE phrase_words.word = ?
+            ORDER BY phrases.phrase
+            """,
+            ("".join(self.normalizer.normalize(word)),)
+        )
+
+        return [phrase for (phrase,) in rows]
+
+    def find_keys_with_word(self, word: str) -> List[int]:
+
+        """
+        Returns the numbers with a phrase containing a word.
+
+        :param word: The word, in any accent or case form.
+        :return: The matching numbers in ascending order.
+        """
+
+        rows = self.connection.execute(
+            """
+            SELECT DISTINCT phrases.value
+            FROM phrase_words JOIN phrases ON phrases.id = phrase_words.phrase_id
+            WHERE phrase_words.word = ?
+            ORDER BY phrases.value
+            """,
+            ("".join(self.normalizer.normalize(word)),)
+        )
+
+        return [value for (value,) in rows]
+
+    def migrate_from_json(self, file_path: str | Path = NUMBER_FILE_PATH) -> int:
+
+        """
+        Copies a JSON number file into the database
+        in a single transaction.
+
+        :param file_path: The JSON number file to import.
+        :return: The number of phrases imported.
+        """
+
+        number_data = JsonRepository(file_path).load()
+
+        number_rows = [
+            (
+                int(key),
+                self._digital_root(int(key), record.get("sub-divisions", [])),
+                self._encode_subdivisions(record.get("sub-divisions", []))
+            )
+            for key, record in number_data.items()
+            if record.get("key-phrases")
+        ]
+
+        imported = 0
+        digest_change = 0
+
+        try:
+
+            with self.connection:
+
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO numbers (value, root, subdivisions) VALUES (?, ?, ?)",
+                    number_rows
+                )
+
+                for key, record in number_data.items():
+
+                    for phrase in record.get("key-phrases", []):
+
+                        if self._insert_phrase(int(key), phrase):
+
+                            imported += 1
+                            digest_change += self._phrase_hash(str(int(key)), phrase)
+
+                self._adjust_digest(digest_change)
+
+        except sqlite3.Error as exc:
+            raise PhraseStorageError(
+                f"Failed to migrate '{file_path}' into '{self.database_path}': {exc}"
+            ) from exc
+
+        return imported
+
+    def close(self) -> None:
+
+        """
+        Closes the database connection.
+        """
+
+        self.connection.close()
+
+    def _key_exists(self, value: int) -> bool:
+
+        """
+        Checks whether a number row exists.
+        """
+
+        row = self.connection.execute(
+            "SELECT 1 FROM numbers WHERE value = ?", (value,)
+        ).fetchone()
+
+        return row is not None
+
+    def _insert_number(self, value: int, sub_divisions: List[int]) -> None:
+
+        """
+        Inserts a new number row.
+        """
+
+        self.connection.execute(
+            "INSERT INTO numbers (value, root, subdivisions) VALUES (?, ?, ?)",
+            (
+                value,
+                self._digital_root(value, sub_divisions),
+                self._encode_subdivisions(sub_divisions)
+            )
+        )
+
+    def _insert_phrase(self, value: int, phrase: str) -> bool:
+
+        """
+        Inserts a phrase row and its word rows.
+
+        :return: True if the phrase was not stored yet.
+        """
+
+        words = self.normalizer.normalize(phrase)
+
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO phrases (value, phrase, normalized) VALUES (?, ?, ?)",
+            (value, phrase, " ".join(words))
+        )
+
+        if not cursor.rowcount:
+            return False
+
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO phrase_words (word, phrase_id) VALUES (?, ?)",
+            [(word, cursor.lastrowid) for word in set(words)]
+        )
+
+        return True
+
+    def _delete_stored_phrase(self, value: int, phrase: str) -> StoreChange:
+
+        """
+        Deletes a phrase row, and its number row once empty.
+        """
+
+        try:
+
+            with self.connection:
+
+                cursor = self.connection.execute(
+                    "DELETE FROM phrases WHERE value = ? AND phrase = ?",
+                    (value, phrase)
+                )
+
+                if cursor.rowcount == 0:
+                    raise PhraseNotFoundError(
+                        f"Phrase '{phrase}' does not exist under key {value}."
+                    )
+
+                self._adjust_digest(-self._phrase_hash(str(value), phrase))
+
+                remaining = self.connection.execute(
+                    "SELECT COUNT(*) FROM phrases WHERE value = ?", (value,)
+                ).fetchone()[0]
+
+                if not remaining:
+                    self.connection.execute(
+                        "DELETE FROM numbers WHERE value = ?", (value,)
+                    )
+
+        except sqlite3.Error as exc:
+            raise PhraseStorageError(
+                f"Failed to delete phrase '{phrase}': {exc}"
+            ) from exc
+
+        kind = ChangeKind.PHRASE_REMOVED if remaining else ChangeKind.KEY_EMPTIED
+
+        return StoreChange(kind=kind, key=str(value), phrase=phrase)
+
+    def _upgrade_schema(self) -> None:
+
+        """
+        Adds the normalized phrase column and the word rows
+        to databases created before they existed.
+        """
+
+        columns = {
+            row[1] for row in self.connection.execute("PRAGMA table_info (phrases)")
+        }
+
+        if "normalized" in columns:
+            return
+
+        with self.connection:
+
+            self.connection.execute(
+                "ALTER TABLE phrases ADD COLUMN normalized TEXT NOT NULL DEFAULT ''"
+            )
+
+            for phrase_id, phrase in self.connection.execute(
+                "SELECT id, phrase FROM phrases"
+            ).fetchall():
+
+                words = self.normalizer.normalize(phrase)
+
+                self.connection.execute(
+                    "UPDATE phrases SET normalized = ? WHERE id = ?",
+                    (" ".join(words), phrase_id)
+                )
+
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO phrase_words (word, phrase_id) VALUES (?, ?)",
+                    [(word, phrase_id) for word in set(words)]
+                )
+
+    def _initialize_digest(self) -> None:
+
+        """
+        Computes and stores the content digest once, for
+        new databases and those created before it was kept.
+        """
+
+        if self.connection.execute(
+            "SELECT 1 FROM meta WHERE name = 'digest'"
+        ).fetchone() is not None:
+            return
+
+        digest = sum(
+            self._phrase_hash(str(value), phrase)
+            for value, phrase in self.connection.execute("SELECT value, phrase FROM phrases")
+        )
+
+        with self.connection:
+            self._store_digest(digest)
+
+    def _stored_digest(self) -> int:
+
+        """
+        Returns the content digest kept in the meta table.
+        """
+
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE name = 'digest'"
+        ).fetchone()
+
+        return int(row[0], 16) if row is not None else 0
+
+    def _adjust_digest(self, change: int) -> None:
+
+        """
+        Adds the hashes of inserted phrases, or subtracts
+        those of deleted ones, within the open transaction.
+        """
+
+        if change:
+            self._store_digest(self._stored_digest() + change)
+
+    def _store_digest(self, digest: int) -> None:
+
+        """
+        Writes the content digest to the meta table.
+        """
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('digest', ?)",
+            (self._format_digest(digest),)
+        )
+
+    def _get_phrases(self, value: int) -> List[str]:
+
+        """
+        Returns the sorted phrases of one number.
+        """
+
+        rows = self.connection.execute(
+            "SELECT phrase FROM phrases WHERE value = ? ORDER BY phrase", (value,)
+        )
+
+        return [phrase for (phrase,) in rows]
+
+    @staticmethod
+    def _insert_kind(key_exists: bool, inserted: bool) -> ChangeKind:
+
+        """
+        Returns the change kind of one phrase insert.
+        """
+
+        if not key_exists:
+            return ChangeKind.KEY_ADDED
+
+        return ChangeKind.PHRASE_ADDED if inserted else ChangeKind.PHRASE_EXISTS
+
+    @staticmethod
+    def _digital_root(value: int, sub_divisions: List[int]) -> int:
+
+        """
+        Returns the last subdivision, or the value itself.
+        """
+
+        return sub_divisions[-1] if sub_divisions else value
+
+    @staticmethod
+    def _encode_subdivisions(sub_divisions: List[int]) -> str:
+
+        """
+        Encodes a subdivision chain as its indexed column text.
+        """
+
+        return json.dumps(sub_divisions, separators=(",", ":"))